@@ -0,0 +1,120 @@
+// SPDX-License-Identifier: MIT
+
+pragma solidity ^0.8.0;
+
+import "./ClonableBeaconProxy.sol";
+import "@openzeppelin/contracts/proxy/Clones.sol";
+import "@openzeppelin/contracts/utils/Address.sol";
+
+/**
+ * @dev This contract deploys cheap proxies that all point to the same {UpgradeableBeacon}.
+ *
+ * Instead of a full {BeaconProxy}, every instance is an https://eips.ethereum.org/EIPS/eip-1167[EIP1167] clone of a
+ * single {ClonableBeaconProxy}. Instances can be created one by one or in batches, at a regular or at a deterministic
+ * (CREATE2) address, and are initialized in the same transaction.
+ *
+ * Deterministic salts are namespaced by the caller, so nobody can take the address of another account's instance
+ * with different initialization data.
+ */
+contract BeaconProxyFactory {
+    address public immutable beacon;
+    address public immutable proxyImplementation;
+
+    /**
+     * @dev Emitted for every new instance.
+     */
+    event ProxyCreated(address indexed proxy);
+
+    /**
+     * @dev Deploys the {ClonableBeaconProxy} used by all the instances of `beacon_`.
+     */
+    constructor(address beacon_) {
+        beacon = beacon_;
+        proxyImplementation = address(new ClonableBeaconProxy(beacon_));
+    }
+
+    /**
+     * @dev Deploys an instance and calls it with `data` if `data` is nonempty.
+     *
+     * NOTE: the instance is initialized with a regular call, so `msg.sender` is this factory in the initializer.
+     */
+    function createProxy(bytes calldata data) external returns (address proxy) {
+        proxy = Clones.clone(proxyImplementation);
+        _initialize(proxy, data);
+    }
+
+    /**
+     * @dev Deploys an instance at the address given by {predictProxyAddress} and calls it with `data`.
+     */
+    function createProxyDeterministic(bytes32 salt, bytes calldata data)
+        external
+        returns (address proxy)
+    {
+        proxy = Clones.cloneDeterministic(
+            proxyImplementation,
+            _salt(msg.sender, salt)
+        );
+        _initialize(proxy, data);
+    }
+
+    /**
+     * @dev Deploys `count` instances and calls each of them with `data`.
+     */
+    function createProxies(uint256 count, bytes calldata data)
+        external
+        returns (address[] memory proxies)
+    {
+        proxies = new address[](count);
+        for (uint256 i; i < count; i++) {
+            proxies[i] = Clones.clone(proxyImplementation);
+            _initialize(proxies[i], data);
+        }
+    }
+
+    /**
+     * @dev Deploys one instance per salt and calls each of them with `data`.
+     */
+    function createProxiesDeterministic(
+        bytes32[] calldata salts,
+        bytes calldata data
+    ) external returns (address[] memory proxies) {
+        proxies = new address[](salts.length);
+        for (uint256 i; i < salts.length; i++) {
+            proxies[i] = Clones.cloneDeterministic(
+                proxyImplementation,
+                _salt(msg.sender, salts[i])
+            );
+            _initialize(proxies[i], data);
+        }
+    }
+
+    /**
+     * @dev Returns the address of the instance created by `deployer` with `salt`.
+     */
+    function predictProxyAddress(address deployer, bytes32 salt)
+        external
+        view
+        returns (address)
+    {
+        return
+            Clones.predictDeterministicAddress(
+                proxyImplementation,
+                _salt(deployer, salt)
+            );
+    }
+
+    function _salt(address deployer, bytes32 salt)
+        private
+        pure
+        returns (bytes32)
+    {
+        return keccak256(abi.encodePacked(deployer, salt));
+    }
+
+    function _initialize(address proxy, bytes calldata data) private {
+        emit ProxyCreated(proxy);
+        if (data.length > 0) {
+            Address.functionCall(proxy, data);
+        }
+    }
+}
@@ -0,0 +1,48 @@
+// SPDX-License-Identifier: MIT
+
+pragma solidity ^0.8.0;
+
+import "../interfaces/IBeacon.sol";
+import "../Proxy.sol";
+import "@openzeppelin/contracts/utils/Address.sol";
+
+/**
+ * @dev This contract is the shared implementation of the clones deployed by a {BeaconProxyFactory}.
+ *
+ * Each clone is an https://eips.ethereum.org/EIPS/eip-1167[EIP1167] minimal proxy that delegates to this contract,
+ * which then delegates to the implementation returned by the beacon. Since the beacon address is an immutable, it is
+ * part of the code of this contract: a clone has no storage of its own and is only 45 bytes of code.
+ *
+ * The clones follow {UpgradeableBeacon-upgradeTo} exactly like a {BeaconProxy}.
+ */
+contract ClonableBeaconProxy is Proxy {
+    address private immutable _beacon;
+
+    /**
+     * @dev Sets the beacon shared by all the clones.
+     *
+     * Requirements:
+     *
+     * - `beacon` must be a contract with the interface {IBeacon}.
+     */
+    constructor(address beacon) {
+        require(
+            Address.isContract(beacon),
+            "ClonableBeaconProxy: beacon is not a contract"
+        );
+        _beacon = beacon;
+    }
+
+    /**
+     * @dev Returns the current implementation address of the associated beacon.
+     */
+    function _implementation()
+        internal
+        view
+        virtual
+        override
+        returns (address)
+    {
+        return IBeacon(_beacon).implementation();
+    }
+}
@@ -0,0 +1,59 @@
+// SPDX-License-Identifier: MIT
+
+pragma solidity ^0.8.2;
+
+import "../interfaces/IBeacon.sol";
+import "../Proxy.sol";
+import "../ERC1967Upgrade.sol";
+
+/**
+ * @dev This contract implements a {BeaconProxy} whose beacon is fixed at deployment.
+ *
+ * {BeaconProxy} reads the beacon from its EIP1967 slot on every call before asking it for the implementation. Here the
+ * beacon is an immutable, so it is part of the proxy code: a forwarded call only pays for the `implementation()`
+ * staticcall to the beacon, which is done in assembly to skip the code size check and the ABI decoding.
+ *
+ * The beacon is still written to the EIP1967 beacon slot and announced with {BeaconUpgraded}, so that tools reading
+ * the slot keep working, but it can not be changed afterwards. The proxy follows {UpgradeableBeacon-upgradeTo} like a
+ * {BeaconProxy} does.
+ */
+contract ImmutableBeaconProxy is Proxy, ERC1967Upgrade {
+    address private immutable _immutableBeacon;
+
+    /**
+     * @dev Initializes the proxy with `beacon`.
+     *
+     * If `data` is nonempty, it's used as data in a delegate call to the implementation returned by the beacon.
+     *
+     * Requirements:
+     *
+     * - `beacon` must be a contract with the interface {IBeacon}.
+     */
+    constructor(address beacon, bytes memory data) payable {
+        _immutableBeacon = beacon;
+        _upgradeBeaconToAndCall(beacon, data, false);
+    }
+
+    /**
+     * @dev Returns the current implementation address of the beacon.
+     */
+    function _implementation()
+        internal
+        view
+        virtual
+        override
+        returns (address impl)
+    {
+        address beacon = _immutableBeacon;
+        assembly {
+            // bytes4(keccak256("implementation()")) == 0x5c60da1b
+            // The scratch space is overwritten by {_delegate} right after.
+            mstore(0, shl(224, 0x5c60da1b))
+            let success := staticcall(gas(), beacon, 0, 4, 0, 32)
+            if iszero(and(success, gt(returndatasize(), 31))) {
+                revert(0, 0)
+            }
+            impl := mload(0)
+        }
+    }
+}
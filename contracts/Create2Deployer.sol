@@ -0,0 +1,48 @@
+// SPDX-License-Identifier: MIT
+
+pragma solidity ^0.8.0;
+
+import "@openzeppelin/contracts/utils/Create2.sol";
+
+/**
+ * @dev Deploys contracts with `CREATE2`, so that the address of a contract only depends on this deployer, a salt and
+ * the hash of its init code (creation bytecode followed by the ABI encoded constructor arguments).
+ *
+ * Deploying the same init code with the same salt twice reverts: the address is already used. Callers are expected
+ * to check the code at {computeAddress} first and reuse the existing contract.
+ *
+ * NOTE: `msg.sender` is this deployer in the constructor of the deployed contract, so it must not be used to set an
+ * owner. Logic contracts and facets are fine.
+ */
+contract Create2Deployer {
+    /**
+     * @dev Emitted when `initCodeHash` is deployed at `deployed`.
+     */
+    event Deployed(
+        address indexed deployed,
+        bytes32 indexed initCodeHash,
+        bytes32 salt
+    );
+
+    /**
+     * @dev Deploys `initCode` at the address given by {computeAddress}.
+     */
+    function deploy(bytes32 salt, bytes memory initCode)
+        external
+        returns (address deployed)
+    {
+        deployed = Create2.deploy(0, salt, initCode);
+        emit Deployed(deployed, keccak256(initCode), salt);
+    }
+
+    /**
+     * @dev Returns the address where the init code hashing to `initCodeHash` is deployed with `salt`.
+     */
+    function computeAddress(bytes32 salt, bytes32 initCodeHash)
+        external
+        view
+        returns (address)
+    {
+        return Create2.computeAddress(salt, initCodeHash);
+    }
+}
@@ -24,58 +24,14 @@ contract DiamondLoupeFacet is IDiamondLoupe {
     /// @return facets_ Facet
     function facets() external view override returns (Facet[] memory facets_) {
         LibDiamond.DiamondStorage storage ds = LibDiamond.diamondStorage();
-        uint256 selectorCount = ds.selectors.length;
-        // create an array set to the maximum size possible
-        facets_ = new Facet[](selectorCount);
-        // create an array for counting the number of selectors for each facet
-        uint16[] memory numFacetSelectors = new uint16[](selectorCount);
-        // total number of facets
-        uint256 numFacets;
-        // loop through function selectors
-        for (
-            uint256 selectorIndex;
-            selectorIndex < selectorCount;
-            selectorIndex++
-        ) {
-            bytes4 selector = ds.selectors[selectorIndex];
-            address facetAddress_ = ds
-                .facetAddressAndSelectorPosition[selector]
-                .facetAddress;
-            bool continueLoop = false;
-            // find the functionSelectors array for selector and add selector to it
-            for (uint256 facetIndex; facetIndex < numFacets; facetIndex++) {
-                if (facets_[facetIndex].facetAddress == facetAddress_) {
-                    facets_[facetIndex].functionSelectors[
-                        numFacetSelectors[facetIndex]
-                    ] = selector;
-                    numFacetSelectors[facetIndex]++;
-                    continueLoop = true;
-                    break;
-                }
-            }
-            // if functionSelectors array exists for selector then continue loop
-            if (continueLoop) {
-                continueLoop = false;
-                continue;
-            }
-            // create a new functionSelectors array for selector
-            facets_[numFacets].facetAddress = facetAddress_;
-            facets_[numFacets].functionSelectors = new bytes4[](selectorCount);
-            facets_[numFacets].functionSelectors[0] = selector;
-            numFacetSelectors[numFacets] = 1;
-            numFacets++;
-        }
+        uint256 numFacets = ds.facetAddresses.length;
+        facets_ = new Facet[](numFacets);
         for (uint256 facetIndex; facetIndex < numFacets; facetIndex++) {
-            uint256 numSelectors = numFacetSelectors[facetIndex];
-            bytes4[] memory selectors = facets_[facetIndex].functionSelectors;
-            // setting the number of selectors
-            assembly {
-                mstore(selectors, numSelectors)
-            }
-        }
-        // setting the number of facets
-        assembly {
-            mstore(facets_, numFacets)
+            address facetAddress_ = ds.facetAddresses[facetIndex];
+            facets_[facetIndex].facetAddress = facetAddress_;
+            facets_[facetIndex].functionSelectors = ds
+                .facetFunctionSelectors[facetAddress_]
+                .functionSelectors;
         }
     }
 
@@ -89,28 +45,9 @@ contract DiamondLoupeFacet is IDiamondLoupe {
         returns (bytes4[] memory _facetFunctionSelectors)
     {
         LibDiamond.DiamondStorage storage ds = LibDiamond.diamondStorage();
-        uint256 selectorCount = ds.selectors.length;
-        uint256 numSelectors;
-        _facetFunctionSelectors = new bytes4[](selectorCount);
-        // loop through function selectors
-        for (
-            uint256 selectorIndex;
-            selectorIndex < selectorCount;
-            selectorIndex++
-        ) {
-            bytes4 selector = ds.selectors[selectorIndex];
-            address facetAddress_ = ds
-                .facetAddressAndSelectorPosition[selector]
-                .facetAddress;
-            if (_facet == facetAddress_) {
-                _facetFunctionSelectors[numSelectors] = selector;
-                numSelectors++;
-            }
-        }
-        // Set the number of selectors in the array
-        assembly {
-            mstore(_facetFunctionSelectors, numSelectors)
-        }
+        _facetFunctionSelectors = ds
+            .facetFunctionSelectors[_facet]
+            .functionSelectors;
     }
 
     /// @notice Get all the facet addresses used by a diamond.
@@ -122,41 +59,7 @@ contract DiamondLoupeFacet is IDiamondLoupe {
         returns (address[] memory facetAddresses_)
     {
         LibDiamond.DiamondStorage storage ds = LibDiamond.diamondStorage();
-        uint256 selectorCount = ds.selectors.length;
-        // create an array set to the maximum size possible
-        facetAddresses_ = new address[](selectorCount);
-        uint256 numFacets;
-        // loop through function selectors
-        for (
-            uint256 selectorIndex;
-            selectorIndex < selectorCount;
-            selectorIndex++
-        ) {
-            bytes4 selector = ds.selectors[selectorIndex];
-            address facetAddress_ = ds
-                .facetAddressAndSelectorPosition[selector]
-                .facetAddress;
-            bool continueLoop = false;
-            // see if we have collected the address already and break out of loop if we have
-            for (uint256 facetIndex; facetIndex < numFacets; facetIndex++) {
-                if (facetAddress_ == facetAddresses_[facetIndex]) {
-                    continueLoop = true;
-                    break;
-                }
-            }
-            // continue loop if we already have the address
-            if (continueLoop) {
-                continueLoop = false;
-                continue;
-            }
-            // include address
-            facetAddresses_[numFacets] = facetAddress_;
-            numFacets++;
-        }
-        // Set the number of facet addresses in the array
-        assembly {
-            mstore(facetAddresses_, numFacets)
-        }
+        facetAddresses_ = ds.facetAddresses;
     }
 
     /// @notice Gets the facet address that supports the given selector.
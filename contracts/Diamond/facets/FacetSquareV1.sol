@@ -2,33 +2,21 @@
 
 pragma solidity ^0.8.0;
 
-contract FacetSquareV1 {
-    bytes32 constant DIAMOND_STORAGE_POSITION =
-        keccak256("diamond.standard.square.storage");
+import {AppStorage, LibAppStorage} from "../lib/LibAppStorage.sol";
 
-    struct SquareState {
-        uint256 value;
-    }
+contract FacetSquareV1 {
+    AppStorage internal s;
 
     constructor() {}
 
-    function diamondStorage() internal pure returns (SquareState storage ds) {
-        bytes32 position = DIAMOND_STORAGE_POSITION;
-        assembly {
-            ds.slot := position
-        }
-    }
-
     // Stores a new value in the contract
     function store(uint256 _newValue) public {
-        SquareState storage squareState = diamondStorage();
-        squareState.value = _newValue;
+        LibAppStorage.setValue(_newValue);
     }
 
     // Reads the last stored value
     function retrieve() public view returns (uint256) {
-        SquareState storage squareState = diamondStorage();
-        return squareState.value;
+        return s.value;
     }
 
     // returns the square of the _input
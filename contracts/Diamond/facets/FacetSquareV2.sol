@@ -2,37 +2,34 @@
 
 pragma solidity ^0.8.0;
 
-contract FacetSquareV2 {
-    bytes32 constant DIAMOND_STORAGE_POSITION =
-        keccak256("diamond.standard.square.storage");
+import {AppStorage, LibAppStorage} from "../lib/LibAppStorage.sol";
 
-    struct SquareState {
-        uint256 value;
-    }
+contract FacetSquareV2 {
+    AppStorage internal s;
 
     constructor() {}
 
-    function diamondStorage() internal pure returns (SquareState storage ds) {
-        bytes32 position = DIAMOND_STORAGE_POSITION;
-        assembly {
-            ds.slot := position
-        }
-    }
-
     // Stores a new value in the contract
     function store(uint256 _newValue) public {
-        SquareState storage squareState = diamondStorage();
-        squareState.value = _newValue;
+        LibAppStorage.setValue(_newValue);
     }
 
     // Reads the last stored value
     function retrieve() public view returns (uint256) {
-        SquareState storage squareState = diamondStorage();
-        return squareState.value;
+        return s.value;
     }
 
     // returns the square of the _input
     function square(uint256 _input) public pure returns (uint256) {
         return _input * _input; // implementation error
     }
+
+    // When the value was last stored, and how many times it was
+    function lastUpdate()
+        public
+        view
+        returns (uint64 updatedAt, uint64 updateCount)
+    {
+        return (s.updatedAt, s.updateCount);
+    }
 }
@@ -0,0 +1,36 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+// The value does not fit in the 128 bits of AppStorage.value
+error ValueDoesNotFit(uint256 _value);
+
+// State shared by every facet, declared by each of them as `AppStorage internal s;`
+// so that it starts at slot 0 of the diamond.
+// Fields read by the same calls are packed in the same slot, one cold SLOAD
+// serves all of them. Only append new fields, and check the layout with
+// scripts/storage_layout.py before a facet upgrade.
+struct AppStorage {
+    // slot 0
+    uint128 value;
+    uint64 updatedAt;
+    uint64 updateCount;
+}
+
+library LibAppStorage {
+    function diamondStorage() internal pure returns (AppStorage storage ds) {
+        assembly {
+            ds.slot := 0
+        }
+    }
+
+    // Stores `_value` and when it was stored, the three fields in one slot
+    function setValue(uint256 _value) internal {
+        if (_value > type(uint128).max) {
+            revert ValueDoesNotFit(_value);
+        }
+        AppStorage storage s = diamondStorage();
+        s.value = uint128(_value);
+        s.updatedAt = uint64(block.timestamp);
+        s.updateCount += 1;
+    }
+}
@@ -27,6 +27,7 @@ error CannotReplaceFunctionThatDoesNotExists(bytes4 _selector);
 error RemoveFacetAddressMustBeZeroAddress(address _facetAddress);
 error CannotRemoveFunctionThatDoesNotExist(bytes4 _selector);
 error CannotRemoveImmutableFunction(bytes4 _selector);
+error CannotRemoveFacetThatDoesNotExist(address _facetAddress);
 error InitializationFunctionReverted(
     address _initializationContractAddress,
     bytes _calldata
@@ -38,13 +39,37 @@ library LibDiamond {
 
     struct FacetAddressAndSelectorPosition {
         address facetAddress;
-        uint16 selectorPosition;
+        uint96 selectorPosition; // position in facetFunctionSelectors.functionSelectors array
+    }
+
+    struct FacetFunctionSelectors {
+        bytes4[] functionSelectors;
+        uint256 facetAddressPosition; // position of facetAddress in facetAddresses array
+    }
+
+    // A facet selectors are being appended to. The slot being filled is kept in
+    // memory and only written once it is full or when the append ends.
+    struct SelectorAppend {
+        address facetAddress;
+        uint256 selectorCount;
+        bytes32 selectorSlot;
+    }
+
+    // A facet whose selectors are being removed. Its last selector slot is kept
+    // in memory and only written back when it is empty or when the removal ends.
+    struct SelectorRemoval {
+        address facetAddress;
+        uint256 selectorCount;
+        bytes32 lastSelectorSlot;
     }
 
     struct DiamondStorage {
-        // function selector => facet address and selector position in selectors array
+        // function selector => facet address and selector position in the selectors of the facet
         mapping(bytes4 => FacetAddressAndSelectorPosition) facetAddressAndSelectorPosition;
-        bytes4[] selectors;
+        // facet address => its selectors, so the loupe never has to scan every selector
+        mapping(address => FacetFunctionSelectors) facetFunctionSelectors;
+        // facet addresses, in the order they were added
+        address[] facetAddresses;
         mapping(bytes4 => bool) supportedInterfaces;
         // owner of the contract
         address contractOwner;
@@ -103,11 +128,17 @@ library LibDiamond {
             bytes4[] memory functionSelectors = _diamondCut[facetIndex]
                 .functionSelectors;
             address facetAddress = _diamondCut[facetIndex].facetAddress;
-            if (functionSelectors.length == 0) {
-                revert NoSelectorsProvidedForFacetForCut(facetAddress);
-            }
             IDiamondCut.FacetCutAction action = _diamondCut[facetIndex].action;
-            if (action == IDiamond.FacetCutAction.Add) {
+            if (functionSelectors.length == 0) {
+                // Remove with a facet address and no selectors removes the whole facet
+                if (
+                    action != IDiamond.FacetCutAction.Remove ||
+                    facetAddress == address(0)
+                ) {
+                    revert NoSelectorsProvidedForFacetForCut(facetAddress);
+                }
+                removeFacet(facetAddress);
+            } else if (action == IDiamond.FacetCutAction.Add) {
                 addFunctions(facetAddress, functionSelectors);
             } else if (action == IDiamond.FacetCutAction.Replace) {
                 replaceFunctions(facetAddress, functionSelectors);
@@ -121,6 +152,10 @@ library LibDiamond {
         initializeDiamondCut(_init, _calldata);
     }
 
+    // The selectors of a facet are a bytes4[], which Solidity packs 8 per slot.
+    // Cuts work on whole slots: a slot is read once, updated on the stack and
+    // written once, and the length of the array is written once per facet.
+
     function addFunctions(
         address _facetAddress,
         bytes4[] memory _functionSelectors
@@ -129,11 +164,7 @@ library LibDiamond {
             revert CannotAddSelectorsToZeroAddress(_functionSelectors);
         }
         DiamondStorage storage ds = diamondStorage();
-        uint16 selectorCount = uint16(ds.selectors.length);
-        enforceHasContractCode(
-            _facetAddress,
-            "LibDiamondCut: Add facet has no code"
-        );
+        SelectorAppend memory append = startAppend(ds, _facetAddress);
         for (
             uint256 selectorIndex;
             selectorIndex < _functionSelectors.length;
@@ -146,15 +177,9 @@ library LibDiamond {
             if (oldFacetAddress != address(0)) {
                 revert CannotAddFunctionToDiamondThatAlreadyExists(selector);
             }
-            ds.facetAddressAndSelectorPosition[
-                    selector
-                ] = FacetAddressAndSelectorPosition(
-                _facetAddress,
-                selectorCount
-            );
-            ds.selectors.push(selector);
-            selectorCount++;
+            appendSelector(ds, append, selector);
         }
+        endAppend(ds, append);
     }
 
     function replaceFunctions(
@@ -167,10 +192,8 @@ library LibDiamond {
                 _functionSelectors
             );
         }
-        enforceHasContractCode(
-            _facetAddress,
-            "LibDiamondCut: Replace facet has no code"
-        );
+        SelectorAppend memory append = startAppend(ds, _facetAddress);
+        SelectorRemoval memory removal;
         for (
             uint256 selectorIndex;
             selectorIndex < _functionSelectors.length;
@@ -192,11 +215,12 @@ library LibDiamond {
             if (oldFacetAddress == address(0)) {
                 revert CannotReplaceFunctionThatDoesNotExists(selector);
             }
-            // replace old facet address
-            ds
-                .facetAddressAndSelectorPosition[selector]
-                .facetAddress = _facetAddress;
+            // move the selector from the old facet to the new one
+            removeSelector(ds, removal, oldFacetAddress, selector);
+            appendSelector(ds, append, selector);
         }
+        endRemoval(ds, removal);
+        endAppend(ds, append);
     }
 
     function removeFunctions(
@@ -204,48 +228,313 @@ library LibDiamond {
         bytes4[] memory _functionSelectors
     ) internal {
         DiamondStorage storage ds = diamondStorage();
-        uint256 selectorCount = ds.selectors.length;
         if (_facetAddress != address(0)) {
             revert RemoveFacetAddressMustBeZeroAddress(_facetAddress);
         }
+        SelectorRemoval memory removal;
         for (
             uint256 selectorIndex;
             selectorIndex < _functionSelectors.length;
             selectorIndex++
         ) {
             bytes4 selector = _functionSelectors[selectorIndex];
-            FacetAddressAndSelectorPosition
-                memory oldFacetAddressAndSelectorPosition = ds
-                    .facetAddressAndSelectorPosition[selector];
-            if (oldFacetAddressAndSelectorPosition.facetAddress == address(0)) {
+            address oldFacetAddress = ds
+                .facetAddressAndSelectorPosition[selector]
+                .facetAddress;
+            if (oldFacetAddress == address(0)) {
                 revert CannotRemoveFunctionThatDoesNotExist(selector);
             }
-
             // can't remove immutable functions -- functions defined directly in the diamond
-            if (
-                oldFacetAddressAndSelectorPosition.facetAddress == address(this)
-            ) {
+            if (oldFacetAddress == address(this)) {
                 revert CannotRemoveImmutableFunction(selector);
             }
-            // replace selector with last selector
-            selectorCount--;
-            if (
-                oldFacetAddressAndSelectorPosition.selectorPosition !=
-                selectorCount
-            ) {
-                bytes4 lastSelector = ds.selectors[selectorCount];
-                ds.selectors[
-                    oldFacetAddressAndSelectorPosition.selectorPosition
-                ] = lastSelector;
-                ds
-                    .facetAddressAndSelectorPosition[lastSelector]
-                    .selectorPosition = oldFacetAddressAndSelectorPosition
-                    .selectorPosition;
-            }
-            // delete last selector
-            ds.selectors.pop();
+            removeSelector(ds, removal, oldFacetAddress, selector);
             delete ds.facetAddressAndSelectorPosition[selector];
         }
+        endRemoval(ds, removal);
+    }
+
+    // Removes every selector of `_facetAddress`, without swapping them one by one.
+    function removeFacet(address _facetAddress) internal {
+        DiamondStorage storage ds = diamondStorage();
+        bytes4[] storage selectors = ds
+            .facetFunctionSelectors[_facetAddress]
+            .functionSelectors;
+        uint256 selectorCount = selectors.length;
+        if (selectorCount == 0) {
+            revert CannotRemoveFacetThatDoesNotExist(_facetAddress);
+        }
+        // can't remove immutable functions -- functions defined directly in the diamond
+        if (_facetAddress == address(this)) {
+            revert CannotRemoveImmutableFunction(selectors[0]);
+        }
+        bytes32 selectorSlot;
+        for (
+            uint256 selectorIndex;
+            selectorIndex < selectorCount;
+            selectorIndex++
+        ) {
+            if ((selectorIndex & 7) == 0) {
+                selectorSlot = readSelectorSlot(selectors, selectorIndex);
+                writeSelectorSlot(selectors, selectorIndex, bytes32(0));
+            }
+            delete ds.facetAddressAndSelectorPosition[
+                getSelector(selectorSlot, selectorIndex)
+            ];
+        }
+        setSelectorCount(selectors, 0);
+        removeFacetAddress(ds, _facetAddress);
+    }
+
+    function addFacet(DiamondStorage storage ds, address _facetAddress)
+        internal
+    {
+        enforceHasContractCode(
+            _facetAddress,
+            "LibDiamondCut: New facet has no code"
+        );
+        ds.facetFunctionSelectors[_facetAddress].facetAddressPosition = ds
+            .facetAddresses
+            .length;
+        ds.facetAddresses.push(_facetAddress);
+    }
+
+    function startAppend(DiamondStorage storage ds, address _facetAddress)
+        internal
+        returns (SelectorAppend memory append_)
+    {
+        bytes4[] storage selectors = ds
+            .facetFunctionSelectors[_facetAddress]
+            .functionSelectors;
+        uint256 selectorCount = selectors.length;
+        // add new facet address if it does not exist
+        if (selectorCount == 0) {
+            addFacet(ds, _facetAddress);
+        }
+        append_.facetAddress = _facetAddress;
+        append_.selectorCount = selectorCount;
+        // continue the last, partially filled, slot
+        if ((selectorCount & 7) != 0) {
+            append_.selectorSlot = readSelectorSlot(selectors, selectorCount);
+        }
+    }
+
+    // Routes `_selector` to the facet of `_append` and adds it to its selectors.
+    function appendSelector(
+        DiamondStorage storage ds,
+        SelectorAppend memory _append,
+        bytes4 _selector
+    ) internal {
+        uint256 selectorCount = _append.selectorCount;
+        ds.facetAddressAndSelectorPosition[
+                _selector
+            ] = FacetAddressAndSelectorPosition(
+            _append.facetAddress,
+            uint96(selectorCount)
+        );
+        bytes32 selectorSlot = setSelector(
+            _append.selectorSlot,
+            selectorCount,
+            _selector
+        );
+        // write the slot once it is full
+        if ((selectorCount & 7) == 7) {
+            writeSelectorSlot(
+                ds.facetFunctionSelectors[_append.facetAddress].functionSelectors,
+                selectorCount,
+                selectorSlot
+            );
+            selectorSlot = 0;
+        }
+        _append.selectorCount = selectorCount + 1;
+        _append.selectorSlot = selectorSlot;
+    }
+
+    // Writes the last, partially filled, slot and the length of the selectors.
+    function endAppend(DiamondStorage storage ds, SelectorAppend memory _append)
+        internal
+    {
+        bytes4[] storage selectors = ds
+            .facetFunctionSelectors[_append.facetAddress]
+            .functionSelectors;
+        uint256 selectorCount = _append.selectorCount;
+        if ((selectorCount & 7) != 0) {
+            writeSelectorSlot(selectors, selectorCount, _append.selectorSlot);
+        }
+        setSelectorCount(selectors, selectorCount);
+    }
+
+    // Replaces `_selector` with the last selector of `_facetAddress`. The route
+    // of `_selector` is left to the caller.
+    function removeSelector(
+        DiamondStorage storage ds,
+        SelectorRemoval memory _removal,
+        address _facetAddress,
+        bytes4 _selector
+    ) internal {
+        bytes4[] storage selectors = ds
+            .facetFunctionSelectors[_facetAddress]
+            .functionSelectors;
+        if (_removal.facetAddress != _facetAddress) {
+            endRemoval(ds, _removal);
+            _removal.facetAddress = _facetAddress;
+            _removal.selectorCount = selectors.length;
+            _removal.lastSelectorSlot = readSelectorSlot(
+                selectors,
+                _removal.selectorCount - 1
+            );
+        }
+        uint256 selectorPosition = ds
+            .facetAddressAndSelectorPosition[_selector]
+            .selectorPosition;
+        uint256 lastSelectorPosition = _removal.selectorCount - 1;
+        bytes32 lastSelectorSlot = _removal.lastSelectorSlot;
+        if (selectorPosition != lastSelectorPosition) {
+            bytes4 lastSelector = getSelector(
+                lastSelectorSlot,
+                lastSelectorPosition
+            );
+            if ((selectorPosition >> 3) == (lastSelectorPosition >> 3)) {
+                lastSelectorSlot = setSelector(
+                    lastSelectorSlot,
+                    selectorPosition,
+                    lastSelector
+                );
+            } else {
+                writeSelectorSlot(
+                    selectors,
+                    selectorPosition,
+                    setSelector(
+                        readSelectorSlot(selectors, selectorPosition),
+                        selectorPosition,
+                        lastSelector
+                    )
+                );
+            }
+            ds
+                .facetAddressAndSelectorPosition[lastSelector]
+                .selectorPosition = uint96(selectorPosition);
+        }
+        // delete last selector
+        lastSelectorSlot = setSelector(
+            lastSelectorSlot,
+            lastSelectorPosition,
+            bytes4(0)
+        );
+        // clear the last slot once it is empty and move to the previous one
+        if ((lastSelectorPosition & 7) == 0) {
+            writeSelectorSlot(selectors, lastSelectorPosition, bytes32(0));
+            if (lastSelectorPosition != 0) {
+                lastSelectorSlot = readSelectorSlot(
+                    selectors,
+                    lastSelectorPosition - 1
+                );
+            }
+        }
+        _removal.selectorCount = lastSelectorPosition;
+        _removal.lastSelectorSlot = lastSelectorSlot;
+    }
+
+    // Writes back the facet of `_removal`, and removes it if it has no selector left.
+    function endRemoval(
+        DiamondStorage storage ds,
+        SelectorRemoval memory _removal
+    ) internal {
+        if (_removal.facetAddress == address(0)) {
+            return;
+        }
+        bytes4[] storage selectors = ds
+            .facetFunctionSelectors[_removal.facetAddress]
+            .functionSelectors;
+        uint256 selectorCount = _removal.selectorCount;
+        if ((selectorCount & 7) != 0) {
+            writeSelectorSlot(
+                selectors,
+                selectorCount - 1,
+                _removal.lastSelectorSlot
+            );
+        }
+        setSelectorCount(selectors, selectorCount);
+        // if no more selectors for facet address then delete the facet address
+        if (selectorCount == 0) {
+            removeFacetAddress(ds, _removal.facetAddress);
+        }
+        _removal.facetAddress = address(0);
+    }
+
+    function getSelector(bytes32 _selectorSlot, uint256 _index)
+        internal
+        pure
+        returns (bytes4)
+    {
+        return bytes4(uint32(uint256(_selectorSlot) >> ((_index & 7) << 5)));
+    }
+
+    function setSelector(
+        bytes32 _selectorSlot,
+        uint256 _index,
+        bytes4 _selector
+    ) internal pure returns (bytes32) {
+        uint256 shift = (_index & 7) << 5;
+        return
+            bytes32(
+                (uint256(_selectorSlot) & ~(uint256(0xffffffff) << shift)) |
+                    (uint256(uint32(_selector)) << shift)
+            );
+    }
+
+    // Reads the slot holding the selector at `_index` of `_selectors`.
+    function readSelectorSlot(bytes4[] storage _selectors, uint256 _index)
+        internal
+        view
+        returns (bytes32 selectorSlot_)
+    {
+        assembly {
+            mstore(0, _selectors.slot)
+            selectorSlot_ := sload(add(keccak256(0, 32), shr(3, _index)))
+        }
+    }
+
+    // Writes the slot holding the selector at `_index` of `_selectors`.
+    function writeSelectorSlot(
+        bytes4[] storage _selectors,
+        uint256 _index,
+        bytes32 _selectorSlot
+    ) internal {
+        assembly {
+            mstore(0, _selectors.slot)
+            sstore(add(keccak256(0, 32), shr(3, _index)), _selectorSlot)
+        }
+    }
+
+    function setSelectorCount(bytes4[] storage _selectors, uint256 _count)
+        internal
+    {
+        assembly {
+            sstore(_selectors.slot, _count)
+        }
+    }
+
+    function removeFacetAddress(
+        DiamondStorage storage ds,
+        address _facetAddress
+    ) internal {
+        // replace facet address with last facet address and delete last facet address
+        uint256 lastFacetAddressPosition = ds.facetAddresses.length - 1;
+        uint256 facetAddressPosition = ds
+            .facetFunctionSelectors[_facetAddress]
+            .facetAddressPosition;
+        if (facetAddressPosition != lastFacetAddressPosition) {
+            address lastFacetAddress = ds.facetAddresses[
+                lastFacetAddressPosition
+            ];
+            ds.facetAddresses[facetAddressPosition] = lastFacetAddress;
+            ds
+                .facetFunctionSelectors[lastFacetAddress]
+                .facetAddressPosition = facetAddressPosition;
+        }
+        ds.facetAddresses.pop();
+        delete ds.facetFunctionSelectors[_facetAddress].facetAddressPosition;
     }
 
     function initializeDiamondCut(address _init, bytes memory _calldata)
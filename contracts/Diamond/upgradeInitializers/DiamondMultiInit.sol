@@ -0,0 +1,47 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+/******************************************************************************\
+* Author: Nick Mudge <nick@perfectabstractions.com> (https://twitter.com/mudgen)
+* EIP-2535 Diamonds: https://eips.ethereum.org/EIPS/eip-2535
+*
+* Runs several initializations in one diamondCut.
+/******************************************************************************/
+
+import {LibDiamond} from "../lib/LibDiamond.sol";
+
+error AddressAndCalldataLengthDoNotMatch(
+    uint256 _addressesLength,
+    uint256 _calldataLength
+);
+// The initialization at `_index` of the list reverted with `_error`
+error MultiInitReverted(uint256 _index, address _init, bytes _error);
+
+// Used as the `_init` of a diamondCut, with the calldata of `multiInit`.
+// Every initialization runs in the diamond, in order, and the whole cut reverts
+// if one of them reverts.
+contract DiamondMultiInit {
+    function multiInit(address[] calldata _addresses, bytes[] calldata _calldata)
+        external
+    {
+        if (_addresses.length != _calldata.length) {
+            revert AddressAndCalldataLengthDoNotMatch(
+                _addresses.length,
+                _calldata.length
+            );
+        }
+        for (uint256 i; i < _addresses.length; i++) {
+            address init = _addresses[i];
+            LibDiamond.enforceHasContractCode(
+                init,
+                "DiamondMultiInit: _init address has no code"
+            );
+            (bool success, bytes memory error) = init.delegatecall(
+                _calldata[i]
+            );
+            if (!success) {
+                revert MultiInitReverted(i, init, error);
+            }
+        }
+    }
+}
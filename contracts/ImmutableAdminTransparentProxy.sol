@@ -0,0 +1,113 @@
+// SPDX-License-Identifier: MIT
+
+pragma solidity ^0.8.0;
+
+import "./ERC1967Proxy.sol";
+
+/**
+ * @dev This contract implements a {TransparentUpgradeableProxy} whose admin is fixed at deployment.
+ *
+ * {TransparentUpgradeableProxy} reads the admin from its EIP1967 slot on every call, only to compare it with
+ * `msg.sender`. Here the admin is an immutable, so it is part of the proxy code and calls forwarded to the
+ * implementation no longer pay for that SLOAD.
+ *
+ * The admin is still written to the EIP1967 admin slot and announced with {AdminChanged}, so that tools reading the
+ * slot keep working, but it can not be changed afterwards: {changeAdmin} always reverts. The admin is meant to be a
+ * {ProxyAdmin}, whose owner can still be transferred. Moving the proxy to another admin means deploying a new proxy.
+ *
+ * {ProxyAdmin-getProxyImplementation}, {ProxyAdmin-getProxyAdmin}, {ProxyAdmin-upgrade} and
+ * {ProxyAdmin-upgradeAndCall} work as they do with a {TransparentUpgradeableProxy}.
+ */
+contract ImmutableAdminTransparentProxy is ERC1967Proxy {
+    address private immutable _immutableAdmin;
+
+    /**
+     * @dev Initializes an upgradeable proxy managed by `admin_`, backed by the implementation at `_logic`, and
+     * optionally initialized with `_data` as explained in {ERC1967Proxy-constructor}.
+     */
+    constructor(
+        address _logic,
+        address admin_,
+        bytes memory _data
+    ) payable ERC1967Proxy(_logic, _data) {
+        _immutableAdmin = admin_;
+        _changeAdmin(admin_);
+    }
+
+    /**
+     * @dev Modifier used internally that will delegate the call to the implementation unless the sender is the admin.
+     */
+    modifier ifAdmin() {
+        if (msg.sender == _immutableAdmin) {
+            _;
+        } else {
+            _fallback();
+        }
+    }
+
+    /**
+     * @dev Returns the admin.
+     *
+     * NOTE: Only the admin can call this function. See {ProxyAdmin-getProxyAdmin}.
+     */
+    function admin() external ifAdmin returns (address admin_) {
+        admin_ = _immutableAdmin;
+    }
+
+    /**
+     * @dev Returns the current implementation.
+     *
+     * NOTE: Only the admin can call this function. See {ProxyAdmin-getProxyImplementation}.
+     */
+    function implementation()
+        external
+        ifAdmin
+        returns (address implementation_)
+    {
+        implementation_ = _implementation();
+    }
+
+    /**
+     * @dev The admin is immutable, this function always reverts when called by the admin.
+     *
+     * NOTE: Kept so that {ProxyAdmin-changeProxyAdmin} fails explicitly instead of being forwarded to the
+     * implementation.
+     */
+    function changeAdmin(address) external ifAdmin {
+        revert("ImmutableAdminTransparentProxy: admin is immutable");
+    }
+
+    /**
+     * @dev Upgrade the implementation of the proxy.
+     *
+     * NOTE: Only the admin can call this function. See {ProxyAdmin-upgrade}.
+     */
+    function upgradeTo(address newImplementation) external ifAdmin {
+        _upgradeToAndCall(newImplementation, bytes(""), false);
+    }
+
+    /**
+     * @dev Upgrade the implementation of the proxy, and then call a function from the new implementation as specified
+     * by `data`, which should be an encoded function call.
+     *
+     * NOTE: Only the admin can call this function. See {ProxyAdmin-upgradeAndCall}.
+     */
+    function upgradeToAndCall(address newImplementation, bytes calldata data)
+        external
+        payable
+        ifAdmin
+    {
+        _upgradeToAndCall(newImplementation, data, true);
+    }
+
+    /**
+     * @dev Makes sure the admin cannot access the fallback function. See {Proxy-_beforeFallback}.
+     */
+    function _beforeFallback() internal virtual override {
+        require(
+            msg.sender != _immutableAdmin,
+            "TransparentUpgradeableProxy: admin cannot fallback to proxy target"
+        );
+        super._beforeFallback();
+    }
+}
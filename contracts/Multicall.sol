@@ -0,0 +1,39 @@
+// SPDX-License-Identifier: MIT
+
+pragma solidity ^0.8.0;
+
+/**
+ * @dev Aggregates calls to several contracts, typically proxies, so that they can be read with a single `eth_call`.
+ *
+ * Every call is run even if an earlier one reverted: the result of each call comes with its own success flag, and the
+ * revert data when it failed. The calls are regular calls, not static calls, so that getters which are not flagged as
+ * view, like {TransparentUpgradeableProxy-admin}, can be aggregated as well. This contract holds no state and is meant
+ * to be called with `eth_call`.
+ */
+contract Multicall {
+    struct Call {
+        address target;
+        bytes callData;
+    }
+
+    struct Result {
+        bool success;
+        bytes returnData;
+    }
+
+    /**
+     * @dev Runs every call of `calls` and returns their results, in the same order.
+     */
+    function tryAggregate(Call[] calldata calls)
+        external
+        returns (uint256 blockNumber, Result[] memory results)
+    {
+        blockNumber = block.number;
+        results = new Result[](calls.length);
+        for (uint256 i; i < calls.length; i++) {
+            (results[i].success, results[i].returnData) = calls[i].target.call(
+                calls[i].callData
+            );
+        }
+    }
+}
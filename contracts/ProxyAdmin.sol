@@ -100,4 +100,50 @@ contract ProxyAdmin is Ownable {
     ) public payable virtual onlyOwner {
         proxy.upgradeToAndCall{value: msg.value}(implementation, data);
     }
+
+    /**
+     * @dev Upgrades each proxy of `proxies` to the implementation at the same index of `implementations`. See
+     * {TransparentUpgradeableProxy-upgradeTo}.
+     *
+     * Requirements:
+     *
+     * - This contract must be the admin of every proxy of `proxies`.
+     * - `proxies` and `implementations` must have the same length.
+     */
+    function upgradeBatch(
+        TransparentUpgradeableProxy[] calldata proxies,
+        address[] calldata implementations
+    ) public virtual onlyOwner {
+        require(
+            proxies.length == implementations.length,
+            "ProxyAdmin: length mismatch"
+        );
+        for (uint256 i = 0; i < proxies.length; i++) {
+            proxies[i].upgradeTo(implementations[i]);
+        }
+    }
+
+    /**
+     * @dev Upgrades each proxy of `proxies` to the implementation at the same index of `implementations` and calls it
+     * with the matching entry of `data`. See {TransparentUpgradeableProxy-upgradeToAndCall}.
+     *
+     * Requirements:
+     *
+     * - This contract must be the admin of every proxy of `proxies`.
+     * - `proxies`, `implementations` and `data` must have the same length.
+     */
+    function upgradeAndCallBatch(
+        TransparentUpgradeableProxy[] calldata proxies,
+        address[] calldata implementations,
+        bytes[] calldata data
+    ) public virtual onlyOwner {
+        require(
+            proxies.length == implementations.length &&
+                proxies.length == data.length,
+            "ProxyAdmin: length mismatch"
+        );
+        for (uint256 i = 0; i < proxies.length; i++) {
+            proxies[i].upgradeToAndCall(implementations[i], data[i]);
+        }
+    }
 }
@@ -0,0 +1,208 @@
+import time
+
+from brownie import (
+    LogicContractV2,
+    LogicContractUUPSV1,
+    LogicContractUUPSV2,
+    ERC1967Proxy,
+    LogicContractBeaconV1,
+    LogicContractBeaconV2,
+    UpgradeableBeacon,
+    BeaconProxy,
+    Contract,
+)
+from scripts.helpful_scripts import get_account, encode_function_data
+from scripts.deploy_orchestrator import DeploymentPlan
+from scripts.deploy_transparent_upgradeable_proxy import (
+    deploy_proxies_V1,
+    plan_fleet_upgrade,
+)
+from scripts.deploy_beacon import deploy_beacon_proxy_factory, create_beacon_proxies
+from scripts.benchmark_gas import BENCHMARK_PATH, measure_calls, save
+
+RESULTS_PATH = BENCHMARK_PATH.joinpath("fleet_results.json")
+# number of proxies upgraded at once
+FLEET_SIZES = (1, 10, 100, 1_000)
+# the columns of the table and the series of the chart data
+METRICS = ("upgrade_gas", "upgrade_txs", "upgrade_seconds", "gas_per_proxy")
+
+
+def deploy_transparent_fleet(account, size):
+    proxy_admin, _, proxies = deploy_proxies_V1(size)
+    v2 = LogicContractV2.deploy({"from": account})
+    # the multicall of the pending proxies, which may deploy Multicall, and the
+    # estimates of the batch size
+    batches = [
+        (upgrade_batch, args, upgrade_batch.estimate_gas(*args, {"from": account}))
+        for upgrade_batch, args in plan_fleet_upgrade(proxies, v2, proxy_admin)
+    ]
+
+    def upgrade():
+        return [
+            upgrade_batch(*args, {"from": account, "gas_limit": gas})
+            for upgrade_batch, args, gas in batches
+        ]
+
+    return proxies, v2, upgrade
+
+
+def deploy_uups_fleet(account, size):
+    logic = LogicContractUUPSV1.deploy({"from": account})
+    plan = DeploymentPlan()
+    for i in range(size):
+        plan.deploy(
+            f"proxy_{i}",
+            ERC1967Proxy,
+            logic.address,
+            encode_function_data(logic.initialize, 0),
+            tx={"gas_limit": 1_000_000},
+        )
+    results = plan.execute(account)
+    proxies = [results[f"proxy_{i}"] for i in range(size)]
+    v2 = LogicContractUUPSV2.deploy({"from": account})
+
+    # every proxy upgrades itself, the transactions are sent together. The
+    # proxies are alike, their upgrades use the same gas
+    gas = Contract.from_abi(
+        "LogicContractUUPSV1", proxies[0].address, LogicContractUUPSV1.abi
+    ).upgradeTo.estimate_gas(v2.address, {"from": account})
+    upgrades = DeploymentPlan()
+    for i, proxy in enumerate(proxies):
+        upgrades.transact(
+            f"upgrade_{i}",
+            proxy,
+            "upgradeTo",
+            v2.address,
+            abi=LogicContractUUPSV1,
+            tx={"gas_limit": gas},
+        )
+
+    def upgrade():
+        return list(upgrades.execute(account).values())
+
+    return proxies, v2, upgrade
+
+
+def _beacon_upgrade(account, beacon, v2):
+    gas = beacon.upgradeTo.estimate_gas(v2.address, {"from": account})
+
+    def upgrade():
+        return [beacon.upgradeTo(v2.address, {"from": account, "gas_limit": gas})]
+
+    return upgrade
+
+
+def _deploy_beacon(account):
+    logic = LogicContractBeaconV1.deploy({"from": account})
+    beacon = UpgradeableBeacon.deploy(
+        logic.address, {"from": account, "gas_limit": 1_000_000}
+    )
+    return beacon, LogicContractBeaconV2.deploy({"from": account})
+
+
+def deploy_beacon_fleet(account, size):
+    beacon, v2 = _deploy_beacon(account)
+    plan = DeploymentPlan()
+    for i in range(size):
+        plan.deploy(
+            f"proxy_{i}",
+            BeaconProxy,
+            beacon.address,
+            encode_function_data(),
+            tx={"gas_limit": 1_000_000},
+        )
+    results = plan.execute(account)
+    proxies = [results[f"proxy_{i}"] for i in range(size)]
+    return proxies, v2, _beacon_upgrade(account, beacon, v2)
+
+
+def deploy_beacon_clone_fleet(account, size):
+    # EIP-1167 clones of the BeaconProxyFactory, not BeaconProxy instances
+    beacon, v2 = _deploy_beacon(account)
+    proxies = create_beacon_proxies(deploy_beacon_proxy_factory(beacon), size)
+    return proxies, v2, _beacon_upgrade(account, beacon, v2)
+
+
+FLEETS = {
+    "transparent": deploy_transparent_fleet,
+    "uups": deploy_uups_fleet,
+    "beacon": deploy_beacon_fleet,
+    "beacon_clones": deploy_beacon_clone_fleet,
+}
+
+
+def bench_fleet(deploy_fleet, size, account):
+    """Upgrades a fleet of `size` proxies to V2 and measures it.
+
+    Args:
+        deploy_fleet (Callable): Deploys the proxies to V1 and V2, and returns
+        (proxies, V2, function sending the upgrade transactions of every proxy
+        and returning them). Only that function is timed, what it reads, deploys
+        or estimates is done by `deploy_fleet`.
+
+    Returns:
+        [dict]: The gas, transactions and seconds of the whole upgrade, and the
+        extra gas of a call through a proxy afterwards.
+    """
+    proxies, v2, upgrade = deploy_fleet(account, size)
+    start = time.perf_counter()
+    txs = upgrade()
+    seconds = time.perf_counter() - start
+
+    proxy = Contract.from_abi(v2._name, str(proxies[0]), v2.abi)
+    calls = measure_calls(proxy, account)
+    direct = measure_calls(v2, account)
+    upgrade_gas = sum(tx.gas_used for tx in txs)
+    return {
+        "upgrade_gas": upgrade_gas,
+        "upgrade_txs": len(txs),
+        "upgrade_seconds": round(seconds, 3),
+        "gas_per_proxy": upgrade_gas // size,
+        "overhead": {name: calls[name] - direct[name] for name in calls},
+    }
+
+
+def run_fleet_benchmarks(sizes=FLEET_SIZES, account=None):
+    account = account or get_account()
+    return {
+        name: {str(size): bench_fleet(deploy, size, account) for size in sizes}
+        for name, deploy in FLEETS.items()
+    }
+
+
+def chart_data(results):
+    """Returns the results as one series per pattern and metric, e.g. for a plot.
+
+    Returns:
+        [dict]: {"sizes": [1, 10, ...], "series": {pattern: {metric: [...]}}}.
+    """
+    sizes = sorted({int(size) for fleets in results.values() for size in fleets})
+    return {
+        "sizes": sizes,
+        "series": {
+            name: {
+                metric: [fleets[str(size)][metric] for size in sizes]
+                for metric in METRICS + ("overhead",)
+            }
+            for name, fleets in results.items()
+        },
+    }
+
+
+def print_results(results):
+    print(f"{'pattern':<14}{'proxies':>8}{'gas':>12}{'txs':>6}", end="")
+    print(f"{'seconds':>10}{'gas/proxy':>11}{'call overhead':>15}")
+    for name, fleets in results.items():
+        for size, result in fleets.items():
+            print(
+                f"{name:<14}{size:>8}{result['upgrade_gas']:>12}"
+                f"{result['upgrade_txs']:>6}{result['upgrade_seconds']:>10.2f}"
+                f"{result['gas_per_proxy']:>11}{result['overhead']['retrieve']:>15}"
+            )
+
+
+def main():
+    results = run_fleet_benchmarks()
+    print_results(results)
+    save({"results": results, "chart": chart_data(results)}, RESULTS_PATH)
+    print(f"Results written to {RESULTS_PATH}")
@@ -0,0 +1,409 @@
+import json
+from pathlib import Path
+
+from brownie import (
+    LogicContractV1,
+    LogicContractV2,
+    ProxyAdmin,
+    TransparentUpgradeableProxy,
+    ImmutableAdminTransparentProxy,
+    LogicContractUUPSV1,
+    LogicContractUUPSV2,
+    ERC1967Proxy,
+    LogicContractBeaconV1,
+    LogicContractBeaconV2,
+    UpgradeableBeacon,
+    BeaconProxy,
+    ImmutableBeaconProxy,
+    FacetSquareV1,
+    FacetSquareV2,
+    DiamondCutFacet,
+    Diamond,
+    Contract,
+    ZERO_ADDRESS,
+)
+from scripts.helpful_scripts import get_account, encode_function_data
+from scripts.selector_registry import get_selector, get_selectors, to_selector
+from scripts.diamond_cut_planner import plan_diamond_cut, ADD, REPLACE, REMOVE
+from scripts.frozen_router import compile_router, deploy_router
+from scripts.minimal_proxy import deploy_minimal_proxy
+
+BENCHMARK_PATH = Path(__file__).resolve().parent.parent.joinpath("benchmarks")
+RESULTS_PATH = BENCHMARK_PATH.joinpath("gas_results.json")
+SNAPSHOT_PATH = BENCHMARK_PATH.joinpath("gas_snapshot.json")
+# a number may grow by up to 1% before it counts as a regression
+GAS_TOLERANCE = 0.01
+# number of selectors added then removed by a single diamondCut
+CUT_SIZES = (1, 10, 100)
+# number of selectors routed by the diamonds compared to a frozen router
+ROUTER_SIZES = (10, 100, 500)
+# selectors per diamondCut when filling a diamond, to stay under the gas limit
+CUT_BATCH = 100
+
+
+def measure_calls(contract, account):
+    # the first store() writes a zero slot, measure a second one
+    contract.store(1, {"from": account})
+    return {
+        "store": contract.store(2, {"from": account}).gas_used,
+        "retrieve": contract.retrieve.transact({"from": account}).gas_used,
+        "square": contract.square.transact(3, {"from": account}).gas_used,
+    }
+
+
+def pattern_result(deployments, proxy, logic, upgrade, account):
+    """Measures one proxy pattern.
+
+    Args:
+        deployments (list): The contracts deployed to stand the pattern up, the
+        proxy being the last one.
+
+        proxy (Contract): The proxy, with the ABI of the logic contract.
+
+        logic (Contract): The logic contract behind the proxy, called directly.
+
+        upgrade (Callable): Upgrades the proxy to V2 and returns the transaction.
+
+    Returns:
+        [dict]: The gas used by each operation.
+    """
+    calls = measure_calls(proxy, account)
+    direct = measure_calls(logic, account)
+    return {
+        "deploy": deployments[-1].tx.gas_used,
+        "deploy_total": sum(i.tx.gas_used for i in deployments),
+        "calls": calls,
+        "direct": direct,
+        "overhead": {name: calls[name] - direct[name] for name in calls},
+        "upgrade": upgrade().gas_used,
+    }
+
+
+def bench_transparent(account, proxy_container=TransparentUpgradeableProxy):
+    logic = LogicContractV1.deploy(99, {"from": account})
+    proxy_admin = ProxyAdmin.deploy({"from": account})
+    proxy = proxy_container.deploy(
+        logic.address,
+        proxy_admin.address,
+        encode_function_data(),
+        {"from": account, "gas_limit": 1_000_000},
+    )
+
+    def upgrade():
+        v2 = LogicContractV2.deploy({"from": account})
+        return proxy_admin.upgrade(proxy.address, v2.address, {"from": account})
+
+    return pattern_result(
+        [logic, proxy_admin, proxy],
+        Contract.from_abi("LogicContractV1", proxy.address, LogicContractV1.abi),
+        logic,
+        upgrade,
+        account,
+    )
+
+
+def bench_uups(account, minimal=False):
+    logic = LogicContractUUPSV1.deploy({"from": account})
+    if minimal:
+        proxy = deploy_minimal_proxy(logic, encode_function_data(logic.initialize, 0))
+    else:
+        proxy = ERC1967Proxy.deploy(
+            logic.address,
+            encode_function_data(logic.initialize, 0),
+            {"from": account, "gas_limit": 1_000_000},
+        )
+    proxy_logic = Contract.from_abi(
+        "LogicContractUUPSV1", proxy.address, LogicContractUUPSV1.abi
+    )
+
+    def upgrade():
+        v2 = LogicContractUUPSV2.deploy({"from": account})
+        return proxy_logic.upgradeTo(v2.address, {"from": account})
+
+    return pattern_result([logic, proxy], proxy_logic, logic, upgrade, account)
+
+
+def bench_beacon(account, proxy_container=BeaconProxy):
+    logic = LogicContractBeaconV1.deploy({"from": account})
+    beacon = UpgradeableBeacon.deploy(
+        logic.address, {"from": account, "gas_limit": 1_000_000}
+    )
+    proxy = proxy_container.deploy(
+        beacon.address,
+        encode_function_data(),
+        {"from": account, "gas_limit": 1_000_000},
+    )
+
+    def upgrade():
+        v2 = LogicContractBeaconV2.deploy({"from": account})
+        return beacon.upgradeTo(v2.address, {"from": account})
+
+    return pattern_result(
+        [logic, beacon, proxy],
+        Contract.from_abi("LogicContractBeaconV1", proxy.address, logic.abi),
+        logic,
+        upgrade,
+        account,
+    )
+
+
+def bench_diamond(account):
+    square_facet = FacetSquareV1.deploy({"from": account})
+    cut_facet = DiamondCutFacet.deploy({"from": account})
+    proxy = Diamond.deploy(
+        plan_diamond_cut(
+            {
+                square_facet: get_selectors(FacetSquareV1),
+                cut_facet: get_selectors(DiamondCutFacet),
+            }
+        ),
+        [account, ZERO_ADDRESS, ""],
+        {"from": account, "gas_limit": 10_000_000},
+    )
+
+    def upgrade():
+        v2 = FacetSquareV2.deploy({"from": account})
+        proxy_cut_facet = Contract.from_abi(
+            "DiamondCutFacet", proxy.address, DiamondCutFacet.abi
+        )
+        return proxy_cut_facet.diamondCut(
+            [[v2.address, REPLACE, [get_selector("square(uint256)")]]],
+            ZERO_ADDRESS,
+            "",
+            {"from": account},
+        )
+
+    return pattern_result(
+        [square_facet, cut_facet, proxy],
+        Contract.from_abi("FacetSquareV1", proxy.address, FacetSquareV1.abi),
+        square_facet,
+        upgrade,
+        account,
+    )
+
+
+def bench_diamond_cut(account, sizes=CUT_SIZES):
+    """Measures diamondCut adding, then removing, `sizes` selectors at once.
+
+    Returns:
+        [dict]: {"add": {size: gas}, "remove": {size: gas}}.
+    """
+    facet = FacetSquareV1.deploy({"from": account})
+    cut_facet = DiamondCutFacet.deploy({"from": account})
+    proxy = Diamond.deploy(
+        [[cut_facet.address, ADD, get_selectors(DiamondCutFacet)]],
+        [account, ZERO_ADDRESS, ""],
+        {"from": account, "gas_limit": 10_000_000},
+    )
+    proxy_cut_facet = Contract.from_abi(
+        "DiamondCutFacet", proxy.address, DiamondCutFacet.abi
+    )
+    result = {"add": {}, "remove": {}}
+    for size in sizes:
+        # the facet does not need to implement the selectors to route them
+        selectors = [to_selector(f"benchmark{size}_{i}()") for i in range(size)]
+        for action, address in [(ADD, facet.address), (REMOVE, ZERO_ADDRESS)]:
+            tx = proxy_cut_facet.diamondCut(
+                [[address, action, selectors]],
+                ZERO_ADDRESS,
+                "",
+                {"from": account, "gas_limit": 10_000_000},
+            )
+            result["add" if action == ADD else "remove"][str(size)] = tx.gas_used
+    return result
+
+
+def bench_frozen_router(account, sizes=ROUTER_SIZES):
+    """Measures the calls through a Diamond and a frozen router routing `sizes` selectors.
+
+    retrieve() and square() are frozen in the router, store() is left in its storage
+    to measure the cost of a selector missing from the frozen table.
+
+    Returns:
+        [dict]: {"diamond": {size: calls}, "frozen": {size: calls}}.
+    """
+    square_facet = FacetSquareV1.deploy({"from": account})
+    cut_facet = DiamondCutFacet.deploy({"from": account})
+    store = get_selector("store(uint256)")
+    result = {"diamond": {}, "frozen": {}}
+    for size in sizes:
+        # the facet does not need to implement the selectors to route them
+        frozen = [get_selector("retrieve()"), get_selector("square(uint256)")]
+        frozen += [to_selector(f"router{size}_{i}()") for i in range(size - 2)]
+
+        diamond = Diamond.deploy(
+            [
+                [cut_facet.address, ADD, get_selectors(DiamondCutFacet)],
+                [square_facet.address, ADD, [store]],
+            ],
+            [account, ZERO_ADDRESS, ""],
+            {"from": account, "gas_limit": 10_000_000},
+        )
+        proxy_cut_facet = Contract.from_abi(
+            "DiamondCutFacet", diamond.address, DiamondCutFacet.abi
+        )
+        for start in range(0, size, CUT_BATCH):
+            proxy_cut_facet.diamondCut(
+                [[square_facet.address, ADD, frozen[start : start + CUT_BATCH]]],
+                ZERO_ADDRESS,
+                "",
+                {"from": account, "gas_limit": 10_000_000},
+            )
+        router = deploy_router(
+            compile_router([frozen], f"FrozenDiamond{size}"),
+            [square_facet],
+            [account, ZERO_ADDRESS, ""],
+            [[square_facet.address, ADD, [store]]],
+        )
+
+        for name, proxy in [("diamond", diamond), ("frozen", router)]:
+            result[name][str(size)] = measure_calls(
+                Contract.from_abi("FacetSquareV1", proxy.address, FacetSquareV1.abi),
+                account,
+            )
+    return result
+
+
+BENCHMARKS = {
+    "transparent": bench_transparent,
+    "transparent_immutable_admin": lambda account: bench_transparent(
+        account, ImmutableAdminTransparentProxy
+    ),
+    "uups": bench_uups,
+    "uups_minimal": lambda account: bench_uups(account, minimal=True),
+    "beacon": bench_beacon,
+    "beacon_immutable": lambda account: bench_beacon(account, ImmutableBeaconProxy),
+    "diamond": bench_diamond,
+}
+
+
+def run_benchmarks(account=None):
+    account = account or get_account()
+    results = {name: bench(account) for name, bench in BENCHMARKS.items()}
+    results["diamond_cut"] = bench_diamond_cut(account)
+    results["frozen_router"] = bench_frozen_router(account)
+    return results
+
+
+def flatten(results, prefix=""):
+    """Flattens nested results into {"transparent.calls.store": gas, ...}."""
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def find_regressions(results, snapshot, tolerance=GAS_TOLERANCE):
+    """Compares `results` with `snapshot`.
+
+    Overheads are differences between two measures, so they are compared to the
+    proxied call they belong to rather than to their own, much smaller, value.
+
+    Returns:
+        [dict]: name => (snapshot gas, new gas) for every number that got worse.
+    """
+    new = flatten(results)
+    old = flatten(snapshot)
+    regressions = {}
+    for name, gas in new.items():
+        if name not in old:
+            continue
+        reference = old[name]
+        if ".overhead." in name:
+            reference = old.get(name.replace(".overhead.", ".calls."), reference)
+        if gas - old[name] > reference * tolerance:
+            regressions[name] = (old[name], gas)
+    return regressions
+
+
+def compare_results(results, before):
+    """Pairs every number of `results` with the same one in `before`.
+
+    Returns:
+        [dict]: name => (gas before, gas in `results`), for the names in both.
+    """
+    new = flatten(results)
+    old = flatten(before)
+    return {name: (old[name], new[name]) for name in new if name in old}
+
+
+def load_snapshot():
+    if not SNAPSHOT_PATH.exists():
+        return None
+    return json.loads(SNAPSHOT_PATH.read_text())
+
+
+def save(results, path):
+    BENCHMARK_PATH.mkdir(exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+
+def print_results(results):
+    print(f"{'pattern':<28}{'deploy':>10}{'store':>8}{'retrieve':>10}", end="")
+    print(f"{'square':>8}{'upgrade':>10}{'overhead':>10}")
+    for name in BENCHMARKS:
+        result = results[name]
+        print(
+            f"{name:<28}{result['deploy']:>10}{result['calls']['store']:>8}"
+            f"{result['calls']['retrieve']:>10}{result['calls']['square']:>8}"
+            f"{result['upgrade']:>10}{result['overhead']['retrieve']:>10}"
+        )
+    print(f"\n{'diamondCut selectors':<28}{'add':>10}{'remove':>10}")
+    for size, gas in results["diamond_cut"]["add"].items():
+        print(f"{size:<28}{gas:>10}{results['diamond_cut']['remove'][size]:>10}")
+    print(f"\n{'routed selectors':<28}{'retrieve':>10}{'square':>8}{'store':>8}")
+    for size, calls in results["frozen_router"]["diamond"].items():
+        frozen = results["frozen_router"]["frozen"][size]
+        for name, measured in [("diamond", calls), ("frozen", frozen)]:
+            print(
+                f"{size + ' ' + name:<28}{measured['retrieve']:>10}"
+                f"{measured['square']:>8}{measured['store']:>8}"
+            )
+
+
+def print_comparison(comparison):
+    print(f"{'measure':<48}{'before':>10}{'after':>10}{'change':>9}")
+    for name, (old, new) in comparison.items():
+        change = f"{(new - old) / old:+.1%}" if old else ""
+        print(f"{name:<48}{old:>10}{new:>10}{change:>9}")
+
+
+def compare(path=SNAPSHOT_PATH):
+    """Runs the benchmarks and prints them next to the results saved at `path`.
+
+    For the numbers before and after a change, e.g. with the results of `main`
+    saved on the commit before it:
+
+        brownie run scripts/benchmark_gas.py compare build/gas_before.json
+    """
+    results = run_benchmarks()
+    print_comparison(compare_results(results, json.loads(Path(path).read_text())))
+    save(results, RESULTS_PATH)
+
+
+def update_snapshot():
+    results = run_benchmarks()
+    print_results(results)
+    save(results, SNAPSHOT_PATH)
+    print(f"Snapshot written to {SNAPSHOT_PATH}")
+
+
+def main():
+    results = run_benchmarks()
+    print_results(results)
+    save(results, RESULTS_PATH)
+    snapshot = load_snapshot()
+    if snapshot is None:
+        # nothing to compare with is a failure, as in test_no_gas_regression
+        print(
+            "No snapshot yet, run `brownie run scripts/benchmark_gas.py update_snapshot`"
+        )
+        raise SystemExit(1)
+    regressions = find_regressions(results, snapshot)
+    for name, (old, new) in regressions.items():
+        print(f"REGRESSION {name}: {old} -> {new}")
+    if regressions:
+        raise SystemExit(1)
@@ -0,0 +1,157 @@
+import json
+from pathlib import Path
+
+from brownie import accounts, chain, project, web3
+
+STATE_VERSION = 1
+# storage entries per debug_storageRangeAt request
+STORAGE_PAGE = 1024
+FIRST_KEY = "0x" + "00" * 32
+
+# methods setting the code, a storage slot, the nonce and the balance of an account
+SET_STATE_METHODS = {
+    "ganache": (
+        "evm_setAccountCode",
+        "evm_setAccountStorageAt",
+        "evm_setAccountNonce",
+        "evm_setAccountBalance",
+    ),
+    "hardhat": (
+        "hardhat_setCode",
+        "hardhat_setStorageAt",
+        "hardhat_setNonce",
+        "hardhat_setBalance",
+    ),
+}
+
+
+def _hex(data):
+    # HexBytes.hex() drops the 0x prefix in recent versions
+    data = data if isinstance(data, str) else data.hex()
+    return data if data.startswith("0x") else "0x" + data
+
+
+def _request(method, params):
+    response = web3.provider.make_request(method, params)
+    if "error" in response:
+        raise ValueError(f"{method} failed: {response['error']}")
+    return response["result"]
+
+
+def _node():
+    # debug_storageRangeAt and the methods setting the state are not standard, and
+    # e.g. eth-tester has none of them
+    client = web3.client_version.lower()
+    for node in SET_STATE_METHODS:
+        if node in client:
+            return node
+    raise ValueError(
+        f"The chain state can only be saved and loaded on ganache or hardhat, "
+        f"not on {web3.client_version}"
+    )
+
+
+def read_storage(address, block_hash):
+    """Reads every non-zero storage slot of `address` with `debug_storageRangeAt`.
+
+    Returns:
+        [dict]: slot => value, both as 32 bytes hex strings.
+    """
+    storage = {}
+    start = FIRST_KEY
+    while start:
+        result = _request(
+            "debug_storageRangeAt", [block_hash, 0, address, start, STORAGE_PAGE]
+        )
+        for entry in result["storage"].values():
+            if entry["key"] is None:
+                raise ValueError("The node does not return the storage keys")
+            storage[entry["key"]] = entry["value"]
+        start = result["nextKey"]
+    return storage
+
+
+def save_chain_state(path, stacks):
+    """Writes the deployed `stacks` and the local accounts to `path`.
+
+    Args:
+        path (str): The JSON file to write.
+
+        stacks (dict): stack name => {role: contract}, e.g.
+        `{"transparent": {"admin": proxy_admin, "proxy": proxy}}`. Every contract
+        must come from a project container, e.g. `ProxyAdmin.deploy(...)`.
+    """
+    _node()
+    # an empty block, its state before the first transaction is the current state
+    chain.mine()
+    block_hash = _hex(web3.eth.get_block("latest")["hash"])
+    state = {
+        "version": STATE_VERSION,
+        "accounts": {
+            account.address: {"nonce": account.nonce, "balance": account.balance()}
+            for account in accounts
+        },
+        "contracts": {},
+        "stacks": {},
+    }
+    for stack, contracts in stacks.items():
+        state["stacks"][stack] = {}
+        for role, contract in contracts.items():
+            address = contract.address
+            state["stacks"][stack][role] = [contract._name, address]
+            state["contracts"][address] = {
+                "bytecodeSha1": contract._build["bytecodeSha1"],
+                "code": _hex(web3.eth.get_code(address)),
+                "nonce": web3.eth.get_transaction_count(address),
+                "balance": web3.eth.get_balance(address),
+                "storage": read_storage(address, block_hash),
+            }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(state, indent=1))
+
+
+def load_chain_state(path):
+    """Seeds the local chain with the state saved by `save_chain_state`.
+
+    Returns:
+        [dict]: stack name => {role: contract}, or None when there is no saved state
+        or when a contract was compiled again since it was saved.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    state = json.loads(path.read_text())
+    if state.get("version") != STATE_VERSION:
+        return None
+    containers = project.get_loaded_projects()[0].dict()
+    for stack in state["stacks"].values():
+        for name, address in stack.values():
+            if name not in containers:
+                return None
+            build = containers[name]._build
+            if build["bytecodeSha1"] != state["contracts"][address]["bytecodeSha1"]:
+                return None
+
+    node = _node()
+    set_code, set_storage, set_nonce, set_balance = SET_STATE_METHODS[node]
+    for address, account in state["accounts"].items():
+        _request(set_nonce, [address, hex(account["nonce"])])
+        _request(set_balance, [address, hex(account["balance"])])
+    for address, contract in state["contracts"].items():
+        _request(set_code, [address, contract["code"]])
+        _request(set_nonce, [address, hex(contract["nonce"])])
+        _request(set_balance, [address, hex(contract["balance"])])
+        for slot, value in contract["storage"].items():
+            if node == "hardhat":
+                # hardhat takes the slot as a quantity
+                slot = hex(int(slot, 16))
+            _request(set_storage, [address, slot, value])
+    chain.mine()
+
+    return {
+        stack: {
+            role: containers[name].at(address)
+            for role, (name, address) in contracts.items()
+        }
+        for stack, contracts in state["stacks"].items()
+    }
@@ -3,20 +3,25 @@ from brownie import (
     LogicContractBeaconV2,
     BeaconProxy,
     UpgradeableBeacon,
+    BeaconProxyFactory,
+    ImmutableBeaconProxy,
     network,
     Contract,
 )
-from scripts.helpful_scripts import get_account, encode_function_data
+from scripts.helpful_scripts import (
+    get_account,
+    encode_function_data,
+    get_batch_size,
+)
+from scripts.deployment_registry import deploy_deterministic
 
 
 def deploy():
     account = get_account()
     print(f"Deploying to {network.show_active()}")
 
-    # 1) Deploy the logic contract
-    logic_contract = LogicContractBeaconV1.deploy(
-        {"from": account},
-    )
+    # 1) Deploy the logic contract, or reuse the one already deployed
+    logic_contract = deploy_deterministic(LogicContractBeaconV1)
     print(f"V1 address : {logic_contract}")
 
     # interaction with the logic contract directly
@@ -72,9 +77,7 @@ def deploy():
     print("################################################################")
 
     # deploy new implementation
-    logic_contract_v2 = LogicContractBeaconV2.deploy(
-        {"from": account},
-    )
+    logic_contract_v2 = deploy_deterministic(LogicContractBeaconV2)
     print(f"V2 address : {logic_contract_v2}")
     # upgrade to the new implementation
     print(
@@ -92,5 +95,85 @@ def deploy():
     )
 
 
+def deploy_beacon_proxy_V1():
+    account = get_account()
+    logic_contract = LogicContractBeaconV1.deploy(
+        {"from": account},
+    )
+    beacon = UpgradeableBeacon.deploy(
+        logic_contract.address,
+        {"from": account, "gas_limit": 1_000_000},
+    )
+    proxy = BeaconProxy.deploy(
+        beacon.address,
+        encode_function_data(),
+        {"from": account, "gas_limit": 1_000_000},
+    )
+    return logic_contract, beacon, proxy
+
+
+def deploy_immutable_beacon_proxy(beacon, initializer_data=b""):
+    # cheaper calls than a BeaconProxy, but the beacon can never be changed
+    account = get_account()
+    proxy = ImmutableBeaconProxy.deploy(
+        beacon.address,
+        initializer_data,
+        {"from": account, "gas_limit": 1_000_000},
+    )
+    return proxy
+
+
+def deploy_beacon_proxy_factory(beacon):
+    account = get_account()
+    factory = BeaconProxyFactory.deploy(
+        beacon.address,
+        {"from": account},
+    )
+    return factory
+
+
+def create_beacon_proxies(factory, count, initializer_data=b"", salts=None):
+    """Creates `count` instances with as few transactions as the block gas limit allows.
+
+    Args:
+        factory ([brownie.network.contract.ProjectContract]):
+        The `BeaconProxyFactory` to deploy the instances with.
+
+        count (int):
+        The number of instances.
+
+        initializer_data (bytes, optional):
+        The call made to each instance, see `encode_function_data`.
+
+        salts (list, optional):
+        One bytes32 salt per instance to deploy them at deterministic addresses.
+
+    Returns:
+        [list]: The addresses of the new instances.
+    """
+    account = get_account()
+    if salts is not None and len(salts) != count:
+        raise ValueError("There must be one salt per instance")
+
+    def send(start, size, estimate=False):
+        if salts is None:
+            method, args = factory.createProxies, (size, initializer_data)
+        else:
+            method, args = factory.createProxiesDeterministic, (
+                salts[start : start + size],
+                initializer_data,
+            )
+        if estimate:
+            return method.estimate_gas(*args, {"from": account})
+        return method(*args, {"from": account})
+
+    batch_size = get_batch_size(lambda n: send(0, n, estimate=True), max_size=count)
+    proxies = []
+    for start in range(0, count, batch_size):
+        tx = send(start, min(batch_size, count - start))
+        proxies += [event["proxy"] for event in tx.events["ProxyCreated"]]
+    return proxies
+
+
 def main():
     deploy()
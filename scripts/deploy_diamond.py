@@ -2,19 +2,21 @@ from brownie import (
     FacetSquareV1,
     FacetSquareV2,
     DiamondCutFacet,
+    DiamondLoupeFacet,
     Diamond,
+    DiamondMultiInit,
     Contract,
     ZERO_ADDRESS,
 )
 from scripts.helpful_scripts import get_account
-from web3 import Web3
+from scripts.selector_registry import get_selector, get_selectors
+from scripts.diamond_cut_planner import plan_diamond_cut, plan_diamond_upgrade
+from scripts.deployment_registry import deploy_deterministic
 
 
 def deploy_facet(contract):
-    account = get_account()
-    facet = contract.deploy(
-        {"from": account},
-    )
+    # facets hold no state, one deployment per bytecode is shared by every diamond
+    facet = deploy_deterministic(contract)
     return facet
 
 
@@ -31,46 +33,79 @@ def deploy_proxy(_args, _diamondCut):
     return proxy
 
 
-def diamondCut(proxy, _diamondCut):
+def deploy_multi_init():
+    # stateless, shared by every diamond like the facets
+    return deploy_deterministic(DiamondMultiInit)
+
+
+def encode_multi_init(multi_init, inits):
+    """Encodes several initializations as the `_init` and `_calldata` of one cut.
+
+    Args:
+        multi_init ([brownie.network.contract.ProjectContract]): The
+        DiamondMultiInit, see `deploy_multi_init`.
+
+        inits (list): (init contract, calldata) of each initialization, run in
+        order. Example: `[(square_facet, square_facet.store.encode_input(5))]`.
+
+    Returns:
+        [tuple]: (`_init`, `_calldata`) for `diamondCut`.
+    """
+    addresses = [str(getattr(init, "address", init)) for init, _ in inits]
+    calldata = [calldata for _, calldata in inits]
+    return multi_init.address, multi_init.multiInit.encode_input(addresses, calldata)
+
+
+def diamondCut(proxy, _diamondCut, _init=ZERO_ADDRESS, _calldata=""):
     account = get_account()
     proxy_diamond_cut_facet = Contract.from_abi(
         "DiamondCutFacet", proxy.address, DiamondCutFacet.abi
     )
     tx = proxy_diamond_cut_facet.diamondCut(
         _diamondCut,
-        ZERO_ADDRESS,
-        "",
+        _init,
+        _calldata,
         {"from": account, "gas_limit": 10_000_000},
     )
     return tx
 
 
-def main():
+def upgrade_diamond(proxy, target, remove_missing=False, keep=(), inits=()):
+    # only send the selectors whose routing actually changes, and every
+    # initialization in the same transaction
+    _diamondCut = plan_diamond_upgrade(proxy, target, remove_missing, keep)
+    if not _diamondCut and not inits:
+        return None
+    if not inits:
+        return diamondCut(proxy, _diamondCut)
+    _init, _calldata = encode_multi_init(deploy_multi_init(), inits)
+    return diamondCut(proxy, _diamondCut, _init, _calldata)
+
+
+def deploy_diamond_V1():
     account = get_account()
     square_facet = deploy_facet(FacetSquareV1)
     cutDiamond_facet = deploy_facet(DiamondCutFacet)
+    loupe_facet = deploy_facet(DiamondLoupeFacet)
 
-    func_selector_retrieve = Web3.keccak(text="retrieve()")[:4].hex()
-    func_selector_store = Web3.keccak(text="store(uint256)")[:4].hex()
-    func_selector_square = Web3.keccak(text="square(uint256)")[:4].hex()
-    func_selector_diamondCut = Web3.keccak(
-        text="diamondCut((address,uint8,bytes4[])[],address,bytes)"
-    )[:4].hex()
-    _diamondCut = [
-        [square_facet.address, 0, [func_selector_retrieve]],
-        [square_facet.address, 0, [func_selector_store]],
-        [square_facet.address, 0, [func_selector_square]],
-        [cutDiamond_facet.address, 0, [func_selector_diamondCut]],
-    ]
+    # one FacetCut per facet, with all of its selectors
+    _diamondCut = plan_diamond_cut(
+        {
+            square_facet: get_selectors(FacetSquareV1),
+            cutDiamond_facet: get_selectors(DiamondCutFacet),
+            loupe_facet: get_selectors(DiamondLoupeFacet),
+        }
+    )
     _arg = [account, ZERO_ADDRESS, ""]
 
     diamond = deploy_proxy(_arg, _diamondCut)
+    return square_facet, cutDiamond_facet, loupe_facet, diamond
 
-    square_facet_2 = deploy_facet(FacetSquareV2)
 
-    func_selector_square = Web3.keccak(text="square(uint256)")[:4].hex()
-    _diamondCut = [
-        [square_facet_2.address, 1, [func_selector_square]],
-    ]
+def main():
+    square_facet, _, _, diamond = deploy_diamond_V1()
+
+    square_facet_2 = deploy_facet(FacetSquareV2)
 
-    diamondCut(diamond, _diamondCut)
+    # route the fixed square(uint256) to the new facet
+    upgrade_diamond(diamond, {square_facet_2: [get_selector("square(uint256)")]})
@@ -0,0 +1,187 @@
+from brownie import Contract
+from scripts.helpful_scripts import get_account
+
+
+class Ref:
+    """Stands for the result of an earlier step of a `DeploymentPlan`.
+
+    When used as an argument, it is replaced by the address of the contract
+    deployed by that step.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"<Ref '{self.name}'>"
+
+
+class DeploymentError(Exception):
+    """Raised when a transaction of a plan reverts."""
+
+    def __init__(self, name, tx):
+        self.name = name
+        self.tx = tx
+        super().__init__(f"Step '{name}' reverted: {tx.revert_msg}")
+
+
+def _refs(value):
+    if isinstance(value, Ref):
+        return [value.name]
+    if isinstance(value, (list, tuple)):
+        return [name for i in value for name in _refs(i)]
+    return []
+
+
+def _resolve(value, results):
+    if isinstance(value, Ref):
+        result = results[value.name]
+        return getattr(result, "address", result)
+    if isinstance(value, (list, tuple)):
+        return type(value)(_resolve(i, results) for i in value)
+    return value
+
+
+class _Step:
+    def __init__(self, name, args, depends_on, tx):
+        self.name = name
+        self.args = args
+        self.depends_on = depends_on
+        self.tx = tx or {}
+
+    def _params(self, account, nonce):
+        return {"from": account, "nonce": nonce, "required_confs": 0, **self.tx}
+
+
+class _DeployStep(_Step):
+    def __init__(self, name, container, args, depends_on, tx):
+        super().__init__(name, args, depends_on, tx)
+        self.container = container
+
+    def send(self, results, account, nonce):
+        # a raw transaction: `deploy` returns the contract instead of the receipt
+        # when it is mined before `deploy` returns, even with `required_confs=0`
+        args = _resolve(self.args, results)
+        return account.transfer(
+            data=self.container.deploy.encode_input(*args),
+            nonce=nonce,
+            required_confs=0,
+            **self.tx,
+        )
+
+    def result(self, tx):
+        return self.container.at(tx.contract_address)
+
+
+class _TransactStep(_Step):
+    def __init__(self, name, target, method, args, abi, depends_on, tx):
+        super().__init__(name, args, depends_on, tx)
+        self.target = target
+        self.method = method
+        self.abi = abi
+
+    def send(self, results, account, nonce):
+        target = (
+            results[self.target.name] if isinstance(self.target, Ref) else self.target
+        )
+        if self.abi is not None:
+            # e.g. call the logic contract functions through a proxy
+            target = Contract.from_abi(self.abi._name, target.address, self.abi.abi)
+        args = _resolve(self.args, results)
+        return getattr(target, self.method)(*args, self._params(account, nonce))
+
+    def result(self, tx):
+        return tx
+
+
+class DeploymentPlan:
+    """A set of deployments and transactions with the dependencies between them.
+
+    Steps that do not depend on each other are broadcast together, each with its
+    own locally managed nonce. The plan only waits for a transaction to be mined
+    when a step still to be sent needs its result.
+
+    Example:
+
+        plan = DeploymentPlan()
+        logic = plan.deploy("logic", LogicContractV1, 99)
+        admin = plan.deploy("admin", ProxyAdmin)
+        plan.deploy("proxy", TransparentUpgradeableProxy, logic, admin, b"")
+        results = plan.execute()
+    """
+
+    def __init__(self):
+        self._steps = {}
+
+    def _add(self, step):
+        if step.name in self._steps:
+            raise ValueError(f"Step '{step.name}' already exists")
+        missing = [name for name in step.depends_on if name not in self._steps]
+        if missing:
+            raise ValueError(f"Step '{step.name}' depends on unknown steps {missing}")
+        self._steps[step.name] = step
+        return Ref(step.name)
+
+    def deploy(self, name, container, *args, after=(), tx=None):
+        """Adds the deployment of `container` with the constructor `args`.
+
+        Args:
+            name (str): Name of the step, used to reference its contract.
+
+            container ([brownie.network.contract.ContractContainer]):
+            The contract to deploy. Example: `ProxyAdmin`.
+
+            args (Any, optional): The constructor arguments, `Ref` are resolved.
+
+            after (Iterable[Ref], optional): Extra steps that must be mined first.
+
+            tx (dict, optional): Extra transaction parameters, e.g. `gas_limit`. For
+            a deployment, keyword arguments of `Account.transfer`.
+
+        Returns:
+            [Ref]: The reference to the deployed contract.
+        """
+        depends_on = _refs(args) + _refs(tuple(after))
+        return self._add(_DeployStep(name, container, args, depends_on, tx))
+
+    def transact(self, name, target, method, *args, abi=None, after=(), tx=None):
+        """Adds a call to `method` of `target`.
+
+        Args:
+            target (Ref | Contract): The contract to call.
+
+            method (str): Name of the function. Example: `"initialize"`.
+
+            abi ([brownie.network.contract.ContractContainer], optional):
+            ABI to call `target` with, e.g. the logic contract of a proxy.
+        """
+        depends_on = _refs(target) + _refs(args) + _refs(tuple(after))
+        step = _TransactStep(name, target, method, args, abi, depends_on, tx)
+        return self._add(step)
+
+    def execute(self, account=None):
+        """Sends every step of the plan and waits for all of them to be mined.
+
+        Returns:
+            [dict]: step name => deployed contract or transaction receipt.
+        """
+        account = account or get_account()
+        nonce = account.nonce
+        remaining = list(self._steps.values())
+        pending = {}
+        results = {}
+        while remaining or pending:
+            ready = [s for s in remaining if all(d in results for d in s.depends_on)]
+            for step in ready:
+                pending[step.name] = step.send(results, account, nonce)
+                nonce += 1
+                remaining.remove(step)
+            # wait only for the transactions the next steps are waiting for
+            needed = {d for s in remaining for d in s.depends_on if d in pending}
+            for name in [n for n in pending if n in needed or not remaining]:
+                tx = pending.pop(name)
+                tx.wait(1)
+                if tx.status != 1:
+                    raise DeploymentError(name, tx)
+                results[name] = self._steps[name].result(tx)
+        return results
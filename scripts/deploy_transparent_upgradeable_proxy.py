@@ -2,9 +2,12 @@ from brownie import (
     LogicContractV1,
     LogicContractV2,
     TransparentUpgradeableProxy,
+    ImmutableAdminTransparentProxy,
     ProxyAdmin,
 )
-from scripts.helpful_scripts import get_account, encode_function_data
+from scripts.helpful_scripts import get_account, encode_function_data, get_batch_size
+from scripts.deploy_orchestrator import DeploymentPlan
+from scripts.multicall import multicall
 
 
 def deploy_proxy_admin():
@@ -44,6 +47,18 @@ def deploy_proxy(logic_contract, proxy_admin):
     return proxy
 
 
+def deploy_immutable_admin_proxy(logic_contract, proxy_admin):
+    # same as deploy_proxy, but the admin can never be changed
+    account = get_account()
+    proxy = ImmutableAdminTransparentProxy.deploy(
+        logic_contract.address,
+        proxy_admin.address,
+        encode_function_data(),
+        {"from": account, "gas_limit": 1_000_000},
+    )
+    return proxy
+
+
 def upgrade(proxy, new_implementation, proxy_admin):
     account = get_account()
     proxy_admin.upgrade(proxy.address, new_implementation.address, {"from": account})
@@ -56,11 +71,118 @@ def upgrade_and_call(proxy, new_implementation, proxy_admin, initialize_data):
     )
 
 
+def pending_upgrades(proxies, new_implementation, proxy_admin):
+    """Returns the proxies of `proxies` not yet pointing to `new_implementation`.
+
+    The implementations are read with a multicall, a few requests for the fleet.
+    """
+    results = multicall(
+        [(proxy_admin, proxy_admin.getProxyImplementation, [p]) for p in proxies]
+    )
+    return [
+        proxy
+        for proxy, (success, implementation) in zip(proxies, results)
+        if not success or implementation != new_implementation.address
+    ]
+
+
+def plan_fleet_upgrade(
+    proxies, new_implementation, proxy_admin, initialize_data=None, max_batch_size=None
+):
+    """Splits the upgrade of `upgrade_fleet` into transactions, without sending them.
+
+    Reads which proxies are pending and estimates the batch size, see
+    `upgrade_fleet` for the arguments.
+
+    Returns:
+        [list]: (ProxyAdmin function, arguments) of each upgrade transaction, empty
+        if every proxy was already upgraded.
+    """
+    pending = [
+        str(getattr(proxy, "address", proxy))
+        for proxy in pending_upgrades(proxies, new_implementation, proxy_admin)
+    ]
+
+    if initialize_data is None:
+        upgrade_batch = proxy_admin.upgradeBatch
+    else:
+        upgrade_batch = proxy_admin.upgradeAndCallBatch
+
+    def batch_args(batch):
+        args = [batch, [new_implementation.address] * len(batch)]
+        if initialize_data is not None:
+            args.append([initialize_data] * len(batch))
+        return args
+
+    def estimate_gas(size):
+        return upgrade_batch.estimate_gas(
+            *batch_args(pending[:size]), {"from": get_account()}
+        )
+
+    if not pending:
+        return []
+    batch_size = get_batch_size(estimate_gas, max_batch_size)
+    return [
+        (upgrade_batch, batch_args(pending[start : start + batch_size]))
+        for start in range(0, len(pending), batch_size)
+    ]
+
+
+def upgrade_fleet(
+    proxies, new_implementation, proxy_admin, initialize_data=None, max_batch_size=None
+):
+    """Upgrades `proxies` to `new_implementation`, as many per transaction as fit in a block.
+
+    The proxies already pointing to `new_implementation` are skipped, so after a
+    failed chunk, calling this function again resumes where the fleet stopped.
+
+    Args:
+        initialize_data (bytes, optional): Call sent to every proxy after its upgrade,
+        see `encode_function_data`. Defaults to None.
+
+        max_batch_size (int, optional): Upper bound on proxies per transaction.
+
+    Returns:
+        [list]: The upgrade transactions, empty if every proxy was already upgraded.
+    """
+    account = get_account()
+    batches = plan_fleet_upgrade(
+        proxies, new_implementation, proxy_admin, initialize_data, max_batch_size
+    )
+    pending = sum(len(args[0]) for _, args in batches)
+    upgraded = 0
+    txs = []
+    for upgrade_batch, args in batches:
+        tx = upgrade_batch(*args, {"from": account})
+        tx.wait(1)
+        upgraded += len(args[0])
+        print(f"Upgraded {upgraded}/{pending} proxies")
+        txs.append(tx)
+    return txs
+
+
 def deploy_proxy_V1():
-    admin = deploy_proxy_admin()
-    v1 = deploy_logic_contractV1()
-    proxy = deploy_proxy(v1, admin)
-    return admin, v1, proxy
+    admin, v1, proxies = deploy_proxies_V1(1)
+    return admin, v1, proxies[0]
+
+
+def deploy_proxies_V1(count):
+    # the admin and the logic contract are sent together, then all the proxies
+    plan = DeploymentPlan()
+    admin = plan.deploy("admin", ProxyAdmin)
+    v1 = plan.deploy("v1", LogicContractV1, 99)
+    for i in range(count):
+        plan.deploy(
+            f"proxy_{i}",
+            TransparentUpgradeableProxy,
+            v1,
+            admin,
+            encode_function_data(),
+            tx={"gas_limit": 1_000_000},
+        )
+    results = plan.execute(get_account())
+    proxies = [results[f"proxy_{i}"] for i in range(count)]
+    return results["admin"], results["v1"], proxies
 
 
 def deploy_and_upgrade_to_V2():
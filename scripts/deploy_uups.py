@@ -6,15 +6,15 @@ from brownie import (
     Contract,
 )
 from scripts.helpful_scripts import get_account, encode_function_data
+from scripts.deployment_registry import deploy_deterministic
+from scripts.minimal_proxy import deploy_minimal_proxy
 
 
 def deploy():
     account = get_account()
     print(f"Deploying to {network.show_active()}")
-    # deploy the logic contract
-    logic_contract = LogicContractUUPSV1.deploy(
-        {"from": account},
-    )
+    # deploy the logic contract, or reuse the one already deployed
+    logic_contract = deploy_deterministic(LogicContractUUPSV1)
 
     # interaction with the logic contract directly
     logic_contract.store(42, {"from": account})
@@ -46,9 +46,7 @@ def deploy():
     print("################################################################")
 
     # deploy new implementation
-    logic_contract_v2 = LogicContractUUPSV2.deploy(
-        {"from": account},
-    )
+    logic_contract_v2 = deploy_deterministic(LogicContractUUPSV2)
     # upgrade to the new implementation
 
     proxy.upgradeTo(logic_contract_v2, {"from": account})
@@ -58,5 +56,31 @@ def deploy():
     print(f"Here is its square : {proxy.square(3)}")
 
 
+def deploy_proxy_V1(initial_value=3):
+    account = get_account()
+    logic_contract = LogicContractUUPSV1.deploy(
+        {"from": account},
+    )
+    # the owner is set by initialize, in the same transaction as the deployment
+    proxy = ERC1967Proxy.deploy(
+        logic_contract.address,
+        encode_function_data(logic_contract.initialize, initial_value),
+        {"from": account, "gas_limit": 1_000_000},
+    )
+    return logic_contract, proxy
+
+
+def deploy_minimal_proxy_V1(initial_value=3):
+    # same as deploy_proxy_V1, with the hand-written proxy instead of ERC1967Proxy
+    account = get_account()
+    logic_contract = LogicContractUUPSV1.deploy(
+        {"from": account},
+    )
+    proxy = deploy_minimal_proxy(
+        logic_contract, encode_function_data(logic_contract.initialize, initial_value)
+    )
+    return logic_contract, proxy
+
+
 def main():
     deploy()
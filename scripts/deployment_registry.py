@@ -0,0 +1,124 @@
+import json
+from pathlib import Path
+
+import eth_utils
+from brownie import Create2Deployer, chain, config, network, web3
+from scripts.helpful_scripts import get_account, LOCAL_BLOCKCHAIN_ENVIRONMENTS
+
+PROJECT_PATH = Path(__file__).resolve().parent.parent
+# every init code is deployed with the same salt, its address only depends on its hash
+SALT = "0x" + "00" * 32
+REGISTRY_PATH = PROJECT_PATH.joinpath("build", "deployment_registry.json")
+
+
+def deploy_create2_deployer():
+    account = get_account()
+    deployer = Create2Deployer.deploy(
+        {"from": account},
+    )
+    return deployer
+
+
+def get_create2_deployer():
+    """Returns the Create2Deployer of the active network.
+
+    The address is read from `networks.<network>.create2_deployer` in
+    brownie-config.yaml, otherwise the last deployed Create2Deployer is used. One is
+    deployed on local networks.
+
+    The addresses of `deploy_deterministic` only depend on the deployer and the init
+    code. A deployer deployed here is created with CREATE, at an address depending on
+    the account and its nonce, so the same contract gets another address on another
+    chain or after other transactions. For the same addresses across environments,
+    configure `create2_deployer` to a deployer at the same address on each network.
+    """
+    address = config["networks"].get(network.show_active(), {}).get("create2_deployer")
+    if address:
+        return Create2Deployer.at(address)
+    if len(Create2Deployer) > 0:
+        return Create2Deployer[-1]
+    if network.show_active() in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        return deploy_create2_deployer()
+    raise ValueError(
+        f"No Create2Deployer address configured for {network.show_active()}"
+    )
+
+
+def get_init_code(container, *args):
+    """Returns the creation bytecode of `container` followed by its encoded `args`."""
+    return eth_utils.to_bytes(hexstr=container.deploy.encode_input(*args))
+
+
+def compute_address(deployer, init_code_hash):
+    # same as Create2.computeAddress, without a call
+    preimage = (
+        b"\xff"
+        + eth_utils.to_bytes(hexstr=str(getattr(deployer, "address", deployer)))
+        + eth_utils.to_bytes(hexstr=SALT)
+        + init_code_hash
+    )
+    return eth_utils.to_checksum_address(eth_utils.keccak(preimage)[12:])
+
+
+def load_registry(path=REGISTRY_PATH):
+    """Returns the deployments recorded for the active chain.
+
+    Returns:
+        [dict]: init code hash => {"contractName": ..., "address": ...}.
+    """
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text()).get(str(chain.id), {})
+
+
+def _register(init_code_hash, name, address, path=REGISTRY_PATH):
+    path = Path(path)
+    registry = json.loads(path.read_text()) if path.exists() else {}
+    registry.setdefault(str(chain.id), {})[init_code_hash] = {
+        "contractName": name,
+        "address": address,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(registry, indent=1, sort_keys=True))
+
+
+def deploy_deterministic(container, *args, registry_path=REGISTRY_PATH):
+    """Deploys `container` with `args` through the Create2Deployer, once per chain.
+
+    The address is derived from the hash of the init code, i.e. the bytecode and the
+    constructor arguments. When a contract is already deployed there, e.g. by an
+    earlier run or in another environment with the same deployer, it is reused and
+    no transaction is sent. On persistent networks the deployments are recorded
+    in the registry, and a recorded one is reused without reading the chain.
+
+    Args:
+        container ([brownie.network.contract.ContractContainer]):
+        The contract to deploy, e.g. `FacetSquareV1`. Its constructor must not rely
+        on `msg.sender`, which is the deployer.
+
+        args (Any, optional):
+        The constructor arguments.
+
+        registry_path (Path, optional): Defaults to build/deployment_registry.json.
+
+    Returns:
+        [brownie.network.contract.ProjectContract]: The deployed contract.
+    """
+    init_code = get_init_code(container, *args)
+    init_code_hash = eth_utils.keccak(init_code)
+    # local chains are thrown away, only record the persistent ones
+    persistent = network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS
+    if persistent:
+        recorded = load_registry(registry_path).get(eth_utils.to_hex(init_code_hash))
+        if recorded:
+            return container.at(recorded["address"])
+    deployer = get_create2_deployer()
+    address = compute_address(deployer, init_code_hash)
+    if len(web3.eth.get_code(address)) == 0:
+        deployer.deploy(SALT, init_code, {"from": get_account()})
+    if persistent:
+        _register(
+            eth_utils.to_hex(init_code_hash), container._name, address, registry_path
+        )
+    return container.at(address)
@@ -0,0 +1,169 @@
+from brownie import DiamondLoupeFacet, Contract, ZERO_ADDRESS
+from eth_utils import to_checksum_address
+
+# IDiamond.FacetCutAction
+ADD = 0
+REPLACE = 1
+# with ZERO_ADDRESS and selectors, or with a facet address and no selector to
+# remove that facet as a whole
+REMOVE = 2
+
+
+class SelectorCollisionError(Exception):
+    """Raised when the same selector is claimed by more than one facet."""
+
+    def __init__(self, collisions):
+        self.collisions = collisions
+        details = ", ".join(
+            f"{selector} -> {', '.join(facets)}"
+            for selector, facets in collisions.items()
+        )
+        super().__init__(f"Selector collision: {details}")
+
+
+def _address(facet):
+    # accept a deployed contract or an address
+    return to_checksum_address(str(getattr(facet, "address", facet)))
+
+
+def _normalize(target):
+    if hasattr(target, "items"):
+        target = target.items()
+    return [
+        (_address(facet), [str(selector).lower() for selector in selectors])
+        for facet, selectors in target
+    ]
+
+
+def read_routing(diamond):
+    """Reads the current routing of `diamond` through its loupe facet.
+
+    Returns:
+        [dict]: selector => facet address.
+    """
+    loupe = Contract.from_abi(
+        "DiamondLoupeFacet", _address(diamond), DiamondLoupeFacet.abi
+    )
+    return {
+        str(selector).lower(): _address(facet)
+        for facet, selectors in loupe.facets()
+        for selector in selectors
+    }
+
+
+def find_collisions(target):
+    """Returns the selectors claimed by more than one facet of `target`.
+
+    Args:
+        target (dict | list): facet => selectors, or a list of (facet, selectors).
+
+    Returns:
+        [dict]: selector => list of facet addresses, for colliding selectors only.
+    """
+    claimed = {}
+    for facet, selectors in _normalize(target):
+        for selector in selectors:
+            claimed.setdefault(selector, [])
+            if facet not in claimed[selector]:
+                claimed[selector].append(facet)
+    return {selector: facets for selector, facets in claimed.items() if len(facets) > 1}
+
+
+def plan_diamond_cut(
+    target,
+    current=None,
+    remove_missing=False,
+    keep=(),
+    diamond=None,
+    remove_facets=False,
+):
+    """Computes the smallest `_diamondCut` that moves a diamond to `target`.
+
+    Selectors are grouped per facet address and per action, so that `LibDiamond`
+    checks each facet once and the cut fits in a single transaction.
+
+    Args:
+        target (dict | list): facet => selectors the diamond should route.
+
+        current (dict, optional): selector => facet, as returned by `read_routing`.
+        Defaults to an empty diamond.
+
+        remove_missing (bool, optional): remove the routed selectors that are not in
+        `target`. Defaults to False.
+
+        keep (Iterable[str], optional): selectors never removed, e.g. `diamondCut`.
+
+        diamond (optional): the diamond, used to detect its immutable functions.
+
+        remove_facets (bool, optional): remove a facet that loses all its selectors
+        with a single whole-facet Remove. Only safe when `current` is the complete
+        routing of the diamond. Defaults to False.
+
+    Returns:
+        [list]: the `_diamondCut` argument, empty when nothing has to change.
+    """
+    collisions = find_collisions(target)
+    if collisions:
+        raise SelectorCollisionError(collisions)
+    current = {str(k).lower(): _address(v) for k, v in (current or {}).items()}
+    diamond = _address(diamond) if diamond else None
+    keep = {str(selector).lower() for selector in keep}
+
+    adds = {}
+    replaces = {}
+    wanted = set()
+    for facet, selectors in _normalize(target):
+        for selector in selectors:
+            wanted.add(selector)
+            routed_to = current.get(selector)
+            if routed_to is None:
+                adds.setdefault(facet, []).append(selector)
+            elif routed_to != facet:
+                if routed_to == diamond:
+                    raise ValueError(f"Cannot replace immutable function {selector}")
+                replaces.setdefault(facet, []).append(selector)
+
+    removes = []
+    if remove_missing:
+        removes = [
+            selector
+            for selector, facet in current.items()
+            if selector not in wanted and selector not in keep and facet != diamond
+        ]
+
+    removed_facets = []
+    if remove_facets and removes:
+        # the selectors each facet still routes once the replaces are done
+        replaced = {
+            selector for selectors in replaces.values() for selector in selectors
+        }
+        left = {}
+        for selector, facet in current.items():
+            if selector not in replaced:
+                left.setdefault(facet, set()).add(selector)
+        # a facet receiving selectors in the same cut keeps them
+        removed_facets = [
+            facet
+            for facet, selectors in left.items()
+            if selectors <= set(removes) and facet not in adds and facet not in replaces
+        ]
+        removes = [s for s in removes if current[s] not in removed_facets]
+
+    cut = [[facet, ADD, selectors] for facet, selectors in adds.items()]
+    cut += [[facet, REPLACE, selectors] for facet, selectors in replaces.items()]
+    cut += [[facet, REMOVE, []] for facet in removed_facets]
+    if removes:
+        cut.append([ZERO_ADDRESS, REMOVE, removes])
+    return cut
+
+
+def plan_diamond_upgrade(diamond, target, remove_missing=False, keep=()):
+    """Reads the routing of `diamond` and plans the cut that moves it to `target`."""
+    return plan_diamond_cut(
+        target,
+        read_routing(diamond),
+        remove_missing=remove_missing,
+        keep=keep,
+        diamond=diamond,
+        remove_facets=True,
+    )
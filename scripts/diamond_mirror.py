@@ -0,0 +1,209 @@
+import json
+from pathlib import Path
+
+import eth_utils
+from eth_abi import decode
+from brownie import web3, ZERO_ADDRESS
+from scripts.diamond_cut_planner import ADD, REPLACE, REMOVE, read_routing
+
+PROJECT_PATH = Path(__file__).resolve().parent.parent
+CHECKPOINT_PATH = PROJECT_PATH.joinpath("build", "diamond_mirrors")
+CHECKPOINT_VERSION = 1
+DIAMOND_CUT_EVENT = "DiamondCut((address,uint8,bytes4[])[],address,bytes)"
+DIAMOND_CUT_TOPIC = eth_utils.to_hex(eth_utils.keccak(text=DIAMOND_CUT_EVENT))
+DIAMOND_CUT_TYPES = ["(address,uint8,bytes4[])[]", "address", "bytes"]
+# many providers refuse eth_getLogs over a wider range of blocks
+BLOCK_RANGE = 10_000
+
+
+def decode_diamond_cut(log):
+    """Decodes the `_diamondCut` argument of a `DiamondCut` log.
+
+    Returns:
+        [list]: [facet address, action, selectors] for each FacetCut.
+    """
+    data = log["data"]
+    if isinstance(data, str):
+        data = eth_utils.to_bytes(hexstr=data)
+    diamond_cut, _, _ = decode(DIAMOND_CUT_TYPES, bytes(data))
+    return [
+        [
+            eth_utils.to_checksum_address(facet),
+            action,
+            [eth_utils.to_hex(selector) for selector in selectors],
+        ]
+        for facet, action, selectors in diamond_cut
+    ]
+
+
+class DiamondMirror:
+    """In-memory copy of the routing of a diamond, rebuilt from its `DiamondCut` logs.
+
+    `sync` applies the logs emitted since the last processed block and saves a
+    checkpoint, so a mirror created again later only scans the new blocks. Lookups
+    are then answered without any RPC call.
+
+    Example:
+
+        mirror = DiamondMirror(diamond, start_block=diamond.tx.block_number)
+        mirror.sync()
+        mirror.facet_address(get_selector("square(uint256)"))
+        plan_diamond_cut(target, mirror.routing)
+    """
+
+    def __init__(self, diamond, start_block=0, checkpoint_path=None, confirmations=0):
+        """
+        Args:
+            diamond (Contract | str): The diamond to mirror.
+
+            start_block (int, optional): First block to scan, e.g. the deployment
+            block of the diamond. Defaults to 0.
+
+            checkpoint_path (str, optional): Where to save the mirror. Defaults to
+            `build/diamond_mirrors/<address>.json`.
+
+            confirmations (int, optional): Blocks to wait before applying a log, so
+            that a reorganization can not leave a removed cut in the mirror.
+        """
+        self.address = eth_utils.to_checksum_address(
+            str(getattr(diamond, "address", diamond))
+        )
+        self._checkpoint_path = Path(
+            checkpoint_path or CHECKPOINT_PATH.joinpath(f"{self.address}.json")
+        )
+        self._confirmations = confirmations
+        # last block applied to the mirror
+        self.block = start_block - 1
+        # selector => facet address
+        self._routing = {}
+        # facet address => {selector: None}, in the order the selectors were added
+        self._facets = {}
+        self._load_checkpoint()
+
+    def _load_checkpoint(self):
+        if not self._checkpoint_path.exists():
+            return
+        try:
+            checkpoint = json.loads(self._checkpoint_path.read_text())
+        except ValueError:
+            return
+        if (
+            checkpoint.get("version") != CHECKPOINT_VERSION
+            or checkpoint["diamond"] != self.address
+            or checkpoint["chainId"] != web3.eth.chain_id
+            # the chain was reset since, e.g. a new local network
+            or checkpoint["block"] > web3.eth.block_number
+        ):
+            return
+        self.block = checkpoint["block"]
+        for selector, facet in checkpoint["routing"].items():
+            self._route(selector, facet)
+
+    def save(self):
+        """Writes the checkpoint of the mirror."""
+        self._checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        checkpoint = {
+            "version": CHECKPOINT_VERSION,
+            "diamond": self.address,
+            "chainId": web3.eth.chain_id,
+            "block": self.block,
+            "routing": self._routing,
+        }
+        self._checkpoint_path.write_text(json.dumps(checkpoint, indent=1))
+
+    def _route(self, selector, facet):
+        self._unroute(selector)
+        self._routing[selector] = facet
+        self._facets.setdefault(facet, {})[selector] = None
+
+    def _unroute(self, selector):
+        facet = self._routing.pop(selector, None)
+        if facet is None:
+            return
+        del self._facets[facet][selector]
+        if not self._facets[facet]:
+            del self._facets[facet]
+
+    def apply_cut(self, diamond_cut):
+        """Applies a `_diamondCut` the way `LibDiamond.diamondCut` does."""
+        for facet, action, selectors in diamond_cut:
+            facet = eth_utils.to_checksum_address(str(facet))
+            selectors = [str(selector).lower() for selector in selectors]
+            if action in (ADD, REPLACE):
+                for selector in selectors:
+                    self._route(selector, facet)
+            elif action == REMOVE and not selectors:
+                # whole facet removal
+                for selector in list(self._facets.get(facet, {})):
+                    self._unroute(selector)
+            elif action == REMOVE:
+                for selector in selectors:
+                    self._unroute(selector)
+            else:
+                raise ValueError(f"Unknown FacetCutAction {action}")
+
+    def sync(self, to_block=None):
+        """Applies the `DiamondCut` logs emitted since the last synced block.
+
+        Args:
+            to_block (int, optional): Last block to apply. Defaults to the latest
+            block minus `confirmations`.
+
+        Returns:
+            [int]: The number of `DiamondCut` logs applied.
+        """
+        if to_block is None:
+            to_block = web3.eth.block_number - self._confirmations
+        applied = 0
+        while self.block < to_block:
+            from_block = self.block + 1
+            end_block = min(from_block + BLOCK_RANGE - 1, to_block)
+            logs = web3.eth.get_logs(
+                {
+                    "address": self.address,
+                    "topics": [DIAMOND_CUT_TOPIC],
+                    "fromBlock": from_block,
+                    "toBlock": end_block,
+                }
+            )
+            for log in sorted(logs, key=lambda i: (i["blockNumber"], i["logIndex"])):
+                self.apply_cut(decode_diamond_cut(log))
+                applied += 1
+            self.block = end_block
+        self.save()
+        return applied
+
+    @property
+    def routing(self):
+        """[dict]: selector => facet address, as returned by `read_routing`."""
+        return dict(self._routing)
+
+    def facet_address(self, selector):
+        """Returns the facet `selector` is routed to, ZERO_ADDRESS if none."""
+        return self._routing.get(str(selector).lower(), ZERO_ADDRESS)
+
+    def facet_selectors(self, facet):
+        """Returns the selectors routed to `facet`."""
+        facet = eth_utils.to_checksum_address(str(getattr(facet, "address", facet)))
+        return list(self._facets.get(facet, {}))
+
+    def facet_addresses(self):
+        """Returns the facets with at least one selector."""
+        return list(self._facets)
+
+    def verify(self):
+        """Compares the mirror with the routing returned by the loupe of the diamond.
+
+        Returns:
+            [dict]: selector => (mirror facet, loupe facet) for each difference,
+            empty when the mirror is consistent.
+        """
+        on_chain = read_routing(self.address)
+        return {
+            selector: (
+                self._routing.get(selector, ZERO_ADDRESS),
+                on_chain.get(selector, ZERO_ADDRESS),
+            )
+            for selector in set(self._routing) | set(on_chain)
+            if self._routing.get(selector) != on_chain.get(selector)
+        }
@@ -0,0 +1,307 @@
+import ast
+import json
+import threading
+from collections.abc import Mapping
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import eth_abi
+from eth_abi.exceptions import DecodingError
+from brownie import network, web3
+from brownie._config import CONFIG
+from web3 import Web3
+from web3.exceptions import ContractLogicError
+from web3.middleware import combine_middleware
+from web3.providers import JSONBaseProvider
+
+NETWORK_ID = "eth-tester"
+HOST = "127.0.0.1"
+PORT = 8555
+NAMED_BLOCKS = ("latest", "earliest", "pending", "safe", "finalized")
+# of `Error(string)`
+ERROR_SELECTOR = bytes.fromhex("08c379a0")
+
+_server = None
+
+
+def to_json_rpc(value):
+    """Encodes a result of eth-tester as JSON-RPC: ints and bytes as hex strings."""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, int):
+        return hex(value)
+    if isinstance(value, bytes):
+        return "0x" + bytes(value).hex()
+    if isinstance(value, Mapping):
+        return {key: to_json_rpc(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json_rpc(item) for item in value]
+    return value
+
+
+def _revert_error(error):
+    # eth-tester raises the revert data as bytes, their repr, or in an exception,
+    # and sometimes the reason of an `Error(string)` already decoded
+    data = error
+    while isinstance(data, Exception):
+        if isinstance(data, ContractLogicError):
+            data = data.data
+        else:
+            data = data.args[0] if data.args else ""
+    if isinstance(data, str) and data[:2] in ("b'", 'b"'):
+        data = ast.literal_eval(data)
+    if isinstance(data, str) and not data.startswith("0x"):
+        data = ERROR_SELECTOR + eth_abi.encode(["string"], [data])
+    if isinstance(data, str):
+        data = bytes.fromhex(data[2:])
+    message = "execution reverted"
+    if data[:4] == ERROR_SELECTOR:
+        # like geth, with the reason in the message too
+        try:
+            message += ": " + eth_abi.decode(["string"], data[4:])[0]
+        except DecodingError:
+            pass
+    return {"code": 3, "message": message, "data": "0x" + data.hex()}
+
+
+def _block_number(block):
+    if isinstance(block, str) and block not in NAMED_BLOCKS:
+        return int(block, 16)
+    return block
+
+
+class EVMBackend:
+    """A py-evm chain in this process, through eth-tester.
+
+    Blocks are mined as soon as a transaction is sent. The JSON-RPC methods are
+    the ones web3 maps to eth-tester, plus what brownie expects from ganache:
+    `evm_snapshot`, `evm_revert`, `evm_mine` and `evm_increaseTime`, and
+    reverted transactions mined and reported with their revert reason.
+    `debug_traceTransaction` is not available, so neither are the traces of
+    brownie nor the scripts built on them.
+    """
+
+    def __init__(self):
+        # do not import eth-tester until needed, it is an optional dependency
+        from eth_tester import EthereumTester, PyEVMBackend
+        from eth_tester.exceptions import TransactionFailed
+        from web3.providers.eth_tester import EthereumTesterProvider
+        from web3.providers.eth_tester.defaults import API_ENDPOINTS
+
+        self.tester = EthereumTester(PyEVMBackend())
+        self._endpoints = API_ENDPOINTS
+        self._failures = (TransactionFailed, ContractLogicError)
+        # the formatting middleware of the provider, around the eth-tester calls
+        provider = EthereumTesterProvider(self.tester)
+        w3 = Web3(provider, middleware=[])
+        self._request = combine_middleware(provider._middleware, w3, self._call)
+        self._lock = threading.Lock()
+        self._methods = {
+            "eth_sendTransaction": self._send_transaction,
+            "eth_getStorageAt": self._get_storage_at,
+            "evm_mine": self._mine,
+            "evm_increaseTime": self._increase_time,
+        }
+
+    @property
+    def state(self):
+        """The py-evm state of the chain, e.g. `state.get_storage(address, slot)`."""
+        return self.tester.backend.chain.get_vm().state
+
+    def handle(self, payload):
+        """Answers a JSON-RPC request, or a batch of requests.
+
+        Returns:
+            [dict | list]: The response, or one response per request of the batch.
+        """
+        if isinstance(payload, list):
+            return [self._respond(request) for request in payload]
+        return self._respond(payload)
+
+    def _respond(self, request):
+        method = request["method"]
+        params = request.get("params") or []
+        response = {"jsonrpc": "2.0", "id": request.get("id")}
+        try:
+            with self._lock:
+                result = self._methods.get(method, self._request)(method, params)
+        except Exception as e:
+            response["error"] = {"code": -32000, "message": str(e)}
+        else:
+            if "error" in result:
+                response["error"] = result["error"]
+            else:
+                response["result"] = to_json_rpc(result["result"])
+        return response
+
+    def _call(self, method, params):
+        # like the provider of web3, but keeping the revert data of the errors
+        namespace, _, endpoint = method.partition("_")
+        try:
+            delegator = self._endpoints[namespace][endpoint]
+        except KeyError:
+            return {"error": {"code": -32601, "message": f"Unknown method {method}"}}
+        try:
+            return {"result": delegator(self.tester, params)}
+        except NotImplementedError:
+            # how brownie finds out that there are no traces
+            return {"error": {"code": -32601, "message": f"{method} not implemented"}}
+        except self._failures as e:
+            return {"error": _revert_error(e)}
+
+    def _revert_data(self, tx, block):
+        # replays a reverted transaction to read its revert data
+        call = {key: tx[key] for key in ("from", "to", "value", "data") if key in tx}
+        response = self._request("eth_call", [call, hex(block)])
+        return response.get("error", {}).get("data")
+
+    def _send_transaction(self, method, params):
+        tx = params[0]
+        if "maxFeePerGas" not in tx and not int(str(tx.get("gasPrice", 0)), 0):
+            # brownie sends the transactions of development networks with a gas
+            # price of 0, below the base fee of py-evm
+            block = self.tester.get_block_by_number("pending")
+            tx = {**tx, "gasPrice": hex(block["base_fee_per_gas"])}
+        response = self._request(method, [tx, *params[1:]])
+        if "error" in response:
+            return response
+        txid = response["result"]
+        receipt = self.tester.get_transaction_receipt(txid)
+        if receipt["status"]:
+            return response
+        # like ganache: mined, then reported with its hash and revert reason
+        return {
+            "error": {
+                "code": -32000,
+                "message": "VM Exception while processing transaction: revert",
+                "data": {
+                    txid: {
+                        "error": "revert",
+                        "reason": self._revert_data(tx, receipt["block_number"] - 1),
+                    }
+                },
+            }
+        }
+
+    def _get_storage_at(self, method, params):
+        address, slot, *block = params
+        return self._request(method, [address, slot, *map(_block_number, block)])
+
+    def _mine(self, method, params):
+        if params:
+            # a block at the given timestamp
+            self.tester.time_travel(int(str(params[0]), 0))
+        else:
+            self.tester.mine_blocks(1)
+        return {"result": 0}
+
+    def _increase_time(self, method, params):
+        seconds = int(str(params[0]), 0)
+        block = self.tester.get_block_by_number("latest")
+        self.tester.time_travel(block["timestamp"] + seconds)
+        return {"result": seconds}
+
+
+class DirectProvider(JSONBaseProvider):
+    """A web3 provider answering from an EVMBackend of this process, without HTTP.
+
+    The requests and responses are still encoded as JSON, as over HTTP, so web3
+    and brownie see the same values. Only the round trip through the server
+    thread is saved, a part of every call.
+    """
+
+    def __init__(self, backend):
+        super().__init__()
+        self.backend = backend
+
+    def _handle(self, request):
+        response = self.backend.handle(json.loads(request))
+        return self.decode_rpc_response(json.dumps(response).encode())
+
+    def make_request(self, method, params):
+        return self._handle(self.encode_rpc_request(method, params))
+
+    def make_batch_request(self, requests):
+        return self._handle(self.encode_batch_rpc_request(requests))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # the headers and the body are written apart, do not wait for an ACK between
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        body = json.dumps(self.server.backend.handle(payload)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # one line per request would bury the output of the tests
+        pass
+
+
+def start(port=PORT, worker=0):
+    """Starts an EVMBackend and its JSON-RPC server in a thread of this process.
+
+    Also registers the `eth-tester` development network at the server. Brownie
+    attaches to it when connecting, as to a node that is already running, so
+    `start` must be called before. Only one backend is started per process.
+
+    Args:
+        port (int): The port of the network.
+        worker (int): The number of the pytest-xdist worker. Brownie moves the
+        network of a worker to the port plus that number, where the server
+        listens, so that the workers run in parallel. 0 outside of xdist.
+
+    Returns:
+        [EVMBackend]: The backend.
+    """
+    global _server
+    if _server is None:
+        _server = ThreadingHTTPServer((HOST, port + worker), _Handler)
+        _server.backend = EVMBackend()
+        threading.Thread(target=_server.serve_forever, daemon=True).start()
+        CONFIG.networks[NETWORK_ID] = {
+            "id": NETWORK_ID,
+            "name": "In-process EVM (eth-tester)",
+            "host": f"http://{HOST}",
+            # never run, brownie finds the server already listening
+            "cmd": NETWORK_ID,
+            "cmd_settings": {"port": port},
+        }
+    return _server.backend
+
+
+def use_direct_provider():
+    """Sends the requests of brownie to the backend without HTTP, see DirectProvider.
+
+    Brownie still attaches to the `eth-tester` network through the server, and
+    only then can the provider be swapped.
+
+    Returns:
+        [bool]: Whether brownie is connected to the backend of this process.
+    """
+    if _server is None or network.show_active() != NETWORK_ID:
+        return False
+    if not isinstance(web3.provider, DirectProvider):
+        web3.provider = DirectProvider(_server.backend)
+    return True
+
+
+def connect(port=PORT, direct=True):
+    """Starts the backend, see `start`, and connects brownie to it.
+
+    Args:
+        direct (bool): Send the requests without HTTP, see `use_direct_provider`.
+
+    Returns:
+        [EVMBackend]: The backend.
+    """
+    backend = start(port)
+    network.connect(NETWORK_ID)
+    if direct:
+        use_direct_provider()
+    return backend
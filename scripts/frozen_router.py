@@ -0,0 +1,233 @@
+import re
+from pathlib import Path
+
+from brownie import (
+    FacetSquareV1,
+    DiamondLoupeFacet,
+    compile_source,
+)
+from scripts.helpful_scripts import get_account
+from scripts.selector_registry import get_selectors
+
+DIAMOND_PATH = Path(__file__).resolve().parent.parent.joinpath("contracts", "Diamond")
+ROUTER_NAME = "FrozenDiamond"
+# selectors compared one by one at the bottom of the binary search
+LEAF_SIZE = 4
+IMPORT_PATTERN = re.compile(
+    r'^import\s+(?:\{[^}]*\}\s+from\s+)?"([^"]+)";[ \t]*$', re.M
+)
+HEADER_PATTERN = re.compile(
+    r"^(// SPDX-License-Identifier:.*|pragma solidity.*;)$", re.M
+)
+
+ROUTER_TEMPLATE = """// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+// Generated by scripts/frozen_router.py, do not edit.
+
+import {{LibDiamond}} from "./lib/LibDiamond.sol";
+import {{IDiamondCut}} from "./interfaces/IDiamondCut.sol";
+import {{DiamondArgs, FunctionNotFound}} from "./Diamond.sol";
+
+error CannotCutFrozenFunction(bytes4 _selector);
+
+/**
+ * @dev A {{Diamond}} with {selector_count} selectors routed to {facet_count} facets by its bytecode.
+ *
+ * The frozen selectors are found with a binary search compiled into the fallback, and their facets are immutables, so
+ * calling them reads no storage. Any other selector is routed by the diamond storage, as in {{Diamond}}.
+ *
+ * WARNING: the frozen routing can never change, a frozen selector in the constructor cut or in a `diamondCut` reverts.
+ * The loupe only reports the selectors routed by the storage.
+ */
+contract {name} {{
+{immutables}
+
+    constructor(
+        IDiamondCut.FacetCut[] memory _diamondCut,
+        DiamondArgs memory _args,
+        address[{facet_count}] memory _frozenFacets
+    ) payable {{
+        _checkCut(_diamondCut);
+        LibDiamond.setContractOwner(_args.owner);
+        LibDiamond.diamondCut(_diamondCut, _args.init, _args.initCalldata);
+{assignments}
+    }}
+
+    fallback() external payable {{
+        if (msg.sig == IDiamondCut.diamondCut.selector) {{
+            (IDiamondCut.FacetCut[] memory cut, , ) = abi.decode(
+                msg.data[4:],
+                (IDiamondCut.FacetCut[], address, bytes)
+            );
+            _checkCut(cut);
+        }}
+        address facet = _frozenFacet(uint32(msg.sig));
+        if (facet == address(0)) {{
+            facet = LibDiamond
+                .diamondStorage()
+                .facetAddressAndSelectorPosition[msg.sig]
+                .facetAddress;
+            if (facet == address(0)) {{
+                revert FunctionNotFound(msg.sig);
+            }}
+        }}
+        assembly {{
+            calldatacopy(0, 0, calldatasize())
+            let result := delegatecall(gas(), facet, 0, calldatasize(), 0, 0)
+            returndatacopy(0, 0, returndatasize())
+            switch result
+            case 0 {{
+                revert(0, returndatasize())
+            }}
+            default {{
+                return(0, returndatasize())
+            }}
+        }}
+    }}
+
+    receive() external payable {{}}
+
+    // a frozen selector added to the storage would be reported by the loupe but never used
+    function _checkCut(IDiamondCut.FacetCut[] memory _diamondCut) private pure {{
+        for (uint256 i; i < _diamondCut.length; i++) {{
+            bytes4[] memory selectors = _diamondCut[i].functionSelectors;
+            for (uint256 j; j < selectors.length; j++) {{
+                if (_isFrozen(uint32(selectors[j]))) {{
+                    revert CannotCutFrozenFunction(selectors[j]);
+                }}
+            }}
+        }}
+    }}
+
+    // binary search over the frozen selectors
+    function _frozenFacet(uint32 selector) private view returns (address) {{
+{search}
+    }}
+
+    // the same search without the immutables, that the constructor can not read
+    function _isFrozen(uint32 selector) private pure returns (bool) {{
+{frozen_search}
+    }}
+}}
+"""
+
+
+def _search(routes, depth, found="_facet{}", missing="address(0)"):
+    # routes: sorted (selector, facet index), every branch ends with a return
+    indent = "    " * depth
+    if len(routes) <= LEAF_SIZE:
+        lines = [
+            f"{indent}if (selector == 0x{selector:08x}) return {found.format(facet)};"
+            for selector, facet in routes
+        ]
+        return lines + [f"{indent}return {missing};"]
+    middle = len(routes) // 2
+    return (
+        [f"{indent}if (selector < 0x{routes[middle][0]:08x}) {{"]
+        + _search(routes[:middle], depth + 1, found, missing)
+        + [f"{indent}}}"]
+        + _search(routes[middle:], depth, found, missing)
+    )
+
+
+def generate_router(facets, name=ROUTER_NAME):
+    """Generates the source of a diamond with a frozen routing.
+
+    Args:
+        facets (list): The selectors of each frozen facet. The facet addresses are
+        given to the constructor, in the same order, e.g.
+        `[get_selectors(FacetSquareV1), get_selectors(DiamondLoupeFacet)]`.
+
+        name (str, optional): The contract name. Defaults to ROUTER_NAME.
+
+    Returns:
+        [str]: The Solidity source, importing the diamond from contracts/Diamond.
+    """
+    routes = {}
+    for facet, selectors in enumerate(facets):
+        for selector in selectors:
+            selector = int(selector, 16)
+            if selector in routes:
+                raise ValueError(f"Selector 0x{selector:08x} is frozen twice")
+            routes[selector] = facet
+    if not routes:
+        raise ValueError("There is no selector to freeze")
+
+    return ROUTER_TEMPLATE.format(
+        name=name,
+        selector_count=len(routes),
+        facet_count=len(facets),
+        immutables="\n".join(
+            f"    address private immutable _facet{i};" for i in range(len(facets))
+        ),
+        assignments="\n".join(
+            f"        _facet{i} = _frozenFacets[{i}];" for i in range(len(facets))
+        ),
+        search="\n".join(_search(sorted(routes.items()), 2)),
+        frozen_search="\n".join(_search(sorted(routes.items()), 2, "true", "false")),
+    )
+
+
+def flatten_source(source, base_path=DIAMOND_PATH, _seen=None):
+    """Inlines the local imports of `source`, relative to `base_path`."""
+    seen = set() if _seen is None else _seen
+
+    def inline(match):
+        path = Path(base_path).joinpath(match.group(1)).resolve()
+        if path in seen:
+            return ""
+        seen.add(path)
+        return flatten_source(
+            HEADER_PATTERN.sub("", path.read_text()), path.parent, seen
+        )
+
+    return IMPORT_PATTERN.sub(inline, source)
+
+
+def compile_router(facets, name=ROUTER_NAME):
+    """Compiles a frozen router without adding it to the project.
+
+    Returns:
+        [brownie.network.contract.ContractContainer]: The router, ready to deploy.
+    """
+    return compile_source(flatten_source(generate_router(facets, name)))[name]
+
+
+def write_router(facets, name=ROUTER_NAME):
+    # the router is compiled with the project from then on
+    path = DIAMOND_PATH.joinpath(f"{name}.sol")
+    path.write_text(generate_router(facets, name))
+    return path
+
+
+def deploy_router(container, frozen_facets, _args, _diamondCut=()):
+    """Deploys `container` with the facets of its frozen selectors.
+
+    Args:
+        container ([brownie.network.contract.ContractContainer]): The router.
+
+        frozen_facets (list): The facet of each group of selectors given to
+        `generate_router`, in the same order.
+
+        _args (list): The DiamondArgs, [owner, init, initCalldata].
+
+        _diamondCut (list, optional): The routing kept in storage, without the
+        frozen selectors, else the deployment reverts.
+    """
+    account = get_account()
+    router = container.deploy(
+        list(_diamondCut),
+        _args,
+        [facet.address for facet in frozen_facets],
+        {"from": account, "gas_limit": 10_000_000},
+    )
+    return router
+
+
+def main():
+    # the cut facet is left in storage, so that the other selectors can still change
+    path = write_router(
+        [get_selectors(FacetSquareV1), get_selectors(DiamondLoupeFacet)]
+    )
+    print(f"Router written to {path}, run `brownie compile` to use it")
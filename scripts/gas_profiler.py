@@ -0,0 +1,153 @@
+from pathlib import Path
+
+from brownie import (
+    FacetSquareV1,
+    LogicContractV1,
+    LogicContractUUPSV1,
+    LogicContractBeaconV1,
+    Contract,
+    chain,
+)
+from scripts.helpful_scripts import get_account
+from scripts import (
+    deploy_transparent_upgradeable_proxy,
+    deploy_uups,
+    deploy_beacon,
+    deploy_diamond,
+)
+
+PROJECT_PATH = Path(__file__).resolve().parent.parent
+PROFILE_PATH = PROJECT_PATH.joinpath("build", "profiles")
+CALL_OPCODES = ("CALL", "CALLCODE", "DELEGATECALL", "STATICCALL", "CREATE", "CREATE2")
+# gas not spent by an opcode: intrinsic cost of the transaction minus the refunds
+INTRINSIC = "<intrinsic>"
+
+
+def _step_costs(trace):
+    """Returns the gas used by each step of `trace`, excluding the gas of subcalls.
+
+    The gas of a step is the gas left before the next step of the same frame, minus
+    what the frames it opened used. It is exact for calls, whose `gasCost` reported
+    by the node is the gas made available to the callee, not the gas it used.
+    """
+    costs = [0] * len(trace)
+    # (index of the call, gas used by the frames it opened)
+    calls = []
+    for i, step in enumerate(trace):
+        following = trace[i + 1] if i + 1 < len(trace) else None
+        if following is None or following["depth"] < step["depth"]:
+            # the last step of a frame
+            costs[i] = step["gasCost"]
+        elif following["depth"] > step["depth"]:
+            calls.append([i, 0])
+            continue
+        else:
+            costs[i] = step["gas"] - following["gas"]
+        if calls:
+            calls[-1][1] += costs[i]
+        while (
+            calls and following and following["depth"] == trace[calls[-1][0]]["depth"]
+        ):
+            index, subcalls_gas = calls.pop()
+            costs[index] = trace[index]["gas"] - following["gas"] - subcalls_gas
+            if calls:
+                calls[-1][1] += trace[index]["gas"] - following["gas"]
+    return costs
+
+
+def profile_transaction(tx):
+    """Assigns the gas of a transaction to the call frames and functions it went through.
+
+    The transaction is replayed by the local node with `debug_traceTransaction`,
+    through `tx.trace`, which maps every step to the contract and the source
+    function being run, e.g. `Proxy._delegate`.
+
+    Args:
+        tx ([brownie.network.transaction.TransactionReceipt] or str): The
+        transaction or its hash.
+
+    Returns:
+        [dict]: folded stack => gas used by its last function itself, e.g.
+        `{"TransparentUpgradeableProxy._fallback;Proxy._delegate;<DELEGATECALL>;
+        LogicContractV1.store": 22100, ...}`. Call opcodes are frames of their own.
+    """
+    if isinstance(tx, str):
+        tx = chain.get_transaction(tx)
+    trace = tx.trace
+    costs = _step_costs(trace)
+    stacks = {}
+    # the stack of the caller of each depth, and the internal functions of each depth
+    callers = {0: []}
+    functions = {}
+    for i, step in enumerate(trace):
+        depth = step["depth"]
+        if i == 0 or depth > trace[i - 1]["depth"]:
+            functions[depth] = []
+        path = functions[depth][: step["jumpDepth"]] + [step["fn"]]
+        functions[depth] = path
+        stack = callers[depth] + path
+        if step["op"] in CALL_OPCODES:
+            stack = stack + [f"<{step['op']}>"]
+            callers[depth + 1] = stack
+        key = ";".join(stack)
+        stacks[key] = stacks.get(key, 0) + costs[i]
+    stacks[INTRINSIC] = tx.gas_used - sum(costs)
+    return stacks
+
+
+def summarize(stacks):
+    """Returns the self and inclusive gas of every function in `stacks`.
+
+    Returns:
+        [list]: (function, self gas, inclusive gas), the most expensive first.
+    """
+    self_gas = {}
+    inclusive_gas = {}
+    for stack, gas in stacks.items():
+        frames = stack.split(";")
+        self_gas[frames[-1]] = self_gas.get(frames[-1], 0) + gas
+        for frame in set(frames):
+            inclusive_gas[frame] = inclusive_gas.get(frame, 0) + gas
+    return sorted(
+        ((fn, self_gas.get(fn, 0), gas) for fn, gas in inclusive_gas.items()),
+        key=lambda row: (-row[1], row[0]),
+    )
+
+
+def write_folded(stacks, path):
+    # one "frame;frame;frame gas" line per stack, the input of flamegraph.pl or speedscope
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        "".join(f"{stack} {gas}\n" for stack, gas in sorted(stacks.items()) if gas)
+    )
+    return path
+
+
+def print_summary(stacks):
+    print(f"{'function':<60}{'self':>10}{'inclusive':>12}")
+    for fn, self_gas, inclusive_gas in summarize(stacks):
+        print(f"{fn:<60}{self_gas:>10}{inclusive_gas:>12}")
+    print(f"{'total':<60}{sum(stacks.values()):>10}")
+
+
+def main():
+    account = get_account()
+    _, _, transparent = deploy_transparent_upgradeable_proxy.deploy_proxy_V1()
+    _, uups = deploy_uups.deploy_proxy_V1()
+    _, _, beacon = deploy_beacon.deploy_beacon_proxy_V1()
+    _, _, _, diamond = deploy_diamond.deploy_diamond_V1()
+    for name, proxy, logic in [
+        ("transparent", transparent, LogicContractV1),
+        ("uups", uups, LogicContractUUPSV1),
+        ("beacon", beacon, LogicContractBeaconV1),
+        ("diamond", diamond, FacetSquareV1),
+    ]:
+        proxy = Contract.from_abi(logic._name, proxy.address, logic.abi)
+        # the first store() writes a zero slot, profile a second one
+        proxy.store(1, {"from": account})
+        stacks = profile_transaction(proxy.store(2, {"from": account}))
+        print(f"\n{name}: store(uint256)")
+        print_summary(stacks)
+        path = write_folded(stacks, PROFILE_PATH.joinpath(f"{name}.folded"))
+        print(f"Folded stacks written to {path}")
@@ -1,12 +1,22 @@
-from brownie import network, accounts, config
+import os
+
+from brownie import network, accounts, config, web3
 import eth_utils
+from scripts import evm_backend
 
-NON_FORKED_LOCAL_BLOCKCHAIN_ENVIRONMENTS = ["hardhat", "development", "ganache"]
+NON_FORKED_LOCAL_BLOCKCHAIN_ENVIRONMENTS = [
+    "hardhat",
+    "development",
+    "ganache",
+    evm_backend.NETWORK_ID,
+]
 LOCAL_BLOCKCHAIN_ENVIRONMENTS = NON_FORKED_LOCAL_BLOCKCHAIN_ENVIRONMENTS + [
     "mainnet-fork",
     "binance-fork",
     "matic-fork",
 ]
+# where the scripts and tests run, see `start_backend`
+EVM_BACKEND = os.environ.get("EVM_BACKEND", "node")
 
 
 def get_account(number=None):
@@ -20,6 +30,32 @@ def get_account(number=None):
     return None
 
 
+def start_backend(backend=EVM_BACKEND, worker=0):
+    """Starts the execution backend, before brownie connects to the network.
+
+    Args:
+        backend (str, optional): "node" to let brownie launch or attach to the
+        node of the network, e.g. ganache. "eth-tester" to run an in-process EVM
+        and register the `eth-tester` network, see `evm_backend.start`.
+        Defaults to the `EVM_BACKEND` environment variable, else "node".
+        worker (int, optional): The number of the pytest-xdist worker running the
+        tests. Defaults to 0.
+
+    Returns:
+        [str]: The network to connect to, None to keep the one given to brownie.
+
+    Example:
+
+        EVM_BACKEND=eth-tester brownie test --network eth-tester
+    """
+    if backend == "node":
+        return None
+    if backend == evm_backend.NETWORK_ID:
+        evm_backend.start(worker=worker)
+        return evm_backend.NETWORK_ID
+    raise ValueError(f"Unknown backend {backend}")
+
+
 # encode into bytes
 def encode_function_data(initializer=None, *args):
     """Encodes the function call so we can work with an initializer.
@@ -39,3 +75,28 @@ def encode_function_data(initializer=None, *args):
         return eth_utils.to_bytes(hexstr="0x")
     else:
         return initializer.encode_input(*args)
+
+
+def get_batch_size(estimate_gas, max_size=None, block_gas_share=0.9):
+    """Returns how many items fit in one transaction under the block gas limit.
+
+    Args:
+        estimate_gas (Callable[[int], int]):
+        Returns the gas used by a transaction handling `n` items.
+
+        max_size (int, optional):
+        Upper bound for the batch size. Defaults to None.
+
+        block_gas_share (float, optional):
+        Share of the block gas limit a batch may use. Defaults to 0.9.
+
+    Returns:
+        [int]: The batch size, at least 1.
+    """
+    gas_limit = web3.eth.get_block("latest")["gasLimit"] * block_gas_share
+    one = estimate_gas(1)
+    per_item = max(estimate_gas(2) - one, 1)
+    size = max(int((gas_limit - one) // per_item) + 1, 1)
+    if max_size:
+        size = min(size, max_size)
+    return size
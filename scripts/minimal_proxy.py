@@ -0,0 +1,97 @@
+import eth_utils
+from brownie import Contract
+from scripts.helpful_scripts import get_account
+from scripts.proxy_slots import IMPLEMENTATION_SLOT
+
+UPGRADED_TOPIC = eth_utils.keccak(text="Upgraded(address)")
+
+# delegates every call to the implementation in the ERC1967 slot, 61 bytes
+RUNTIME_CODE = b"".join(
+    [
+        # calldatacopy(0, 0, calldatasize())
+        bytes.fromhex("363d3d37"),
+        # delegatecall(gas(), sload(IMPLEMENTATION_SLOT), 0, calldatasize(), 0, 0)
+        bytes.fromhex("3d3d363d7f"),
+        eth_utils.to_bytes(hexstr=IMPLEMENTATION_SLOT),
+        bytes.fromhex("545af4"),
+        # returndatacopy(0, 0, returndatasize())
+        bytes.fromhex("3d6000803e"),
+        # revert(0, returndatasize()) if the call failed, else return(...)
+        bytes.fromhex("603857"),
+        bytes.fromhex("3d6000fd"),
+        bytes.fromhex("5b3d6000f3"),
+    ]
+)
+
+
+def _constructor(implementation, data_length, code_length):
+    # `code_length` is the length of the constructor itself, where the runtime
+    # code starts, followed by the initializer calldata
+    code = b"\x73" + implementation + b"\x80\x7f"
+    # sstore(IMPLEMENTATION_SLOT, implementation)
+    code += eth_utils.to_bytes(hexstr=IMPLEMENTATION_SLOT) + b"\x55"
+    # log2(0, 0, UPGRADED_TOPIC, implementation)
+    code += b"\x80\x7f" + UPGRADED_TOPIC + bytes.fromhex("3d3da2")
+    if data_length:
+        data_offset = code_length + len(RUNTIME_CODE)
+        # codecopy(0, data_offset, data_length)
+        code += b"\x61" + data_length.to_bytes(2, "big") + b"\x80"
+        code += b"\x61" + data_offset.to_bytes(2, "big") + bytes.fromhex("3d39")
+        # delegatecall(gas(), implementation, 0, data_length, 0, 0)
+        code += bytes.fromhex("3d3d823d855af4")
+        # if it failed revert(0, returndatasize()) with the error of the initializer
+        code += b"\x61" + (len(code) + 13).to_bytes(2, "big") + b"\x57"
+        code += bytes.fromhex("3d6000803e3d6000fd5b")
+    # return(0, codecopy(0, code_length, len(RUNTIME_CODE)))
+    code += b"\x61" + len(RUNTIME_CODE).to_bytes(2, "big") + b"\x80"
+    code += b"\x61" + code_length.to_bytes(2, "big") + bytes.fromhex("3d393df3")
+    return code
+
+
+def get_init_code(implementation, data=b""):
+    """Returns the creation code of a minimal ERC1967 proxy to `implementation`.
+
+    Like the constructor of ERC1967Proxy, the init code stores the implementation
+    in the ERC1967 slot, emits `Upgraded(implementation)` and delegatecalls `data`
+    to it when not empty, reverting with its error if the call fails. The proxy
+    has no upgrade logic of its own: it can only be upgraded by a UUPS
+    implementation.
+
+    Args:
+        implementation (Contract | str): The implementation.
+
+        data (bytes | str, optional): The initializer call, see
+        `encode_function_data`. Defaults to no call.
+
+    Returns:
+        [bytes]: The constructor, then the runtime code and `data`.
+    """
+    implementation = eth_utils.to_bytes(
+        hexstr=str(getattr(implementation, "address", implementation))
+    )
+    if isinstance(data, str):
+        data = eth_utils.to_bytes(hexstr=data)
+    data = bytes(data)
+    # the offsets do not change the length of the constructor
+    length = len(_constructor(implementation, len(data), 0))
+    code = _constructor(implementation, len(data), length)
+    return code + RUNTIME_CODE + data
+
+
+def deploy_minimal_proxy(implementation, data=b"", abi=None):
+    """Deploys a minimal ERC1967 proxy to `implementation`, see `get_init_code`.
+
+    Args:
+        abi ([brownie.network.contract.ContractContainer], optional): The ABI of
+        the returned proxy. Defaults to the one of `implementation`.
+
+    Returns:
+        [brownie.network.contract.Contract]: The proxy, its `tx` is the
+        deployment.
+    """
+    account = get_account()
+    tx = account.transfer(data=get_init_code(implementation, data), gas_limit=1_000_000)
+    abi = abi or implementation
+    proxy = Contract.from_abi(abi._name, tx.contract_address, abi.abi)
+    proxy.tx = tx
+    return proxy
@@ -0,0 +1,117 @@
+import eth_utils
+from eth_abi import encode, decode
+from eth_abi.exceptions import DecodingError
+from brownie import Multicall, config, network, web3
+from brownie.convert.normalize import format_input, format_output
+from scripts.helpful_scripts import get_account, LOCAL_BLOCKCHAIN_ENVIRONMENTS
+from scripts.selector_registry import abi_type, abi_signature, to_selector
+
+# calls per eth_call, small enough to stay under the eth_call gas cap of most nodes
+BATCH_SIZE = 500
+# bytes4(keccak256("Error(string)"))
+ERROR_SELECTOR = "0x08c379a0"
+
+
+def deploy_multicall():
+    account = get_account()
+    multicall = Multicall.deploy(
+        {"from": account},
+    )
+    return multicall
+
+
+def get_multicall():
+    """Returns the Multicall of the active network.
+
+    The address is read from `networks.<network>.multicall` in brownie-config.yaml,
+    otherwise the last deployed Multicall is used. One is deployed on local networks.
+    """
+    address = config["networks"].get(network.show_active(), {}).get("multicall")
+    if address:
+        return Multicall.at(address)
+    if len(Multicall) > 0:
+        return Multicall[-1]
+    if network.show_active() in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        return deploy_multicall()
+    raise ValueError(f"No Multicall address configured for {network.show_active()}")
+
+
+class _Function:
+    """Encodes the calls to an ABI function and decodes their results like brownie."""
+
+    def __init__(self, abi):
+        self.abi = abi
+        self.selector = eth_utils.to_bytes(hexstr=to_selector(abi_signature(abi)))
+        self.input_types = [abi_type(i) for i in abi["inputs"]]
+        self.output_types = [abi_type(i) for i in abi["outputs"]]
+
+    def encode(self, args):
+        return self.selector + encode(self.input_types, format_input(self.abi, args))
+
+    def decode(self, data):
+        values = format_output(self.abi, decode(self.output_types, bytes(data)))
+        return values[0] if len(values) == 1 else values
+
+
+def _revert_reason(data):
+    data = bytes(data)
+    if eth_utils.to_hex(data[:4]) == ERROR_SELECTOR:
+        try:
+            return decode(["string"], data[4:])[0]
+        except DecodingError:
+            # the selector of Error(string) without a string after it
+            pass
+    return data
+
+
+def multicall(calls, batch_size=BATCH_SIZE, multicall_contract=None, block=None):
+    """Reads the result of many calls with a few `eth_call`.
+
+    Args:
+        calls (Iterable[tuple]): (target, function, args) for each call. `target` is
+        a contract or an address, `function` a brownie method or an ABI entry, e.g.
+        `(proxy, LogicContractV1[-1].square, [3])`. `args` may be omitted.
+
+        batch_size (int, optional): Calls per `eth_call`. Defaults to BATCH_SIZE.
+
+        multicall_contract (Contract, optional): Defaults to `get_multicall()`.
+
+        block (int, optional): The block to read. Defaults to the latest block, read
+        once so that every batch sees the same state.
+
+    Returns:
+        [list]: (success, value) for each call, in order. `value` is the decoded
+        output of a call that succeeded, the revert reason or data of a call that
+        failed.
+    """
+    multicall_contract = multicall_contract or get_multicall()
+    if block is None:
+        block = web3.eth.block_number
+    functions = {}
+    encoded = []
+    for target, function, *args in calls:
+        # a brownie method, e.g. `proxy.retrieve`, or an ABI entry
+        abi = function if isinstance(function, dict) else function.abi
+        key = (abi_signature(abi), tuple(abi_type(i) for i in abi["outputs"]))
+        if key not in functions:
+            functions[key] = _Function(abi)
+        codec = functions[key]
+        address = str(getattr(target, "address", target))
+        encoded.append((codec, [address, codec.encode(args[0] if args else [])]))
+
+    results = []
+    for start in range(0, len(encoded), batch_size):
+        batch = encoded[start : start + batch_size]
+        _, returned = multicall_contract.tryAggregate.call(
+            [call for _, call in batch], block_identifier=block
+        )
+        for (codec, _), (success, data) in zip(batch, returned):
+            if not success:
+                results.append((False, _revert_reason(data)))
+                continue
+            try:
+                results.append((True, codec.decode(data)))
+            except DecodingError:
+                # e.g. the target has no code and returned nothing
+                results.append((False, bytes(data)))
+    return results
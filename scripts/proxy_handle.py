@@ -0,0 +1,192 @@
+import time
+
+import eth_utils
+from web3.exceptions import ContractLogicError
+from brownie import Contract, DiamondLoupeFacet, project, web3, ZERO_ADDRESS
+from scripts.proxy_slots import read_proxy_slots
+from scripts.diamond_mirror import DIAMOND_CUT_TOPIC
+from scripts.upgrade_indexer import EVENT_KINDS
+from scripts.selector_registry import abi_signature, to_selector
+
+# the events after which the ABI of a proxy may have changed
+UPGRADE_TOPICS = [topic for topic, kind in EVENT_KINDS.items() if kind != "admin"] + [
+    DIAMOND_CUT_TOPIC
+]
+# bytes4(keccak256("facets()"))
+FACETS_SELECTOR = "0x7a0ed627"
+
+# code hash => contract container, shared by every handle
+_containers = {}
+
+
+def _address(value):
+    return eth_utils.to_checksum_address(str(getattr(value, "address", value)))
+
+
+def find_container(address):
+    """Returns the project contract deployed at `address`.
+
+    The contract is looked up by the hash of its code, once per code hash: first
+    among the contracts deployed by the project, whose immutables make their
+    code differ from the artifact, then by comparing the code with the artifacts.
+
+    Returns:
+        [brownie.network.contract.ContractContainer]: The contract, None if the
+        code is not one of the project.
+    """
+    address = _address(address)
+    code_hash = eth_utils.keccak(web3.eth.get_code(address))
+    if code_hash in _containers:
+        return _containers[code_hash]
+    if code_hash == eth_utils.keccak(b""):
+        # no code, e.g. a selfdestructed implementation
+        return None
+    containers = project.get_loaded_projects()[0].dict().values()
+    found = next(
+        (c for c in containers if any(str(i) == address for i in c)), None
+    ) or next(
+        (
+            c
+            for c in containers
+            if c._build["deployedBytecode"]
+            and eth_utils.keccak(hexstr=c._build["deployedBytecode"]) == code_hash
+        ),
+        None,
+    )
+    if found is not None:
+        _containers[code_hash] = found
+    return found
+
+
+class ProxyHandle:
+    """A proxy with the ABI of its current implementation.
+
+    The pattern of the proxy is detected once, from its ERC1967 slots or its
+    loupe. The functions of the implementation, or of every facet of a diamond,
+    can then be called on the handle. `sync` looks for the `Upgraded`,
+    `BeaconUpgraded` and `DiamondCut` events of the proxy, or of its beacon,
+    and only then resolves the ABI again. It is called explicitly, or at most
+    once every `sync_interval` seconds when a function is looked up.
+
+    Example:
+
+        proxy = ProxyHandle(proxy)
+        proxy.store(8, {"from": account})
+        proxy_admin.upgrade(proxy, logic_contract_v2, {"from": account})
+        proxy.sync()
+        # LogicContractV2.square
+        proxy.square(3)
+    """
+
+    def __init__(self, proxy, sync_interval=None):
+        """
+        Args:
+            proxy (Contract | str): A Transparent, UUPS or Beacon proxy, or a
+            diamond.
+
+            sync_interval (float, optional): The seconds after which looking up
+            a function syncs the handle first. Defaults to None, only `sync`
+            does.
+        """
+        self.address = _address(proxy)
+        self.pattern = None
+        self.implementation = None
+        self.contract = None
+        self.sync_interval = sync_interval
+        self.block = web3.eth.block_number
+        self._synced = time.monotonic()
+        self._resolve()
+
+    def __repr__(self):
+        return f"<ProxyHandle {self.pattern} '{self.address}' {self.contract._name}>"
+
+    def __str__(self):
+        return self.address
+
+    def __getattr__(self, name):
+        # only called for the names the handle does not have itself
+        if name.startswith("_") or self.contract is None:
+            raise AttributeError(name)
+        if (
+            self.sync_interval is not None
+            and time.monotonic() - self._synced >= self.sync_interval
+        ):
+            self.sync()
+        return getattr(self.contract, name)
+
+    def _resolve(self):
+        slots = read_proxy_slots([self.address], block=self.block)[self.address]
+        self.implementation = slots["implementation"]
+        self._beacon = slots["beacon"]
+        if self._beacon != ZERO_ADDRESS:
+            self.pattern = "beacon"
+        elif self.implementation != ZERO_ADDRESS:
+            self.pattern = "transparent" if slots["admin"] != ZERO_ADDRESS else "uups"
+        elif self._is_diamond():
+            self.pattern = "diamond"
+            self.contract = self._diamond_view()
+            return
+        else:
+            raise ValueError(f"{self.address} is not a known proxy")
+        container = find_container(self.implementation)
+        if container is None:
+            raise ValueError(f"Unknown implementation {self.implementation}")
+        self.contract = Contract.from_abi(
+            container._name, self.address, container.abi, persist=False
+        )
+
+    def _is_diamond(self):
+        try:
+            facets = web3.eth.call({"to": self.address, "data": FACETS_SELECTOR})
+        except (ContractLogicError, ValueError):
+            # no loupe and no fallback
+            return False
+        # more than the offset and the length of an empty array
+        return len(facets) > 64
+
+    def _diamond_view(self):
+        # the functions of every facet, for the selectors routed to it
+        loupe = Contract.from_abi(
+            "DiamondLoupeFacet", self.address, DiamondLoupeFacet.abi, persist=False
+        )
+        abi = []
+        facets = loupe.facets(block_identifier=self.block)
+        self.implementation = [_address(facet) for facet, _ in facets]
+        for facet, selectors in facets:
+            container = find_container(facet)
+            if container is None:
+                raise ValueError(f"Unknown facet {facet}")
+            routed = {str(selector).lower() for selector in selectors}
+            abi += [
+                item
+                for item in container.abi
+                if item["type"] == "function"
+                and to_selector(abi_signature(item)) in routed
+            ]
+        return Contract.from_abi("Diamond", self.address, abi, persist=False)
+
+    def sync(self):
+        """Resolves the ABI again if the proxy was upgraded since the last sync.
+
+        Returns:
+            [bool]: True when the proxy was upgraded.
+        """
+        self._synced = time.monotonic()
+        block = web3.eth.block_number
+        if block == self.block:
+            return False
+        addresses = [self.address]
+        if self.pattern == "beacon":
+            addresses.append(self._beacon)
+        logs = web3.eth.get_logs(
+            {
+                "address": addresses,
+                "topics": [UPGRADE_TOPICS],
+                "fromBlock": self.block + 1,
+                "toBlock": block,
+            }
+        )
+        self.block = block
+        if logs:
+            self._resolve()
+        return bool(logs)
@@ -0,0 +1,111 @@
+import eth_utils
+from brownie import web3, ZERO_ADDRESS
+from scripts.upgrade_indexer import IMPLEMENTATION_SELECTOR
+
+# requests per JSON-RPC batch, most nodes and providers accept up to 1000
+BATCH_SIZE = 500
+
+
+def _slot(name):
+    # bytes32(uint256(keccak256(name)) - 1), as in ERC1967Upgrade.sol
+    return eth_utils.to_hex(
+        (int.from_bytes(eth_utils.keccak(text=name), "big") - 1).to_bytes(32, "big")
+    )
+
+
+IMPLEMENTATION_SLOT = _slot("eip1967.proxy.implementation")
+ADMIN_SLOT = _slot("eip1967.proxy.admin")
+BEACON_SLOT = _slot("eip1967.proxy.beacon")
+SLOTS = {
+    "implementation": IMPLEMENTATION_SLOT,
+    "admin": ADMIN_SLOT,
+    "beacon": BEACON_SLOT,
+}
+
+
+def _address(word):
+    # the last 20 bytes of a 32 bytes word
+    word = word if isinstance(word, str) else eth_utils.to_hex(word)
+    return eth_utils.to_checksum_address("0x" + word[2:].rjust(64, "0")[-40:])
+
+
+def batch_request(requests, batch_size=BATCH_SIZE):
+    """Sends `requests` as JSON-RPC batches of `batch_size`.
+
+    Args:
+        requests (list): (method, params) of each request.
+
+    Returns:
+        [list]: The result of each request, in order.
+    """
+    results = []
+    for start in range(0, len(requests), batch_size):
+        responses = web3.provider.make_batch_request(
+            requests[start : start + batch_size]
+        )
+        # a single response for the whole batch when it is refused
+        if isinstance(responses, dict):
+            raise ValueError(f"Batch request failed: {responses.get('error')}")
+        for response in responses:
+            if "error" in response:
+                raise ValueError(f"Request failed: {response['error']}")
+            results.append(response["result"])
+    return results
+
+
+def read_proxy_slots(proxies, resolve_beacons=True, block=None, batch_size=BATCH_SIZE):
+    """Reads the ERC1967 slots of many proxies with batched `eth_getStorageAt`.
+
+    Works for any ERC1967 proxy (Transparent, UUPS or Beacon), whoever its admin
+    is, since nothing is called on the proxies.
+
+    Args:
+        proxies (Iterable): The proxies, contracts or addresses.
+
+        resolve_beacons (bool, optional): Read the implementation of the beacon of
+        beacon proxies, with a second batch of `eth_call`. Defaults to True.
+
+        block (int, optional): The block to read. Defaults to the latest block, read
+        once so that every batch sees the same state.
+
+        batch_size (int, optional): Requests per batch. Defaults to BATCH_SIZE.
+
+    Returns:
+        [dict]: proxy address => {"implementation": ..., "admin": ...,
+        "beacon": ...}, ZERO_ADDRESS for an empty slot. The implementation of a
+        beacon proxy is the one of its beacon when `resolve_beacons` is set.
+    """
+    if block is None:
+        block = web3.eth.block_number
+    block = hex(block)
+    proxies = [
+        eth_utils.to_checksum_address(str(getattr(proxy, "address", proxy)))
+        for proxy in proxies
+    ]
+    requests = [
+        ("eth_getStorageAt", [proxy, slot, block])
+        for proxy in proxies
+        for slot in SLOTS.values()
+    ]
+    words = iter(batch_request(requests, batch_size))
+    result = {
+        proxy: {name: _address(next(words)) for name in SLOTS} for proxy in proxies
+    }
+    if not resolve_beacons:
+        return result
+
+    beacons = list(
+        {i["beacon"]: None for i in result.values() if i["beacon"] != ZERO_ADDRESS}
+    )
+    implementations = batch_request(
+        [
+            ("eth_call", [{"to": beacon, "data": IMPLEMENTATION_SELECTOR}, block])
+            for beacon in beacons
+        ],
+        batch_size,
+    )
+    beacon_implementations = dict(zip(beacons, map(_address, implementations)))
+    for slots in result.values():
+        if slots["beacon"] != ZERO_ADDRESS:
+            slots["implementation"] = beacon_implementations[slots["beacon"]]
+    return result
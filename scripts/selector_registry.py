@@ -0,0 +1,208 @@
+import json
+from pathlib import Path
+
+import eth_utils
+
+PROJECT_PATH = Path(__file__).resolve().parent.parent
+BUILD_PATH = PROJECT_PATH.joinpath("build", "contracts")
+CACHE_PATH = PROJECT_PATH.joinpath("build", "selectors.json")
+CACHE_VERSION = 1
+
+
+def abi_type(abi_input):
+    """Returns the canonical type of an ABI input, expanding tuples.
+
+    Args:
+        abi_input (dict): An entry of the `inputs` list of an ABI function.
+
+    Returns:
+        [str]: The type as used in a signature, e.g. `(address,uint8,bytes4[])[]`.
+    """
+    type_ = abi_input["type"]
+    if type_.startswith("tuple"):
+        components = ",".join(abi_type(c) for c in abi_input["components"])
+        return f"({components}){type_[len('tuple'):]}"
+    return type_
+
+
+def abi_signature(abi_function):
+    """Returns the signature of an ABI function, e.g. `store(uint256)`."""
+    inputs = ",".join(abi_type(i) for i in abi_function["inputs"])
+    return f"{abi_function['name']}({inputs})"
+
+
+def to_selector(signature):
+    """Hashes `signature` and returns its 4 bytes selector as an hex string."""
+    return eth_utils.to_hex(eth_utils.function_signature_to_4byte_selector(signature))
+
+
+class SelectorRegistry:
+    """Index of the function selectors of every compiled contract of the project.
+
+    The index is built from the brownie build artifacts and kept in a cache file.
+    An artifact is only parsed again when its file changed, and its selectors are
+    only recomputed when its bytecode hash changed. Each signature is hashed once.
+    """
+
+    def __init__(self, build_path=BUILD_PATH, cache_path=CACHE_PATH):
+        self._build_path = Path(build_path)
+        self._cache_path = Path(cache_path)
+        # selector => signature
+        self._signatures = {}
+        # signature => selector
+        self._selectors = {}
+        # contract name => {"mtime": ..., "bytecodeSha1": ..., "selectors": [...]}
+        self._contracts = {}
+        self._load_cache()
+        self.refresh()
+
+    def _load_cache(self):
+        if not self._cache_path.exists():
+            return
+        try:
+            cache = json.loads(self._cache_path.read_text())
+        except ValueError:
+            return
+        if cache.get("version") != CACHE_VERSION:
+            return
+        self._signatures = cache["signatures"]
+        self._selectors = {sig: sel for sel, sig in self._signatures.items()}
+        self._contracts = cache["contracts"]
+
+    def _save_cache(self):
+        self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache = {
+            "version": CACHE_VERSION,
+            "signatures": self._signatures,
+            "contracts": self._contracts,
+        }
+        self._cache_path.write_text(json.dumps(cache, separators=(",", ":")))
+
+    def _add_signature(self, signature):
+        if signature not in self._selectors:
+            selector = to_selector(signature)
+            self._selectors[signature] = selector
+            self._signatures[selector] = signature
+        return self._selectors[signature]
+
+    def refresh(self):
+        """Updates the index from the build artifacts.
+
+        Returns:
+            [bool]: True if the selectors of at least one contract changed, or a
+            contract was removed.
+        """
+        changed = False
+        # the cache is also written when only modification times changed
+        stale = not self._cache_path.exists()
+        found = set()
+        for path in sorted(self._build_path.glob("*.json")):
+            name = path.stem
+            found.add(name)
+            mtime = path.stat().st_mtime_ns
+            entry = self._contracts.get(name)
+            if entry and entry["mtime"] == mtime:
+                continue
+            stale = True
+            artifact = json.loads(path.read_text())
+            if entry and entry["bytecodeSha1"] == artifact.get("bytecodeSha1"):
+                entry["mtime"] = mtime
+                continue
+            selectors = [
+                self._add_signature(abi_signature(i))
+                for i in artifact.get("abi", [])
+                if i["type"] == "function"
+            ]
+            if not entry or entry["selectors"] != selectors:
+                changed = True
+            self._contracts[name] = {
+                "mtime": mtime,
+                "bytecodeSha1": artifact.get("bytecodeSha1"),
+                "selectors": selectors,
+            }
+        for name in set(self._contracts) - found:
+            del self._contracts[name]
+            changed = True
+        if changed:
+            self._drop_unused_signatures()
+        if changed or stale:
+            self._save_cache()
+        return changed
+
+    def _drop_unused_signatures(self):
+        # e.g. of the functions of a deleted artifact
+        used = {
+            selector
+            for entry in self._contracts.values()
+            for selector in entry["selectors"]
+        }
+        self._signatures = {
+            selector: signature
+            for selector, signature in self._signatures.items()
+            if selector in used
+        }
+        self._selectors = {sig: sel for sel, sig in self._signatures.items()}
+
+    def selector(self, signature):
+        """Returns the selector of `signature`, e.g. `retrieve()` => `0x2e64cec1`.
+
+        Signatures that are not part of any artifact are hashed and kept in memory.
+        """
+        if signature not in self._selectors:
+            selector = to_selector(signature)
+            self._selectors[signature] = selector
+            self._signatures.setdefault(selector, signature)
+        return self._selectors[signature]
+
+    def signature(self, selector):
+        """Returns the signature of `selector`, or None if it is unknown."""
+        return self._signatures.get(str(selector).lower())
+
+    def selectors(self, contract_name, exclude=()):
+        """Returns the selectors of the external functions of `contract_name`.
+
+        Args:
+            contract_name (str): Name of the contract, e.g. `FacetSquareV1`.
+
+            exclude (Iterable[str], optional):
+            Signatures or selectors to leave out.
+
+        Returns:
+            [list]: The selectors in ABI order.
+        """
+        if contract_name not in self._contracts:
+            raise KeyError(f"No build artifact for contract '{contract_name}'")
+        excluded = {self.selector(i) if "(" in i else i for i in exclude}
+        return [
+            i for i in self._contracts[contract_name]["selectors"] if i not in excluded
+        ]
+
+    def contracts(self, selector):
+        """Returns the names of the contracts that implement `selector`."""
+        return [
+            name
+            for name, entry in self._contracts.items()
+            if selector in entry["selectors"]
+        ]
+
+
+_registry = None
+
+
+def get_registry():
+    """Returns the registry of the project, building it on first use."""
+    global _registry
+    if _registry is None:
+        _registry = SelectorRegistry()
+    return _registry
+
+
+def get_selector(signature):
+    """Returns the selector of `signature`, e.g. `retrieve()` => `0x2e64cec1`."""
+    return get_registry().selector(signature)
+
+
+def get_selectors(contract, exclude=()):
+    """Returns the selectors of `contract` (a name or a brownie ContractContainer)."""
+    name = contract if isinstance(contract, str) else contract._name
+    return get_registry().selectors(name, exclude)
@@ -5,9 +5,9 @@ from brownie import (
     ProxyAdmin,
     config,
     network,
-    Contract,
 )
 from scripts.helpful_scripts import get_account, encode_function_data
+from scripts.proxy_handle import ProxyHandle
 
 
 def deploy():
@@ -41,8 +41,8 @@ def deploy():
     print(f"Proxy deployed to {proxy} !")
 
     # now we want to call these function on the proxy
-    # we assign the abi of logic_contract contract to proxy
-    proxy = Contract.from_abi("LogicContractV1", proxy.address, LogicContractV1.abi)
+    # the handle gives proxy the abi of its current implementation, LogicContractV1
+    proxy = ProxyHandle(proxy)
     print("Despite what we give to the constructor,")
     print(
         f"Here is the initial value in the proxy contract storage: {proxy.retrieve()}"
@@ -67,7 +67,8 @@ def deploy():
     )
     # upgrade to the new implementation
     proxy_admin.upgrade(proxy.address, logic_contract_v2.address, {"from": account})
-    # proxy = Contract.from_abi("LogicContractV2", proxy.address, LogicContractV2.abi)
+    # the handle sees the Upgraded event and switches to the abi of LogicContractV2
+    proxy.sync()
     print(
         f"The value in the proxy (that we get with the V2 retrieve()) is still: {proxy.retrieve()}, since it was saved in the proxy storage"
     )
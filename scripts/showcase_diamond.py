@@ -9,7 +9,7 @@ from brownie import (
     ZERO_ADDRESS,
 )
 from scripts.helpful_scripts import get_account
-from web3 import Web3
+from scripts.selector_registry import get_selector
 
 
 def deploy():
@@ -35,12 +35,12 @@ def deploy():
     # Diamond arg
     _args = [account.address, ZERO_ADDRESS, ""]
 
-    func_selector_retrieve = Web3.keccak(text="retrieve()")[:4].hex()
-    func_selector_store = Web3.keccak(text="store(uint256)")[:4].hex()
-    func_selector_square = Web3.keccak(text="square(uint256)")[:4].hex()
-    func_selector_diamondCut = Web3.keccak(
-        text="diamondCut((address,uint8,bytes4[])[],address,bytes)"
-    )[:4].hex()
+    func_selector_retrieve = get_selector("retrieve()")
+    func_selector_store = get_selector("store(uint256)")
+    func_selector_square = get_selector("square(uint256)")
+    func_selector_diamondCut = get_selector(
+        "diamondCut((address,uint8,bytes4[])[],address,bytes)"
+    )
     print(func_selector_diamondCut)
     _diamondCut = [
         [facet_square_v1.address, 0, [func_selector_retrieve]],
@@ -89,7 +89,6 @@ def deploy():
         "DiamondCutFacet", proxy.address, DiamondCutFacet.abi
     )
 
-    func_selector_square = Web3.keccak(text="square(uint256)")[:4].hex()
     _diamondCut = [
         [facet_square_v2.address, 1, [func_selector_square]],
     ]
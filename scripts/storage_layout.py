@@ -0,0 +1,198 @@
+from pathlib import Path
+
+from brownie.project import compiler
+from brownie.project.compiler import solidity
+
+PROJECT_PATH = Path(__file__).resolve().parent.parent
+# the facets and everything they import, no remapping needed
+DIAMOND_SOURCES = "contracts/Diamond"
+SLOT_SIZE = 32
+
+
+def compile_storage_layouts(source_path=DIAMOND_SOURCES, project_path=PROJECT_PATH):
+    """Compiles the contracts of `source_path` for their storage layout only.
+
+    Brownie does not ask solc for the storage layout, so the sources are compiled
+    again, with the solc version their pragmas select.
+
+    Returns:
+        [dict]: contract name => `storageLayout` output of solc, with its
+        `storage` variables and their `types`.
+    """
+    project_path = Path(project_path)
+    sources = {
+        path.relative_to(project_path).as_posix(): path.read_text()
+        for path in sorted(project_path.joinpath(source_path).glob("**/*.sol"))
+    }
+    solidity.set_solc_version(
+        solidity.find_best_solc_version(sources, install_needed=True)
+    )
+    input_json = compiler.generate_input_json(sources, optimize=False)
+    input_json["settings"]["outputSelection"] = {"*": {"*": ["storageLayout"]}}
+    output = compiler.compile_from_input_json(
+        input_json, allow_paths=project_path.as_posix()
+    )
+    return {
+        name: contract["storageLayout"]
+        for contracts in output["contracts"].values()
+        for name, contract in contracts.items()
+    }
+
+
+def _slots(variables, types, base=0):
+    # slot => bytes used by the variables starting in it, `base` is the slot of
+    # the struct of the variables
+    used = {}
+    for variable in variables:
+        info = types[variable["type"]]
+        slot = base + int(variable["slot"])
+        if "members" in info:
+            # counted through its members, the struct may leave gaps in its slots
+            for i, size in _slots(info["members"], types, slot).items():
+                used[i] = used.get(i, 0) + size
+            continue
+        size = int(info["numberOfBytes"])
+        for i in range(max(size // SLOT_SIZE, 1)):
+            used[slot + i] = used.get(slot + i, 0) + min(size, SLOT_SIZE)
+    return used
+
+
+def slot_usage(layout):
+    """Returns the slots and bytes used by the state variables and each struct.
+
+    A struct member smaller than a slot that the next member does not fit next to
+    leaves the rest of its slot unused. Mappings and dynamic arrays count as the
+    one slot they take, their content is stored elsewhere.
+
+    Returns:
+        [list]: (name, slots, used bytes, wasted bytes), the contract storage first.
+    """
+    types = layout.get("types") or {}
+    groups = [("storage", layout["storage"])] + [
+        (info["label"], info["members"])
+        for _, info in sorted(types.items())
+        if "members" in info
+    ]
+    usage = []
+    for name, variables in groups:
+        used = _slots(variables, types)
+        usage.append(
+            (
+                name,
+                len(used),
+                sum(used.values()),
+                len(used) * SLOT_SIZE - sum(used.values()),
+            )
+        )
+    return usage
+
+
+def _describe(type_id, types):
+    # compared by label and members, the type ids hold AST ids
+    info = types[type_id]
+    members = [
+        (m["label"], int(m["slot"]), m["offset"], _describe(m["type"], types))
+        for m in info.get("members", [])
+    ]
+    nested = [
+        _describe(info[key], types) for key in ("key", "value", "base") if key in info
+    ]
+    return (info["label"], tuple(members), tuple(nested))
+
+
+def _end(variable, types):
+    # first byte after the variable, counted from the start of the storage
+    size = int(types[variable["type"]]["numberOfBytes"])
+    return int(variable["slot"]) * SLOT_SIZE + variable["offset"] + size
+
+
+def _compare_type(old_id, new_id, old_types, new_types, name):
+    old_type = old_types[old_id]
+    new_type = new_types[new_id]
+    if "members" in old_type and "members" in new_type:
+        # a struct may grow, its members may not move
+        return _compare(
+            old_type["members"], new_type["members"], old_types, new_types, f"{name}."
+        )
+    if old_type["encoding"] == new_type["encoding"] == "mapping" and _describe(
+        old_type["key"], old_types
+    ) == _describe(new_type["key"], new_types):
+        # the values are stored apart, a struct value may grow too
+        return _compare_type(
+            old_type["value"], new_type["value"], old_types, new_types, f"{name}[]"
+        )
+    if _describe(old_id, old_types) != _describe(new_id, new_types):
+        return [f"{name} changed from {old_type['label']} to {new_type['label']}"]
+    return []
+
+
+def _compare(old, new, old_types, new_types, path):
+    errors = []
+    new_by_label = {variable["label"]: variable for variable in new}
+    for variable in old:
+        name = f"{path}{variable['label']}"
+        moved = new_by_label.get(variable["label"])
+        if moved is None:
+            errors.append(f"{name} was removed")
+            continue
+        if (variable["slot"], variable["offset"]) != (moved["slot"], moved["offset"]):
+            errors.append(
+                f"{name} moved from slot {variable['slot']} offset "
+                f"{variable['offset']} to slot {moved['slot']} offset "
+                f"{moved['offset']}"
+            )
+        errors += _compare_type(
+            variable["type"], moved["type"], old_types, new_types, name
+        )
+    # new variables only go after the previous ones
+    end = max((_end(variable, old_types) for variable in old), default=0)
+    labels = {variable["label"] for variable in old}
+    for variable in new:
+        start = int(variable["slot"]) * SLOT_SIZE + variable["offset"]
+        if variable["label"] not in labels and start < end:
+            errors.append(
+                f"{path}{variable['label']} was added in slot {variable['slot']}, "
+                "used by the previous version"
+            )
+    return errors
+
+
+def find_layout_breaks(old, new):
+    """Returns the changes from the layout `old` to `new` that corrupt the storage.
+
+    A variable or struct member may only be added after the existing ones. Any
+    removed, moved or retyped one is reported. Renaming one reads as a removal.
+
+    Args:
+        old (dict): The `storageLayout` of the running facet.
+
+        new (dict): The `storageLayout` of the facet replacing it.
+
+    Returns:
+        [list]: The breaking changes, empty when `new` is compatible.
+    """
+    return _compare(
+        old["storage"],
+        new["storage"],
+        old.get("types") or {},
+        new.get("types") or {},
+        "",
+    )
+
+
+def print_report(layouts, names):
+    print(f"{'contract / struct':<40}{'slots':>8}{'used':>8}{'wasted':>8}")
+    for name in names:
+        for group, slots, used, wasted in slot_usage(layouts[name]):
+            label = name if group == "storage" else f"  {group}"
+            print(f"{label:<40}{slots:>8}{used:>8}{wasted:>8}")
+
+
+def main():
+    layouts = compile_storage_layouts()
+    print_report(layouts, ["FacetSquareV1", "FacetSquareV2"])
+    errors = find_layout_breaks(layouts["FacetSquareV1"], layouts["FacetSquareV2"])
+    for error in errors:
+        print(f"FacetSquareV1 -> FacetSquareV2: {error}")
+    if not errors:
+        print("FacetSquareV1 -> FacetSquareV2: compatible")
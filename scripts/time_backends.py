@@ -0,0 +1,79 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_PATH = Path(__file__).resolve().parent.parent
+RESULTS_PATH = PROJECT_PATH.joinpath("benchmarks", "backend_timings.json")
+# environment and `brownie test` arguments of each backend
+BACKENDS = {
+    "ganache": ({"EVM_BACKEND": "node"}, ["--network", "development"]),
+    "eth-tester": ({"EVM_BACKEND": "eth-tester"}, ["--network", "eth-tester"]),
+}
+
+
+def time_suite(env, args, tests="tests"):
+    """Runs the tests in a new brownie process and times it, node launch included.
+
+    Returns:
+        [dict]: The seconds, the exit code and the last line of the pytest report.
+    """
+    start = time.perf_counter()
+    process = subprocess.run(
+        ["brownie", "test", tests, *args],
+        cwd=PROJECT_PATH,
+        env={**os.environ, **env},
+        capture_output=True,
+        text=True,
+    )
+    seconds = time.perf_counter() - start
+    lines = process.stdout.strip().splitlines() or [""]
+    return {
+        "seconds": round(seconds, 2),
+        "returncode": process.returncode,
+        "summary": lines[-1].strip("= "),
+    }
+
+
+def time_backends(backends=BACKENDS, tests="tests", runs=3):
+    """Times the tests `runs` times on each backend, one after the other.
+
+    Returns:
+        [dict]: backend => {"runs": [...], "median": seconds, "min": seconds}.
+    """
+    results = {}
+    for name, (env, args) in backends.items():
+        times = [time_suite(env, args, tests) for _ in range(runs)]
+        seconds = [run["seconds"] for run in times]
+        results[name] = {
+            "runs": times,
+            "median": statistics.median(seconds),
+            "min": min(seconds),
+        }
+    return results
+
+
+def print_results(results):
+    print(f"{'backend':<14}{'median':>10}{'min':>10}  result")
+    for name, result in results.items():
+        print(
+            f"{name:<14}{result['median']:>10.2f}{result['min']:>10.2f}"
+            f"  {result['runs'][-1]['summary']}"
+        )
+
+
+# not a brownie script: `brownie run` would connect to a network first, that the
+# timed runs would share
+def main(tests="tests", runs=3):
+    results = time_backends(tests=tests, runs=runs)
+    print_results(results)
+    RESULTS_PATH.parent.mkdir(exist_ok=True)
+    RESULTS_PATH.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+    print(f"Results written to {RESULTS_PATH}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,295 @@
+import sqlite3
+from pathlib import Path
+
+import eth_utils
+from eth_abi import decode
+from brownie import web3, ZERO_ADDRESS
+from scripts.diamond_cut_planner import ADD, REPLACE, REMOVE
+from scripts.diamond_mirror import (
+    BLOCK_RANGE,
+    DIAMOND_CUT_TOPIC,
+    PROJECT_PATH,
+    decode_diamond_cut,
+)
+
+DATABASE_PATH = PROJECT_PATH.joinpath("build", "upgrade_history.sqlite")
+DATABASE_VERSION = 1
+# bytes4(keccak256("implementation()"))
+IMPLEMENTATION_SELECTOR = "0x5c60da1b"
+# event topic => the kind of address it records
+EVENT_KINDS = {
+    eth_utils.to_hex(eth_utils.keccak(text="Upgraded(address)")): "implementation",
+    eth_utils.to_hex(eth_utils.keccak(text="AdminChanged(address,address)")): "admin",
+    eth_utils.to_hex(eth_utils.keccak(text="BeaconUpgraded(address)")): "beacon",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS changes (
+    address TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    block INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (address, kind, block, log_index)
+);
+CREATE TABLE IF NOT EXISTS diamond_cuts (
+    address TEXT NOT NULL,
+    block INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    facet TEXT NOT NULL,
+    action INTEGER NOT NULL,
+    -- NULL when a whole facet is removed
+    selector TEXT
+);
+CREATE INDEX IF NOT EXISTS diamond_cuts_selector
+    ON diamond_cuts (address, selector, block, log_index, position);
+CREATE INDEX IF NOT EXISTS diamond_cuts_facet
+    ON diamond_cuts (address, facet, block, log_index, position);
+"""
+
+
+def _address(value):
+    return eth_utils.to_checksum_address(str(getattr(value, "address", value)))
+
+
+def _topic_address(topic):
+    return eth_utils.to_checksum_address(bytes(topic)[-20:])
+
+
+class UpgradeIndexer:
+    """Upgrade history of every proxy and diamond of a chain, in a SQLite database.
+
+    `sync` streams the `Upgraded`, `AdminChanged`, `BeaconUpgraded` and
+    `DiamondCut` logs emitted since the last synced block, in chunks of
+    BLOCK_RANGE blocks, and saves the last block in the database. The queries
+    are then answered from the database only.
+
+    Example:
+
+        indexer = UpgradeIndexer()
+        indexer.sync()
+        indexer.implementations([proxy_1, proxy_2])
+        indexer.implementation(proxy_1, block=12_345_678)
+    """
+
+    def __init__(
+        self, path=DATABASE_PATH, start_block=0, addresses=None, confirmations=0
+    ):
+        """
+        Args:
+            path (str, optional): The database. Defaults to
+            `build/upgrade_history.sqlite`.
+
+            start_block (int, optional): First block to scan when the database is
+            new. Defaults to 0.
+
+            addresses (list, optional): Only index the logs of these contracts, and
+            of the beacons of the beacon proxies among them. Defaults to every
+            contract.
+
+            confirmations (int, optional): Blocks to wait before indexing a log, so
+            that a reorganization can not leave a removed upgrade in the database.
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path))
+        self._db.executescript(SCHEMA)
+        self._addresses = addresses and [_address(i) for i in addresses]
+        self._confirmations = confirmations
+        meta = dict(self._db.execute("SELECT key, value FROM meta"))
+        if (
+            meta.get("version") != DATABASE_VERSION
+            or meta.get("chainId") != web3.eth.chain_id
+            # the chain was reset since, e.g. a new local network
+            or meta.get("block", -1) > web3.eth.block_number
+        ):
+            with self._db:
+                self._db.execute("DELETE FROM changes")
+                self._db.execute("DELETE FROM diamond_cuts")
+            meta = {"block": start_block - 1}
+        # last indexed block
+        self.block = meta["block"]
+
+    def close(self):
+        self._db.close()
+
+    def _save(self):
+        self._db.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [
+                ("version", DATABASE_VERSION),
+                ("chainId", web3.eth.chain_id),
+                ("block", self.block),
+            ],
+        )
+
+    # returns False for a log skipped, see below
+    def _index(self, log):
+        topics = log["topics"]
+        topic = eth_utils.to_hex(topics[0])
+        address = _address(log["address"])
+        position = (log["blockNumber"], log["logIndex"])
+        if topic == DIAMOND_CUT_TOPIC:
+            rows = []
+            for facet, action, selectors in decode_diamond_cut(log):
+                for selector in selectors or [None]:
+                    rows.append(
+                        (address, *position, len(rows), facet, action, selector)
+                    )
+            self._db.executemany(
+                "INSERT INTO diamond_cuts VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            return True
+        kind = EVENT_KINDS[topic]
+        data = log["data"]
+        if isinstance(data, str):
+            data = eth_utils.to_bytes(hexstr=data)
+        # as OpenZeppelin emits them: the address of Upgraded and BeaconUpgraded
+        # indexed, the two addresses of AdminChanged not. A contract declaring the
+        # same event with other `indexed` parameters is skipped
+        if kind == "admin":
+            if len(topics) != 1 or len(data) != 64:
+                return False
+            value = decode(["address", "address"], bytes(data))[1]
+        else:
+            if len(topics) != 2 or len(data) != 0:
+                return False
+            value = _topic_address(topics[1])
+        value = eth_utils.to_checksum_address(value)
+        self._db.execute(
+            "INSERT OR REPLACE INTO changes VALUES (?, ?, ?, ?, ?)",
+            (address, kind, *position, value),
+        )
+        if kind == "beacon" and not self._latest(value, "implementation", position[0]):
+            self._index_beacon(value, position[0])
+        return True
+
+    def _index_beacon(self, beacon, block):
+        # UpgradeableBeacon does not emit its first implementation, read it once
+        data = web3.eth.call(
+            {"to": beacon, "data": IMPLEMENTATION_SELECTOR}, block_identifier=block
+        )
+        (implementation,) = decode(["address"], bytes(data))
+        # before any Upgraded log of the same block
+        self._db.execute(
+            "INSERT OR REPLACE INTO changes VALUES (?, ?, ?, ?, ?)",
+            (beacon, "implementation", block, -1, _address(implementation)),
+        )
+
+    def sync(self, to_block=None):
+        """Indexes the logs emitted since the last synced block.
+
+        Args:
+            to_block (int, optional): Last block to index. Defaults to the latest
+            block minus `confirmations`.
+
+        Returns:
+            [int]: The number of logs indexed.
+        """
+        if to_block is None:
+            to_block = web3.eth.block_number - self._confirmations
+        indexed = 0
+        while self.block < to_block:
+            from_block = self.block + 1
+            end_block = min(from_block + BLOCK_RANGE - 1, to_block)
+            addresses = self._addresses and self._addresses + self._beacons()
+            logs = self._get_logs(from_block, end_block, addresses)
+            # a chunk and its checkpoint are written together
+            with self._db:
+                indexed += sum(self._index(log) for log in logs)
+                if self._addresses:
+                    # the beacons log their own upgrades, also the beacons of the
+                    # proxies first seen in this chunk
+                    new_beacons = [i for i in self._beacons() if i not in addresses]
+                    if new_beacons:
+                        for log in self._get_logs(from_block, end_block, new_beacons):
+                            indexed += self._index(log)
+                self.block = end_block
+                self._save()
+        return indexed
+
+    def _get_logs(self, from_block, to_block, addresses=None):
+        log_filter = {
+            # any of the events
+            "topics": [list(EVENT_KINDS) + [DIAMOND_CUT_TOPIC]],
+            "fromBlock": from_block,
+            "toBlock": to_block,
+        }
+        if addresses:
+            log_filter["address"] = addresses
+        return web3.eth.get_logs(log_filter)
+
+    def _beacons(self):
+        return [
+            row[0]
+            for row in self._db.execute(
+                "SELECT DISTINCT value FROM changes WHERE kind = 'beacon'"
+            )
+        ]
+
+    def _latest(self, address, kind, block):
+        if block is None:
+            block = self.block
+        row = self._db.execute(
+            "SELECT value FROM changes WHERE address = ? AND kind = ? AND block <= ? "
+            "ORDER BY block DESC, log_index DESC LIMIT 1",
+            (_address(address), kind, block),
+        ).fetchone()
+        return row[0] if row else None
+
+    def implementation(self, proxy, block=None):
+        """Returns the implementation `proxy` delegated to at `block`.
+
+        For a beacon proxy, the implementation of its beacon at `block`.
+
+        Args:
+            proxy (Contract | str): The proxy.
+
+            block (int, optional): Defaults to the last indexed block.
+
+        Returns:
+            [str]: The implementation, ZERO_ADDRESS if none was indexed.
+        """
+        beacon = self._latest(proxy, "beacon", block)
+        implementation = self._latest(beacon or proxy, "implementation", block)
+        return implementation or ZERO_ADDRESS
+
+    def implementations(self, proxies, block=None):
+        """Returns {proxy: implementation} for each of `proxies`, see `implementation`."""
+        return {_address(proxy): self.implementation(proxy, block) for proxy in proxies}
+
+    def admin(self, proxy, block=None):
+        """Returns the admin of `proxy` at `block`, ZERO_ADDRESS if none was indexed."""
+        return self._latest(proxy, "admin", block) or ZERO_ADDRESS
+
+    def beacon(self, proxy, block=None):
+        """Returns the beacon of `proxy` at `block`, ZERO_ADDRESS if none was indexed."""
+        return self._latest(proxy, "beacon", block) or ZERO_ADDRESS
+
+    def facet_address(self, diamond, selector, block=None):
+        """Returns the facet `selector` was routed to by `diamond` at `block`.
+
+        Returns:
+            [str]: The facet, ZERO_ADDRESS if the selector was not routed.
+        """
+        if block is None:
+            block = self.block
+        diamond = _address(diamond)
+        route = self._db.execute(
+            "SELECT facet, action, block, log_index, position FROM diamond_cuts "
+            "WHERE address = ? AND selector = ? AND block <= ? "
+            "ORDER BY block DESC, log_index DESC, position DESC LIMIT 1",
+            (diamond, str(selector).lower(), block),
+        ).fetchone()
+        if route is None or route[1] not in (ADD, REPLACE):
+            return ZERO_ADDRESS
+        facet, _, *position = route
+        # the whole facet may have been removed since
+        removed = self._db.execute(
+            "SELECT 1 FROM diamond_cuts WHERE address = ? AND facet = ? "
+            "AND selector IS NULL AND action = ? AND block <= ? "
+            "AND (block, log_index, position) > (?, ?, ?) LIMIT 1",
+            (diamond, facet, REMOVE, block, *position),
+        ).fetchone()
+        return ZERO_ADDRESS if removed else facet
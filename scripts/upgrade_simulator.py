@@ -0,0 +1,229 @@
+import math
+
+import eth_utils
+from brownie import network, chain, web3, exceptions
+from scripts.helpful_scripts import get_account, LOCAL_BLOCKCHAIN_ENVIRONMENTS
+from scripts.proxy_slots import batch_request, BATCH_SIZE
+from scripts import deploy_transparent_upgradeable_proxy as transparent
+
+# margin over the estimated gas, the state may change before the upgrade is sent
+GAS_LIMIT_MARGIN = 1.1
+CREATE_OPCODES = ("CREATE", "CREATE2")
+# the callee runs with the storage of the caller
+DELEGATE_OPCODES = ("DELEGATECALL", "CALLCODE")
+
+
+def _address(word):
+    return eth_utils.to_checksum_address(f"{int(word, 16):040x}"[-40:])
+
+
+def _storage_writes(trace, address):
+    """Returns the slots each contract wrote to in `trace`, a `structLogs` trace.
+
+    Returns:
+        [dict]: contract address => slots, in the order of the first writes.
+    """
+    writes = {}
+    # the storage of each depth, starting at depth 1
+    contexts = [address]
+    # the slots written by constructors, until the address of the contract is known
+    creations = {}
+    for i, step in enumerate(trace):
+        depth = step["depth"]
+        stack = step["stack"]
+        if depth in creations and trace[i - 1]["depth"] > depth:
+            # back from a constructor, its address is on the top of the stack
+            slots = creations.pop(depth)
+            if int(stack[-1], 16):
+                writes.setdefault(_address(stack[-1]), {}).update(slots)
+        context = contexts[depth - 1]
+        if step["op"] == "SSTORE":
+            if isinstance(context, int):
+                slots = creations[context]
+            else:
+                slots = writes.setdefault(context, {})
+            slots[eth_utils.to_hex(int(stack[-1], 16).to_bytes(32, "big"))] = None
+        following = trace[i + 1] if i + 1 < len(trace) else None
+        if following is None or following["depth"] <= depth:
+            continue
+        if step["op"] in CREATE_OPCODES:
+            creations[depth] = {}
+            # a constructor is keyed by the depth of its creator
+            callee = depth
+        elif step["op"] in DELEGATE_OPCODES:
+            callee = context
+        else:
+            callee = _address(stack[-2])
+        contexts[depth:] = [callee]
+    return {address: list(slots) for address, slots in writes.items()}
+
+
+def state_diff(tx, batch_size=BATCH_SIZE):
+    """Returns the storage changed by `tx`, read from the node around its block.
+
+    The written slots are found in the `debug_traceTransaction` trace of `tx`,
+    following the storage context of every call, and compared to their value
+    before the block. A slot written back to its former value is not a change.
+
+    Returns:
+        [dict]: contract address => {slot: (before, after)}, as 32 bytes hex words.
+    """
+    trace = web3.provider.make_request(
+        "debug_traceTransaction",
+        [tx.txid, {"disableMemory": True, "disableStorage": True}],
+    )["result"]["structLogs"]
+    writes = _storage_writes(trace, tx.receiver or tx.contract_address)
+    keys = [(address, slot) for address, slots in writes.items() for slot in slots]
+    requests = [
+        ("eth_getStorageAt", [address, slot, hex(block)])
+        for block in (tx.block_number - 1, tx.block_number)
+        for address, slot in keys
+    ]
+    words = [
+        eth_utils.to_hex(int(word, 16).to_bytes(32, "big"))
+        for word in batch_request(requests, batch_size)
+    ]
+    diff = {}
+    for (address, slot), before, after in zip(keys, words, words[len(keys) :]):
+        if before != after:
+            diff.setdefault(address, {})[slot] = (before, after)
+    return diff
+
+
+def _simulate_step(method, args, tx, state_diffs):
+    result = {
+        "name": method._name,
+        "status": 1,
+        "revert_msg": None,
+        "gas_used": None,
+        "gas_limit": None,
+        "state_diff": {},
+    }
+    try:
+        result["gas_limit"] = math.ceil(
+            method.estimate_gas(*args, tx) * GAS_LIMIT_MARGIN
+        )
+    except ValueError:
+        # sent anyway, for the revert reason and the gas it burns
+        tx = {"gas_limit": web3.eth.get_block("latest")["gasLimit"], **tx}
+    try:
+        receipt = method(*args, tx)
+    except exceptions.VirtualMachineError as exc:
+        receipt = chain.get_transaction(exc.txid)
+        result.update(status=0, revert_msg=exc.revert_msg, gas_limit=None)
+    result["gas_used"] = receipt.gas_used
+    if state_diffs and receipt.status:
+        result["state_diff"] = state_diff(receipt)
+    return result
+
+
+def simulate(steps, account=None, state_diffs=True):
+    """Sends an upgrade plan to the local chain, reports each step, then undoes it.
+
+    Run it on a fork of the chain to upgrade, e.g. `--network mainnet-fork`, to
+    find the steps that would revert and the gas each one needs before anything
+    is sent for real. The steps are sent in order, each seeing the state left by
+    the ones before, even when one of them reverts.
+
+    Example:
+
+        simulate([
+            (proxy_admin.upgradeAndCall, [proxy, v2, data]),
+            (diamond.diamondCut, [cut, init, calldata], {"from": owner}),
+        ])
+
+    Args:
+        steps (list): (method, args) or (method, args, tx) of each step, the
+        method is a contract function. The transaction is sent from `account`
+        unless `tx` says otherwise.
+
+        account (Account, optional): Defaults to `get_account()`.
+
+        state_diffs (bool, optional): Trace each step for the storage it changed.
+        Defaults to True.
+
+    Returns:
+        [list]: For each step, {"name", "status", "revert_msg", "gas_used",
+        "gas_limit", "state_diff"}. `gas_limit` is the estimated gas plus
+        GAS_LIMIT_MARGIN, None when the step reverts. See `state_diff`.
+    """
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        raise ValueError(
+            f"Can not simulate on {network.show_active()}, use a local fork of it"
+        )
+    account = account or get_account()
+    start_block = web3.eth.block_number
+    results = []
+    try:
+        for method, args, *tx in steps:
+            tx = {"from": account, **(tx[0] if tx else {})}
+            results.append(_simulate_step(method, list(args), tx, state_diffs))
+    finally:
+        # one block per transaction sent, reverted or not
+        if web3.eth.block_number > start_block:
+            chain.undo(web3.eth.block_number - start_block)
+    return results
+
+
+def simulate_fleet_upgrade(
+    proxies, new_implementation, proxy_admin, initialize_data=None, state_diffs=False
+):
+    """Simulates the upgrade of each proxy of `proxies`, one transaction per proxy.
+
+    The upgrades run one after the other on the same chain, as in a batch of
+    `upgrade_fleet`: each one sees the state left by the previous ones, e.g. a
+    proxy listed twice is already upgraded the second time. Every upgrade is
+    undone afterwards, see `simulate`.
+
+    A proxy whose upgrade reverts would make the whole batch of `upgrade_fleet`
+    revert, leave it out of the rollout.
+
+    Returns:
+        [dict]: proxy address => result of its upgrade, see `simulate`.
+    """
+    addresses = [str(getattr(proxy, "address", proxy)) for proxy in proxies]
+    if initialize_data is None:
+        steps = [
+            (proxy_admin.upgrade, [proxy, new_implementation.address])
+            for proxy in addresses
+        ]
+    else:
+        steps = [
+            (
+                proxy_admin.upgradeAndCall,
+                [proxy, new_implementation.address, initialize_data],
+            )
+            for proxy in addresses
+        ]
+    return dict(zip(addresses, simulate(steps, state_diffs=state_diffs)))
+
+
+def print_report(results):
+    print(f"{'step':<30}{'status':>10}{'gas used':>12}{'gas limit':>12}")
+    for result in results:
+        status = "ok" if result["status"] else "reverted"
+        print(
+            f"{result['name']:<30}{status:>10}{result['gas_used'] or '-':>12}"
+            f"{result['gas_limit'] or '-':>12}"
+        )
+        if result["revert_msg"]:
+            print(f"    {result['revert_msg']}")
+        for address, slots in result["state_diff"].items():
+            for slot, (before, after) in slots.items():
+                print(f"    {address} {slot}: {before} -> {after}")
+
+
+def main():
+    proxy_admin, _, proxy = transparent.deploy_proxy_V1()
+    v2 = transparent.deploy_logic_contractV2()
+    initialize = v2.initialize.encode_input
+    # the second initialization reverts, and nothing was upgraded afterwards
+    print_report(
+        simulate(
+            [
+                (proxy_admin.upgradeAndCall, [proxy, v2, initialize(5)]),
+                (proxy_admin.upgradeAndCall, [proxy, v2, initialize(6)]),
+            ]
+        )
+    )
+    print(f"Implementation: {proxy_admin.getProxyImplementation(proxy)}")
@@ -0,0 +1,150 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+from brownie import (
+    LogicContractV1,
+    LogicContractUUPSV1,
+    LogicContractBeaconV1,
+    FacetSquareV1,
+    DiamondCutFacet,
+    DiamondLoupeFacet,
+    Contract,
+    chain,
+    network,
+    web3,
+)
+from scripts.chain_state import load_chain_state, save_chain_state
+from scripts.helpful_scripts import start_backend
+from scripts.evm_backend import NETWORK_ID, use_direct_provider
+from scripts.deployment_registry import get_create2_deployer
+from scripts import (
+    deploy_transparent_upgradeable_proxy,
+    deploy_uups,
+    deploy_beacon,
+    deploy_diamond,
+)
+
+# e.g. `CHAIN_STATE=build/chain_state.json brownie test` deploys the stacks once and
+# seeds every later run from the file, until one of their contracts is recompiled
+CHAIN_STATE_PATH = os.environ.get("CHAIN_STATE")
+
+
+# e.g. `EVM_BACKEND=eth-tester brownie test --network eth-tester` runs the tests
+# against an EVM in this process, started before brownie connects. Not at import:
+# with `-n`, only the xdist workers run tests, each on its own port
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        start_backend(worker=int(workerinput["workerid"].lstrip("gw")))
+    elif not config.getoption("numprocesses", None):
+        start_backend()
+
+
+# and once connected, without HTTP between brownie and the EVM
+@pytest.fixture(scope="session", autouse=True)
+def direct_provider():
+    use_direct_provider()
+
+
+# every test using the chain starts from the state left by the session fixtures,
+# with `pytestmark = pytest.mark.usefixtures("isolation")` in its module or the
+# mark on the test, so that the tests without a chain deploy nothing. Not brownie's
+# `fn_isolation`: its `module_isolation` resets the chain, and the stacks with it,
+# at the start of every module
+@pytest.fixture
+def isolation(stacks):
+    chain.snapshot()
+    yield
+    chain.revert()
+
+
+def deploy_stacks():
+    admin, v1, proxy = deploy_transparent_upgradeable_proxy.deploy_proxy_V1()
+    uups_v1, uups_proxy = deploy_uups.deploy_proxy_V1()
+    beacon_v1, beacon, beacon_proxy = deploy_beacon.deploy_beacon_proxy_V1()
+    square_facet, cut_facet, loupe_facet, diamond = deploy_diamond.deploy_diamond_V1()
+    return {
+        # the facets are deployed through it
+        "registry": {"deployer": get_create2_deployer()},
+        "transparent": {"admin": admin, "v1": v1, "proxy": proxy},
+        "uups": {"v1": uups_v1, "proxy": uups_proxy},
+        "beacon": {"v1": beacon_v1, "beacon": beacon, "proxy": beacon_proxy},
+        "diamond": {
+            "square_facet": square_facet,
+            "cut_facet": cut_facet,
+            "loupe_facet": loupe_facet,
+            "diamond": diamond,
+        },
+    }
+
+
+# deployed once per session, before the first snapshot of `isolation`
+@pytest.fixture(scope="session")
+def stacks():
+    # ignored on eth-tester, which can neither read nor seed the state, and where
+    # the stacks are deployed without launching a node anyway
+    chain_state_path = CHAIN_STATE_PATH if network.show_active() != NETWORK_ID else None
+    if chain_state_path:
+        saved = load_chain_state(chain_state_path)
+        if saved is not None:
+            return saved
+    deployed = deploy_stacks()
+    if chain_state_path:
+        save_chain_state(chain_state_path, deployed)
+    return deployed
+
+
+# TransparentUpgradeableProxy to LogicContractV1, managed by a ProxyAdmin
+@pytest.fixture(scope="session")
+def transparent(stacks):
+    stack = SimpleNamespace(**stacks["transparent"])
+    stack.logic = Contract.from_abi(
+        "LogicContractV1", stack.proxy.address, LogicContractV1.abi
+    )
+    return stack
+
+
+# ERC1967Proxy to LogicContractUUPSV1, initialized with 3
+@pytest.fixture(scope="session")
+def uups(stacks):
+    stack = SimpleNamespace(**stacks["uups"])
+    stack.logic = Contract.from_abi(
+        "LogicContractUUPSV1", stack.proxy.address, LogicContractUUPSV1.abi
+    )
+    return stack
+
+
+# BeaconProxy to an UpgradeableBeacon pointing to LogicContractBeaconV1
+@pytest.fixture(scope="session")
+def beacon(stacks):
+    stack = SimpleNamespace(**stacks["beacon"])
+    stack.logic = Contract.from_abi(
+        "LogicContractBeaconV1", stack.proxy.address, LogicContractBeaconV1.abi
+    )
+    return stack
+
+
+# Diamond with FacetSquareV1, DiamondCutFacet and DiamondLoupeFacet
+@pytest.fixture(scope="session")
+def diamond(stacks):
+    stack = SimpleNamespace(**stacks["diamond"])
+    stack.square = Contract.from_abi(
+        "FacetSquareV1", stack.diamond.address, FacetSquareV1.abi
+    )
+    stack.cut = Contract.from_abi(
+        "DiamondCutFacet", stack.diamond.address, DiamondCutFacet.abi
+    )
+    stack.loupe = Contract.from_abi(
+        "DiamondLoupeFacet", stack.diamond.address, DiamondLoupeFacet.abi
+    )
+    return stack
+
+
+# for the tests replaying transactions with `debug_traceTransaction`, that
+# eth-tester does not have
+@pytest.fixture
+def traces():
+    if not web3.supports_traces:
+        pytest.skip("the network has no debug_traceTransaction")
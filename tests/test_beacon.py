@@ -0,0 +1,88 @@
+import pytest
+from brownie import (
+    LogicContractBeaconV1,
+    LogicContractBeaconV2,
+    BeaconProxy,
+    UpgradeableBeacon,
+    Contract,
+    web3,
+)
+from eth_utils import to_checksum_address
+from scripts.helpful_scripts import get_account, encode_function_data
+from scripts.deploy_beacon import deploy_immutable_beacon_proxy
+
+pytestmark = pytest.mark.usefixtures("isolation")
+
+BEACON_SLOT = "0xa3f0ad74e5423aebfd80d3ef4346578335a9a72aeaee59ff6cb3582b35133d50"
+
+
+def deploy_beacon():
+    account = get_account()
+    logic_contract = LogicContractBeaconV1.deploy({"from": account})
+    beacon = UpgradeableBeacon.deploy(
+        logic_contract.address, {"from": account, "gas_limit": 1_000_000}
+    )
+    return logic_contract, beacon
+
+
+# test that the proxy delegates to the beacon implementation and follows its upgrades
+def test_immutable_beacon_proxy_follows_beacon():
+    account = get_account()
+    _, beacon = deploy_beacon()
+    proxy = deploy_immutable_beacon_proxy(beacon)
+    proxy_logic_contract = Contract.from_abi(
+        "LogicContractBeaconV1", proxy.address, LogicContractBeaconV1.abi
+    )
+
+    proxy_logic_contract.store(4, {"from": account})
+    assert proxy_logic_contract.retrieve() == 4
+    assert proxy_logic_contract.square(4) == 4
+
+    logic_contract_v2 = LogicContractBeaconV2.deploy({"from": account})
+    beacon.upgradeTo(logic_contract_v2.address, {"from": account})
+
+    assert proxy_logic_contract.retrieve() == 4
+    assert proxy_logic_contract.square(4) == 16
+
+
+# test that the beacon is still exposed through the EIP1967 slot
+def test_immutable_beacon_proxy_sets_beacon_slot():
+    _, beacon = deploy_beacon()
+    proxy = deploy_immutable_beacon_proxy(beacon)
+
+    assert proxy.tx.events["BeaconUpgraded"]["beacon"] == beacon.address
+    slot = web3.eth.get_storage_at(proxy.address, BEACON_SLOT)
+    assert to_checksum_address(slot[-20:]) == beacon.address
+
+
+def test_immutable_beacon_proxy_initializes():
+    logic_contract, beacon = deploy_beacon()
+    proxy = deploy_immutable_beacon_proxy(
+        beacon, encode_function_data(logic_contract.store, 9)
+    )
+    proxy_logic_contract = Contract.from_abi(
+        "LogicContractBeaconV1", proxy.address, LogicContractBeaconV1.abi
+    )
+    assert proxy_logic_contract.retrieve() == 9
+
+
+# test that a forwarded call is cheaper than through a BeaconProxy
+def test_immutable_beacon_proxy_is_cheaper():
+    account = get_account()
+    _, beacon = deploy_beacon()
+    proxy = BeaconProxy.deploy(
+        beacon.address,
+        encode_function_data(),
+        {"from": account, "gas_limit": 1_000_000},
+    )
+    immutable_proxy = deploy_immutable_beacon_proxy(beacon)
+
+    gas_used = []
+    for address in [proxy.address, immutable_proxy.address]:
+        proxy_logic_contract = Contract.from_abi(
+            "LogicContractBeaconV1", address, LogicContractBeaconV1.abi
+        )
+        tx = proxy_logic_contract.retrieve.transact({"from": account})
+        gas_used.append(tx.gas_used)
+
+    assert gas_used[1] < gas_used[0]
@@ -0,0 +1,83 @@
+import pytest
+from brownie import (
+    LogicContractBeaconV1,
+    LogicContractBeaconV2,
+    UpgradeableBeacon,
+    Contract,
+    accounts,
+    web3,
+)
+from scripts.helpful_scripts import get_account, encode_function_data
+from scripts.deploy_beacon import deploy_beacon_proxy_factory, create_beacon_proxies
+
+pytestmark = pytest.mark.usefixtures("isolation")
+
+
+def deploy_beacon():
+    account = get_account()
+    logic_contract = LogicContractBeaconV1.deploy({"from": account})
+    beacon = UpgradeableBeacon.deploy(
+        logic_contract.address, {"from": account, "gas_limit": 1_000_000}
+    )
+    return beacon
+
+
+# test that the clones delegate to the beacon implementation and follow its upgrades
+def test_clones_follow_beacon():
+    account = get_account()
+    beacon = deploy_beacon()
+    factory = deploy_beacon_proxy_factory(beacon)
+
+    tx = factory.createProxies(3, encode_function_data(), {"from": account})
+    proxies = [
+        Contract.from_abi(
+            "LogicContractBeaconV1", event["proxy"], LogicContractBeaconV1.abi
+        )
+        for event in tx.events["ProxyCreated"]
+    ]
+    assert len(proxies) == 3
+    # EIP1167 clones
+    assert len(web3.eth.get_code(proxies[0].address)) == 45
+
+    proxies[0].store(5, {"from": account})
+    assert proxies[0].retrieve() == 5
+    assert proxies[1].retrieve() == 0
+    assert proxies[0].square(5) == 5
+
+    logic_contract_v2 = LogicContractBeaconV2.deploy({"from": account})
+    beacon.upgradeTo(logic_contract_v2.address, {"from": account})
+    assert proxies[0].retrieve() == 5
+    assert proxies[1].square(5) == 25
+
+
+def test_deterministic_clones_are_initialized():
+    account = get_account()
+    beacon = deploy_beacon()
+    factory = deploy_beacon_proxy_factory(beacon)
+    salt = "0x" + "01" * 32
+    initializer_data = encode_function_data(LogicContractBeaconV1[-1].store, 7)
+
+    predicted = factory.predictProxyAddress(account, salt)
+    tx = factory.createProxyDeterministic(salt, initializer_data, {"from": account})
+    assert tx.events["ProxyCreated"]["proxy"] == predicted
+
+    proxy = Contract.from_abi(
+        "LogicContractBeaconV1", predicted, LogicContractBeaconV1.abi
+    )
+    assert proxy.retrieve() == 7
+
+    # the same salt can only be used once per account
+    with pytest.raises(Exception):
+        factory.createProxyDeterministic(salt, initializer_data, {"from": account})
+    assert factory.predictProxyAddress(accounts[1], salt) != predicted
+
+
+def test_create_beacon_proxies():
+    account = get_account()
+    beacon = deploy_beacon()
+    factory = deploy_beacon_proxy_factory(beacon)
+    salts = ["0x" + f"{i:064x}" for i in range(5)]
+
+    proxies = create_beacon_proxies(factory, 5, salts=salts)
+
+    assert proxies == [factory.predictProxyAddress(account, salt) for salt in salts]
@@ -0,0 +1,60 @@
+import pytest
+from brownie import (
+    LogicContractV1,
+    TransparentUpgradeableProxy,
+    ProxyAdmin,
+    Contract,
+)
+from scripts.helpful_scripts import get_account, encode_function_data
+from scripts.deploy_orchestrator import DeploymentPlan, Ref
+from scripts.deploy_transparent_upgradeable_proxy import deploy_proxies_V1
+
+pytestmark = pytest.mark.usefixtures("isolation")
+
+
+def test_plan_deploys_dependency_graph():
+    account = get_account()
+    nonce = account.nonce
+
+    plan = DeploymentPlan()
+    logic = plan.deploy("logic", LogicContractV1, 99)
+    admin = plan.deploy("admin", ProxyAdmin)
+    proxy = plan.deploy(
+        "proxy",
+        TransparentUpgradeableProxy,
+        logic,
+        admin,
+        encode_function_data(),
+        tx={"gas_limit": 1_000_000},
+    )
+    plan.transact("store", proxy, "store", 8, abi=LogicContractV1)
+    results = plan.execute(account)
+
+    # one transaction per step, each with its own nonce
+    assert account.nonce == nonce + 4
+    assert results["store"].status == 1
+    assert results["admin"].getProxyImplementation(results["proxy"]) == results["logic"]
+    proxy_logic_contract = Contract.from_abi(
+        "LogicContractV1", results["proxy"].address, LogicContractV1.abi
+    )
+    assert proxy_logic_contract.retrieve() == 8
+
+
+def test_plan_rejects_unknown_steps():
+    plan = DeploymentPlan()
+    plan.deploy("admin", ProxyAdmin)
+    with pytest.raises(ValueError):
+        plan.deploy("admin", ProxyAdmin)
+    with pytest.raises(ValueError):
+        plan.deploy(
+            "proxy", TransparentUpgradeableProxy, Ref("logic"), Ref("admin"), b""
+        )
+
+
+def test_deploy_proxies_V1():
+    admin, v1, proxies = deploy_proxies_V1(3)
+
+    assert len({proxy.address for proxy in proxies}) == 3
+    for proxy in proxies:
+        assert admin.getProxyImplementation(proxy) == v1
+        assert admin.getProxyAdmin(proxy) == admin
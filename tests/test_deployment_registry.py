@@ -0,0 +1,61 @@
+import pytest
+import eth_utils
+from brownie import FacetSquareV1, LogicContractV1, web3
+from scripts import deployment_registry
+from scripts.deployment_registry import (
+    SALT,
+    compute_address,
+    deploy_deterministic,
+    get_create2_deployer,
+    get_init_code,
+    load_registry,
+)
+
+pytestmark = pytest.mark.usefixtures("isolation")
+
+
+# test that the address only depends on the init code and matches the deployer
+def test_compute_address():
+    deployer = get_create2_deployer()
+    init_code_hash = eth_utils.keccak(get_init_code(LogicContractV1, 99))
+
+    address = compute_address(deployer, init_code_hash)
+    assert address == deployer.computeAddress(SALT, init_code_hash)
+    assert address != compute_address(
+        deployer, eth_utils.keccak(get_init_code(LogicContractV1, 98))
+    )
+
+
+# test that a contract is deployed once and reused afterwards
+def test_deploy_deterministic_reuses_code():
+    # already deployed by the `diamond` fixture, at the same address
+    facet = deploy_deterministic(FacetSquareV1)
+    assert len(web3.eth.get_code(facet.address)) > 0
+
+    block_number = web3.eth.block_number
+    assert deploy_deterministic(FacetSquareV1) == facet
+    # nothing was sent
+    assert web3.eth.block_number == block_number
+
+    # the constructor arguments are part of the key
+    logic_contract = deploy_deterministic(LogicContractV1, 99)
+    assert logic_contract.retrieve() == 99
+    assert deploy_deterministic(LogicContractV1, 7) != logic_contract
+
+
+# test that on a persistent network a recorded deployment is reused as is
+def test_deploy_deterministic_uses_registry(tmp_path, monkeypatch):
+    registry_path = tmp_path.joinpath("deployment_registry.json")
+    monkeypatch.setattr(deployment_registry, "LOCAL_BLOCKCHAIN_ENVIRONMENTS", [])
+    facet = deploy_deterministic(FacetSquareV1, registry_path=registry_path)
+    init_code_hash = eth_utils.keccak(get_init_code(FacetSquareV1))
+    assert load_registry(registry_path) == {
+        eth_utils.to_hex(init_code_hash): {
+            "contractName": "FacetSquareV1",
+            "address": facet.address,
+        }
+    }
+
+    # not even the deployer is looked up
+    monkeypatch.setattr(deployment_registry, "get_create2_deployer", None)
+    assert deploy_deterministic(FacetSquareV1, registry_path=registry_path) == facet
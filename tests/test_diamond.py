@@ -9,8 +9,16 @@ from brownie import (
     ZERO_ADDRESS,
 )
 from scripts.helpful_scripts import get_account
+from scripts.selector_registry import get_selector, get_selectors, to_selector
 from scripts.deploy_diamond import *
 
+pytestmark = pytest.mark.usefixtures("isolation")
+
+# `deploy_facet` deploys a facet bytecode once per chain: FacetSquareV1 and the cut
+# and loupe facets of these tests are the ones of the `diamond` fixture, not fresh
+# deployments. Only the diamonds are new, the checks go through them
+
+
 # test that the proxy delegate the call to the implementation
 def test_proxy_delegates_calls():
     # Deploy
@@ -18,8 +26,8 @@ def test_proxy_delegates_calls():
     square_facet = deploy_facet(FacetSquareV1)
 
     ## Proxy
-    func_selector_retrieve = Web3.keccak(text="retrieve()")[:4].hex()
-    func_selector_store = Web3.keccak(text="store(uint256)")[:4].hex()
+    func_selector_retrieve = get_selector("retrieve()")
+    func_selector_store = get_selector("store(uint256)")
     _diamondCut = [
         [square_facet.address, 0, [func_selector_retrieve]],
         [square_facet.address, 0, [func_selector_store]],
@@ -40,11 +48,11 @@ def test_add_function_via_CutDiamond():
     cutDiamond_facet = deploy_facet(DiamondCutFacet)
 
     ## Proxy
-    func_selector_retrieve = Web3.keccak(text="retrieve()")[:4].hex()
-    func_selector_store = Web3.keccak(text="store(uint256)")[:4].hex()
-    func_selector_diamondCut = Web3.keccak(
-        text="diamondCut((address,uint8,bytes4[])[],address,bytes)"
-    )[:4].hex()
+    func_selector_retrieve = get_selector("retrieve()")
+    func_selector_store = get_selector("store(uint256)")
+    func_selector_diamondCut = get_selector(
+        "diamondCut((address,uint8,bytes4[])[],address,bytes)"
+    )
     _diamondCut = [
         [square_facet.address, 0, [func_selector_retrieve]],
         [square_facet.address, 0, [func_selector_store]],
@@ -59,7 +67,7 @@ def test_add_function_via_CutDiamond():
         proxy.square(33, {"from": account})
 
     # add function
-    func_selector_square = Web3.keccak(text="square(uint256)")[:4].hex()
+    func_selector_square = get_selector("square(uint256)")
     _diamondCut = [
         [square_facet.address, 0, [func_selector_square]],
     ]
@@ -83,12 +91,12 @@ def test_update_function_via_CutDiamond():
     cutDiamond_facet = deploy_facet(DiamondCutFacet)
 
     ## Proxy
-    func_selector_retrieve = Web3.keccak(text="retrieve()")[:4].hex()
-    func_selector_store = Web3.keccak(text="store(uint256)")[:4].hex()
-    func_selector_square = Web3.keccak(text="square(uint256)")[:4].hex()
-    func_selector_diamondCut = Web3.keccak(
-        text="diamondCut((address,uint8,bytes4[])[],address,bytes)"
-    )[:4].hex()
+    func_selector_retrieve = get_selector("retrieve()")
+    func_selector_store = get_selector("store(uint256)")
+    func_selector_square = get_selector("square(uint256)")
+    func_selector_diamondCut = get_selector(
+        "diamondCut((address,uint8,bytes4[])[],address,bytes)"
+    )
     _diamondCut = [
         [square_facet.address, 0, [func_selector_retrieve]],
         [square_facet.address, 0, [func_selector_store]],
@@ -103,7 +111,7 @@ def test_update_function_via_CutDiamond():
     assert proxy.square(33, {"from": account}) == 33
 
     # update function
-    func_selector_square = Web3.keccak(text="square(uint256)")[:4].hex()
+    func_selector_square = get_selector("square(uint256)")
     _diamondCut = [
         [square_facet_2.address, 1, [func_selector_square]],
     ]
@@ -126,12 +134,12 @@ def test_remove_function_via_CutDiamond():
     cutDiamond_facet = deploy_facet(DiamondCutFacet)
 
     ## Proxy
-    func_selector_retrieve = Web3.keccak(text="retrieve()")[:4].hex()
-    func_selector_store = Web3.keccak(text="store(uint256)")[:4].hex()
-    func_selector_square = Web3.keccak(text="square(uint256)")[:4].hex()
-    func_selector_diamondCut = Web3.keccak(
-        text="diamondCut((address,uint8,bytes4[])[],address,bytes)"
-    )[:4].hex()
+    func_selector_retrieve = get_selector("retrieve()")
+    func_selector_store = get_selector("store(uint256)")
+    func_selector_square = get_selector("square(uint256)")
+    func_selector_diamondCut = get_selector(
+        "diamondCut((address,uint8,bytes4[])[],address,bytes)"
+    )
     _diamondCut = [
         [square_facet.address, 0, [func_selector_retrieve]],
         [square_facet.address, 0, [func_selector_store]],
@@ -146,7 +154,7 @@ def test_remove_function_via_CutDiamond():
     assert proxy.square(33, {"from": account}) == 33
 
     # remove function
-    func_selector_square = Web3.keccak(text="square(uint256)")[:4].hex()
+    func_selector_square = get_selector("square(uint256)")
     _diamondCut = [
         [ZERO_ADDRESS, 2, [func_selector_square]],
     ]
@@ -171,19 +179,19 @@ def test_DiamondLoupeFaucet():
     loupe_facet = deploy_facet(DiamondLoupeFacet)
 
     ## Proxy
-    func_selector_retrieve = Web3.keccak(text="retrieve()")[:4].hex()
-    func_selector_store = Web3.keccak(text="store(uint256)")[:4].hex()
-    func_selector_square = Web3.keccak(text="square(uint256)")[:4].hex()
-    func_selector_diamondCut = Web3.keccak(
-        text="diamondCut((address,uint8,bytes4[])[],address,bytes)"
-    )[:4].hex()
-
-    func_selector_facets = Web3.keccak(text="facets()")[:4].hex()
-    func_selector_facetFunctionSelectors = Web3.keccak(
-        text="facetFunctionSelectors(address)"
-    )[:4].hex()
-    func_selector_facetAddresses = Web3.keccak(text="facetAddresses()")[:4].hex()
-    func_selector_facetAddress = Web3.keccak(text="facetAddress(bytes4)")[:4].hex()
+    func_selector_retrieve = get_selector("retrieve()")
+    func_selector_store = get_selector("store(uint256)")
+    func_selector_square = get_selector("square(uint256)")
+    func_selector_diamondCut = get_selector(
+        "diamondCut((address,uint8,bytes4[])[],address,bytes)"
+    )
+
+    func_selector_facets = get_selector("facets()")
+    func_selector_facetFunctionSelectors = get_selector(
+        "facetFunctionSelectors(address)"
+    )
+    func_selector_facetAddresses = get_selector("facetAddresses()")
+    func_selector_facetAddress = get_selector("facetAddress(bytes4)")
     _diamondCut = [
         [square_facet.address, 0, [func_selector_retrieve]],
         [square_facet.address, 0, [func_selector_store]],
@@ -232,12 +240,12 @@ def test_DiamondLoupeFaucet():
 
     assert proxy.facetAddress(func_selector_square) == square_facet.address
     assert (
-        proxy.facetAddress(Web3.keccak(text="missing_function(uint128)")[:4].hex())
+        proxy.facetAddress(get_selector("missing_function(uint128)"))
         == ZERO_ADDRESS
     )
 
     # remove square function
-    func_selector_square = Web3.keccak(text="square(uint256)")[:4].hex()
+    func_selector_square = get_selector("square(uint256)")
     _diamondCut = [
         [ZERO_ADDRESS, 2, [func_selector_square]],
     ]
@@ -251,4 +259,158 @@ def test_DiamondLoupeFaucet():
     ]
 
 
+# test that the loupe follows selectors moved between facets and whole facets removed
+def test_remove_facet_via_CutDiamond():
+    # Deploy
+    account = get_account()
+    square_facet = deploy_facet(FacetSquareV1)
+    square_facet_2 = deploy_facet(FacetSquareV2)
+    cutDiamond_facet = deploy_facet(DiamondCutFacet)
+    loupe_facet = deploy_facet(DiamondLoupeFacet)
+
+    ## Proxy
+    func_selector_retrieve = get_selector("retrieve()")
+    func_selector_store = get_selector("store(uint256)")
+    func_selector_square = get_selector("square(uint256)")
+    _diamondCut = [
+        [
+            square_facet.address,
+            0,
+            [func_selector_retrieve, func_selector_store, func_selector_square],
+        ],
+        [cutDiamond_facet.address, 0, get_selectors(DiamondCutFacet)],
+        [loupe_facet.address, 0, get_selectors(DiamondLoupeFacet)],
+    ]
+    _arg = [account, ZERO_ADDRESS, ""]
+    diamond = deploy_proxy(_arg, _diamondCut)
+
+    proxy = Contract.from_abi(
+        "DiamondLoupeFacet", diamond.address, DiamondLoupeFacet.abi
+    )
+    proxy_square = Contract.from_abi(
+        "FacetSquareV1", diamond.address, FacetSquareV1.abi
+    )
+
+    # move retrieve to V2, the selectors left on V1 are swapped
+    diamondCut(diamond, [[square_facet_2.address, 1, [func_selector_retrieve]]])
+    assert proxy.facetFunctionSelectors(square_facet.address) == [
+        func_selector_square,
+        func_selector_store,
+    ]
+    assert proxy.facets()[-1] == [square_facet_2.address, [func_selector_retrieve]]
+
+    # remove V1 as a whole
+    tx = diamondCut(diamond, [[square_facet.address, 2, []]])
+    assert tx.events["DiamondCut"]["_diamondCut"][0] == [square_facet.address, 2, []]
+    assert proxy.facetFunctionSelectors(square_facet.address) == []
+    assert square_facet.address not in proxy.facetAddresses()
+    assert len(proxy.facetAddresses()) == 3
+    assert proxy.facetAddress(func_selector_square) == ZERO_ADDRESS
+    with reverts():
+        proxy_square.square(3, {"from": account})
+    # retrieve is still routed to V2
+    assert proxy_square.retrieve() == 0
+
+    # a facet can only be removed once
+    with reverts():
+        diamondCut(diamond, [[square_facet.address, 2, []]])
+
+
+# test add, replace and remove over several packed selector slots
+def test_cut_many_selectors(diamond):
+    # new facets, not yet known by the diamond
+    account = get_account()
+    square_facet = FacetSquareV1.deploy({"from": account})
+    square_facet_2 = FacetSquareV2.deploy({"from": account})
+    proxy = diamond.loupe
+
+    # 8 selectors per slot, two cuts to start in the middle of a slot
+    selectors = [to_selector(f"function{i}()") for i in range(21)]
+    diamondCut(diamond.diamond, [[square_facet.address, 0, selectors[:5]]])
+    diamondCut(diamond.diamond, [[square_facet.address, 0, selectors[5:]]])
+    assert proxy.facetFunctionSelectors(square_facet.address) == selectors
+
+    removed = selectors[0:21:4]
+    replaced = [selectors[i] for i in [19, 2, 7, 10]]
+    diamondCut(diamond.diamond, [[ZERO_ADDRESS, 2, removed]])
+    diamondCut(diamond.diamond, [[square_facet_2.address, 1, replaced]])
+
+    left = [i for i in selectors if i not in removed and i not in replaced]
+    assert sorted(proxy.facetFunctionSelectors(square_facet.address)) == sorted(left)
+    assert proxy.facetFunctionSelectors(square_facet_2.address) == replaced
+    for selector in left:
+        assert proxy.facetAddress(selector) == square_facet.address
+    for selector in removed:
+        assert proxy.facetAddress(selector) == ZERO_ADDRESS
+
+    # empty the facet one selector at a time
+    diamondCut(diamond.diamond, [[ZERO_ADDRESS, 2, left]])
+    assert square_facet.address not in proxy.facetAddresses()
+    diamondCut(diamond.diamond, [[square_facet.address, 0, removed]])
+    assert proxy.facetFunctionSelectors(square_facet.address) == removed
+
+
+# test that one cut runs several initializations, in order
+def test_multi_init(diamond):
+    square_facet_2 = deploy_facet(FacetSquareV2)
+    store = diamond.square_facet.store.encode_input
+
+    upgrade_diamond(
+        diamond.diamond,
+        {square_facet_2: [get_selector("square(uint256)")]},
+        inits=[(diamond.square_facet, store(5)), (square_facet_2, store(7))],
+    )
+    assert diamond.loupe.facetAddress(get_selector("square(uint256)")) == (
+        square_facet_2.address
+    )
+    assert diamond.square.retrieve() == 7
+
+
+# test that a reverting initialization reverts the whole cut, with its index
+def test_multi_init_reverts(diamond):
+    store = diamond.square_facet.store.encode_input
+    multi_init = deploy_multi_init()
+    _init, _calldata = encode_multi_init(
+        multi_init,
+        [
+            (diamond.square_facet, store(5)),
+            # not a function of the facet
+            (diamond.square_facet, to_selector("function0()")),
+        ],
+    )
+
+    with reverts(revert_pattern=r"MultiInitReverted: 1, .*"):
+        diamondCut(diamond.diamond, [], _init, _calldata)
+    assert diamond.square.retrieve() == 0
+
+    _calldata = multi_init.multiInit.encode_input([diamond.square_facet], [])
+    with reverts(revert_pattern=r"AddressAndCalldataLengthDoNotMatch: 1, 0"):
+        diamondCut(diamond.diamond, [], multi_init, _calldata)
+
+
+# test that the facets share the AppStorage, and its packed update counters
+def test_app_storage(diamond):
+    account = get_account()
+    square_facet_2 = deploy_facet(FacetSquareV2)
+    diamond.square.store(3, {"from": account})
+    tx = diamond.square.store(4, {"from": account})
+
+    diamondCut(
+        diamond.diamond,
+        [[square_facet_2.address, 0, [get_selector("lastUpdate()")]]],
+    )
+    proxy = Contract.from_abi(
+        "FacetSquareV2", diamond.diamond.address, FacetSquareV2.abi
+    )
+    assert proxy.lastUpdate() == (tx.timestamp, 2)
+    assert proxy.retrieve() == 4
+
+    # the value is packed in 128 bits, store() takes a uint256 but reverts above
+    diamond.square.store(2**128 - 1, {"from": account})
+    assert proxy.retrieve() == 2**128 - 1
+    with reverts(revert_pattern=rf"ValueDoesNotFit: {2**128}"):
+        diamond.square.store(2**128, {"from": account})
+    assert proxy.retrieve() == 2**128 - 1
+
+
 ## test diamondCut( hash collision)
@@ -0,0 +1,133 @@
+import pytest
+from brownie import (
+    FacetSquareV1,
+    FacetSquareV2,
+    DiamondCutFacet,
+    DiamondLoupeFacet,
+    Contract,
+    ZERO_ADDRESS,
+)
+from scripts.helpful_scripts import get_account
+from scripts.selector_registry import get_selector, get_selectors
+from scripts.deploy_diamond import deploy_facet, deploy_proxy, upgrade_diamond
+from scripts.diamond_cut_planner import (
+    ADD,
+    REPLACE,
+    REMOVE,
+    SelectorCollisionError,
+    plan_diamond_cut,
+    plan_diamond_upgrade,
+    read_routing,
+)
+
+FACET_1 = "0x0000000000000000000000000000000000000001"
+FACET_2 = "0x0000000000000000000000000000000000000002"
+
+
+def test_plan_groups_selectors_per_facet():
+    _diamondCut = plan_diamond_cut(
+        {FACET_1: ["0x2e64cec1", "0x6057361d"], FACET_2: ["0x1f931c1c"]}
+    )
+    assert _diamondCut == [
+        [FACET_1, ADD, ["0x2e64cec1", "0x6057361d"]],
+        [FACET_2, ADD, ["0x1f931c1c"]],
+    ]
+
+
+def test_plan_only_contains_changes():
+    current = {"0x2e64cec1": FACET_1, "0x6057361d": FACET_1, "0xd27b3841": FACET_1}
+    _diamondCut = plan_diamond_cut(
+        {FACET_1: ["0x2e64cec1", "0x6057361d"], FACET_2: ["0xd27b3841"]}, current
+    )
+    assert _diamondCut == [[FACET_2, REPLACE, ["0xd27b3841"]]]
+
+    assert plan_diamond_cut({FACET_1: ["0x2e64cec1"]}, current) == []
+    assert plan_diamond_cut(
+        {FACET_1: ["0x2e64cec1"]}, current, remove_missing=True, keep=["0xd27b3841"]
+    ) == [[ZERO_ADDRESS, REMOVE, ["0x6057361d"]]]
+
+
+def test_plan_removes_whole_facets():
+    current = {"0x2e64cec1": FACET_1, "0x6057361d": FACET_1, "0xd27b3841": FACET_2}
+    # FACET_1 loses every selector, FACET_2 keeps one
+    _diamondCut = plan_diamond_cut(
+        {FACET_2: ["0xd27b3841"]}, current, remove_missing=True, remove_facets=True
+    )
+    assert _diamondCut == [[FACET_1, REMOVE, []]]
+
+    # replaced selectors are not removed with their old facet
+    _diamondCut = plan_diamond_cut(
+        {FACET_2: ["0x2e64cec1", "0xd27b3841"]},
+        current,
+        remove_missing=True,
+        remove_facets=True,
+    )
+    assert _diamondCut == [
+        [FACET_2, REPLACE, ["0x2e64cec1"]],
+        [FACET_1, REMOVE, []],
+    ]
+
+
+def test_plan_keeps_facets_receiving_selectors():
+    # FACET_1 loses its selector but gets the one of FACET_2
+    current = {"0x2e64cec1": FACET_1, "0x6057361d": FACET_2}
+    _diamondCut = plan_diamond_cut(
+        {FACET_1: ["0x6057361d"]}, current, remove_missing=True, remove_facets=True
+    )
+    assert _diamondCut == [
+        [FACET_1, REPLACE, ["0x6057361d"]],
+        [ZERO_ADDRESS, REMOVE, ["0x2e64cec1"]],
+    ]
+
+    # FACET_1 loses its selector but gets a new one
+    current = {"0x2e64cec1": FACET_1}
+    _diamondCut = plan_diamond_cut(
+        {FACET_1: ["0xd27b3841"]}, current, remove_missing=True, remove_facets=True
+    )
+    assert _diamondCut == [
+        [FACET_1, ADD, ["0xd27b3841"]],
+        [ZERO_ADDRESS, REMOVE, ["0x2e64cec1"]],
+    ]
+
+
+def test_plan_flags_collisions():
+    with pytest.raises(SelectorCollisionError) as exc:
+        plan_diamond_cut({FACET_1: ["0x2e64cec1"], FACET_2: ["0x2e64cec1"]})
+    assert exc.value.collisions == {"0x2e64cec1": [FACET_1, FACET_2]}
+
+
+@pytest.mark.usefixtures("isolation")
+def test_upgrade_from_loupe():
+    # Deploy
+    account = get_account()
+    square_facet = deploy_facet(FacetSquareV1)
+    square_facet_2 = deploy_facet(FacetSquareV2)
+    cutDiamond_facet = deploy_facet(DiamondCutFacet)
+    loupe_facet = deploy_facet(DiamondLoupeFacet)
+
+    _diamondCut = plan_diamond_cut(
+        {
+            square_facet: get_selectors(FacetSquareV1),
+            cutDiamond_facet: get_selectors(DiamondCutFacet),
+            loupe_facet: get_selectors(DiamondLoupeFacet),
+        }
+    )
+    # a single FacetCut per facet
+    assert len(_diamondCut) == 3
+    diamond = deploy_proxy([account, ZERO_ADDRESS, ""], _diamondCut)
+    proxy = Contract.from_abi("FacetSquareV1", diamond.address, FacetSquareV1.abi)
+    assert proxy.square(3) == 3
+
+    routing = read_routing(diamond)
+    assert routing[get_selector("square(uint256)")] == square_facet.address
+
+    target = {square_facet_2: [get_selector("square(uint256)")]}
+    assert plan_diamond_upgrade(diamond, target) == [
+        [square_facet_2.address, REPLACE, [get_selector("square(uint256)")]]
+    ]
+    upgrade_diamond(diamond, target)
+    assert proxy.square(3) == 9
+
+    # nothing left to do
+    assert plan_diamond_upgrade(diamond, target) == []
+    assert upgrade_diamond(diamond, target) is None
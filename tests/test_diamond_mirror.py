@@ -0,0 +1,83 @@
+import pytest
+from brownie import (
+    FacetSquareV1,
+    FacetSquareV2,
+    DiamondCutFacet,
+    DiamondLoupeFacet,
+    ZERO_ADDRESS,
+)
+from scripts.helpful_scripts import get_account
+from scripts.selector_registry import get_selector, get_selectors
+from scripts.deploy_diamond import deploy_facet, deploy_proxy, diamondCut
+from scripts.diamond_cut_planner import ADD, REPLACE, REMOVE
+from scripts.diamond_mirror import DiamondMirror
+
+FACET_1 = "0x0000000000000000000000000000000000000001"
+FACET_2 = "0x0000000000000000000000000000000000000002"
+DIAMOND = "0x0000000000000000000000000000000000000003"
+
+
+def test_apply_cut(tmp_path):
+    mirror = DiamondMirror(DIAMOND, checkpoint_path=tmp_path.joinpath("mirror.json"))
+    mirror.apply_cut(
+        [
+            [FACET_1, ADD, ["0x2e64cec1", "0x6057361d"]],
+            [FACET_2, ADD, ["0x1f931c1c"]],
+        ]
+    )
+    mirror.apply_cut([[FACET_2, REPLACE, ["0x2e64cec1"]]])
+    assert mirror.facet_address("0x2e64cec1") == FACET_2
+    assert mirror.facet_selectors(FACET_2) == ["0x1f931c1c", "0x2e64cec1"]
+
+    mirror.apply_cut([[ZERO_ADDRESS, REMOVE, ["0x6057361d"]]])
+    assert mirror.facet_address("0x6057361d") == ZERO_ADDRESS
+    assert mirror.facet_addresses() == [FACET_2]
+
+    # whole facet removal
+    mirror.apply_cut([[FACET_2, REMOVE, []]])
+    assert mirror.routing == {}
+
+
+@pytest.mark.usefixtures("isolation")
+def test_mirror_follows_diamond(tmp_path):
+    # Deploy
+    account = get_account()
+    square_facet = deploy_facet(FacetSquareV1)
+    square_facet_2 = deploy_facet(FacetSquareV2)
+    cutDiamond_facet = deploy_facet(DiamondCutFacet)
+    loupe_facet = deploy_facet(DiamondLoupeFacet)
+    _diamondCut = [
+        [square_facet.address, ADD, get_selectors(FacetSquareV1)],
+        [cutDiamond_facet.address, ADD, get_selectors(DiamondCutFacet)],
+        [loupe_facet.address, ADD, get_selectors(DiamondLoupeFacet)],
+    ]
+    diamond = deploy_proxy([account, ZERO_ADDRESS, ""], _diamondCut)
+    checkpoint_path = tmp_path.joinpath("mirror.json")
+
+    mirror = DiamondMirror(
+        diamond, start_block=diamond.tx.block_number, checkpoint_path=checkpoint_path
+    )
+    # the constructor cut
+    assert mirror.sync() == 1
+    assert mirror.verify() == {}
+    assert mirror.facet_address(get_selector("square(uint256)")) == square_facet
+
+    diamondCut(
+        diamond, [[square_facet_2.address, REPLACE, [get_selector("square(uint256)")]]]
+    )
+
+    # a new mirror starts from the checkpoint and only applies the new cut
+    mirror = DiamondMirror(diamond, checkpoint_path=checkpoint_path)
+    assert mirror.sync() == 1
+    assert mirror.verify() == {}
+    assert mirror.facet_address(get_selector("square(uint256)")) == square_facet_2
+    assert mirror.sync() == 0
+
+    # verify reports a mirror that is behind
+    diamondCut(diamond, [[square_facet.address, REMOVE, []]])
+    assert mirror.verify() == {
+        get_selector("retrieve()"): (square_facet.address, ZERO_ADDRESS),
+        get_selector("store(uint256)"): (square_facet.address, ZERO_ADDRESS),
+    }
+    mirror.sync()
+    assert mirror.verify() == {}
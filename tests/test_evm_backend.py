@@ -0,0 +1,66 @@
+import pytest
+from brownie import LogicContractUUPSV1, LogicContractUUPSV2
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.exceptions import ContractLogicError, Web3RPCError
+from scripts.evm_backend import DirectProvider, EVMBackend, to_json_rpc
+from scripts.minimal_proxy import get_init_code
+from scripts.proxy_slots import IMPLEMENTATION_SLOT
+
+
+# test that the results of eth-tester are encoded as JSON-RPC quantities and data
+def test_to_json_rpc():
+    block = {
+        "number": 3,
+        "hash": HexBytes("0x12ab"),
+        "transactions": ["0x34cd"],
+        "withdrawals": (),
+        "logs_bloom": b"\x00\x01",
+    }
+    assert to_json_rpc(block) == {
+        "number": "0x3",
+        "hash": "0x12ab",
+        "transactions": ["0x34cd"],
+        "withdrawals": [],
+        "logs_bloom": "0x0001",
+    }
+    assert to_json_rpc(True) is True
+    assert to_json_rpc(None) is None
+    assert to_json_rpc(0) == "0x0"
+
+
+# test that a UUPS proxy is deployed and upgraded on a backend of its own
+def test_backend_upgrades_proxy():
+    pytest.importorskip("eth_tester")
+    w3 = Web3(DirectProvider(EVMBackend()))
+    owner, other = w3.eth.accounts[:2]
+
+    def deploy(data, abi):
+        tx = w3.eth.send_transaction({"from": owner, "data": data})
+        address = w3.eth.get_transaction_receipt(tx)["contractAddress"]
+        return w3.eth.contract(address, abi=abi)
+
+    logic_v1 = deploy(LogicContractUUPSV1.bytecode, LogicContractUUPSV1.abi)
+    logic_v2 = deploy(LogicContractUUPSV2.bytecode, LogicContractUUPSV2.abi)
+    proxy = deploy(
+        get_init_code(logic_v1, logic_v1.encode_abi("initialize", [3])),
+        LogicContractUUPSV1.abi,
+    )
+    assert proxy.functions.retrieve().call() == 3
+    assert proxy.functions.square(5).call() == 5
+
+    # reverted calls and transactions keep their reason
+    upgrade = proxy.functions.upgradeTo(logic_v2.address)
+    with pytest.raises(ContractLogicError, match="caller is not the owner"):
+        upgrade.call({"from": other})
+    # sent anyway without a gas estimation
+    with pytest.raises(Web3RPCError, match="revert"):
+        upgrade.transact({"from": other, "gas": 100_000})
+
+    upgrade.transact({"from": owner})
+    slot = w3.eth.get_storage_at(proxy.address, int(IMPLEMENTATION_SLOT, 16))
+    assert slot[-20:] == HexBytes(logic_v2.address)
+    proxy = w3.eth.contract(proxy.address, abi=LogicContractUUPSV2.abi)
+    # storage remains
+    assert proxy.functions.retrieve().call() == 3
+    assert proxy.functions.square(5).call() == 25
@@ -0,0 +1,26 @@
+import pytest
+from scripts.benchmark_fleet import chart_data, run_fleet_benchmarks
+
+pytestmark = pytest.mark.usefixtures("isolation")
+
+
+# test that each pattern upgrades its fleet in the expected number of transactions
+def test_fleet_benchmark():
+    results = run_fleet_benchmarks(sizes=(1, 3))
+
+    # one batch for the ProxyAdmin, one per proxy for UUPS, the beacon only, for
+    # BeaconProxy instances as for clones
+    assert [results["transparent"][n]["upgrade_txs"] for n in ("1", "3")] == [1, 1]
+    assert [results["uups"][n]["upgrade_txs"] for n in ("1", "3")] == [1, 3]
+    assert [results["beacon"][n]["upgrade_txs"] for n in ("1", "3")] == [1, 1]
+    assert [results["beacon_clones"][n]["upgrade_txs"] for n in ("1", "3")] == [1, 1]
+    assert (
+        results["beacon"]["3"]["upgrade_gas"] == results["beacon"]["1"]["upgrade_gas"]
+    )
+    assert results["uups"]["3"]["upgrade_gas"] > results["uups"]["1"]["upgrade_gas"]
+    for fleets in results.values():
+        assert fleets["1"]["overhead"]["retrieve"] > 0
+
+    chart = chart_data(results)
+    assert chart["sizes"] == [1, 3]
+    assert chart["series"]["uups"]["upgrade_txs"] == [1, 3]
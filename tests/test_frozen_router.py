@@ -0,0 +1,88 @@
+import pytest
+from brownie import (
+    FacetSquareV1,
+    FacetSquareV2,
+    DiamondCutFacet,
+    Contract,
+    reverts,
+    ZERO_ADDRESS,
+)
+from scripts.helpful_scripts import get_account
+from scripts.selector_registry import get_selector, get_selectors, to_selector
+from scripts.deploy_diamond import deploy_facet, diamondCut
+from scripts.diamond_cut_planner import ADD, REPLACE
+from scripts.frozen_router import (
+    LEAF_SIZE,
+    compile_router,
+    deploy_router,
+    generate_router,
+)
+
+
+def test_generate_router():
+    selectors = [to_selector(f"function{i}()") for i in range(LEAF_SIZE * 4)]
+    source = generate_router([selectors[:3], selectors[3:]], "Router")
+
+    assert "contract Router {" in source
+    assert "address[2] memory _frozenFacets" in source
+    for selector in selectors[:3]:
+        assert f"if (selector == {selector}) return _facet0;" in source
+    for selector in selectors[3:]:
+        assert f"if (selector == {selector}) return _facet1;" in source
+    assert "if (selector < 0x" in source
+    assert "revert CannotCutFrozenFunction(selectors[j]);" in source
+    # the constructor checks its cut without reading the immutables
+    assert "_checkCut(_diamondCut);" in source
+    for selector in selectors:
+        assert f"if (selector == {selector}) return true;" in source
+
+    with pytest.raises(ValueError):
+        generate_router([selectors[:2], selectors[1:3]])
+
+
+# test that frozen selectors are routed by the bytecode and the others by the storage
+@pytest.mark.usefixtures("isolation")
+def test_frozen_router():
+    account = get_account()
+    square_facet = deploy_facet(FacetSquareV1)
+    square_facet_2 = deploy_facet(FacetSquareV2)
+    cutDiamond_facet = deploy_facet(DiamondCutFacet)
+    frozen = [get_selector("retrieve()"), get_selector("square(uint256)")]
+    container = compile_router([frozen])
+    # a frozen selector can not be routed by the storage from the start either
+    with reverts():
+        deploy_router(
+            container,
+            [square_facet],
+            [account, ZERO_ADDRESS, ""],
+            [[square_facet.address, ADD, [frozen[0]]]],
+        )
+    router = deploy_router(
+        container,
+        [square_facet],
+        [account, ZERO_ADDRESS, ""],
+        [
+            [square_facet.address, ADD, [get_selector("store(uint256)")]],
+            [cutDiamond_facet.address, ADD, get_selectors(DiamondCutFacet)],
+        ],
+    )
+    proxy = Contract.from_abi("FacetSquareV1", router.address, FacetSquareV1.abi)
+
+    # store() is found in storage, retrieve() in the bytecode
+    proxy.store(5, {"from": account})
+    assert proxy.retrieve() == 5
+    assert proxy.square(5) == 5
+
+    # the frozen selectors can not be cut, the others can
+    with reverts():
+        diamondCut(router, [[square_facet_2.address, ADD, [frozen[1]]]])
+    diamondCut(
+        router,
+        [[square_facet_2.address, REPLACE, [get_selector("store(uint256)")]]],
+    )
+    proxy.store(6, {"from": account})
+    assert proxy.retrieve() == 6
+    assert proxy.square(5) == 5
+
+    with reverts():
+        account.transfer(router, 0, data=to_selector("missing()"))
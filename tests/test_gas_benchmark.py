@@ -0,0 +1,44 @@
+import pytest
+from scripts.benchmark_gas import (
+    compare_results,
+    find_regressions,
+    load_snapshot,
+    run_benchmarks,
+)
+
+
+def test_find_regressions():
+    snapshot = {"uups": {"calls": {"store": 30_000}, "overhead": {"store": 3_000}}}
+
+    results = {"uups": {"calls": {"store": 30_200}, "overhead": {"store": 3_200}}}
+    assert find_regressions(results, snapshot) == {}
+
+    results = {"uups": {"calls": {"store": 30_400}, "overhead": {"store": 3_400}}}
+    assert find_regressions(results, snapshot) == {
+        "uups.calls.store": (30_000, 30_400),
+        "uups.overhead.store": (3_000, 3_400),
+    }
+
+
+# test that the numbers measured before and after a change are paired by name
+def test_compare_results():
+    before = {"uups": {"deploy": 300_000, "calls": {"store": 30_000}}}
+    results = {
+        "uups": {"deploy": 250_000, "calls": {"store": 30_000}},
+        "uups_minimal": {"deploy": 90_000},
+    }
+    assert compare_results(results, before) == {
+        "uups.deploy": (300_000, 250_000),
+        "uups.calls.store": (30_000, 30_000),
+    }
+
+
+# fails when a change makes a proxy pattern more expensive than the committed
+# snapshot, or when there is no snapshot to compare with
+@pytest.mark.usefixtures("isolation")
+def test_no_gas_regression():
+    snapshot = load_snapshot()
+    assert (
+        snapshot is not None
+    ), "no snapshot, run `brownie run scripts/benchmark_gas.py update_snapshot`"
+    assert find_regressions(run_benchmarks(), snapshot) == {}
@@ -0,0 +1,42 @@
+import pytest
+from scripts.helpful_scripts import get_account
+from scripts.gas_profiler import _step_costs, profile_transaction, summarize
+
+
+def step(depth, gas, gas_cost, op="PUSH1"):
+    return {"depth": depth, "gas": gas, "gasCost": gas_cost, "op": op}
+
+
+# test that the gas of a call excludes the gas used by the frame it opened
+def test_step_costs():
+    trace = [
+        step(0, 1000, 3),
+        step(0, 997, 900, "DELEGATECALL"),
+        step(1, 900, 20, "SSTORE"),
+        step(1, 880, 2, "STATICCALL"),
+        step(2, 800, 5),
+        step(2, 795, 0, "RETURN"),
+        step(1, 870, 0, "STOP"),
+        step(0, 850, 0, "RETURN"),
+    ]
+    assert _step_costs(trace) == [3, 117, 20, 5, 5, 0, 0, 0]
+
+
+# test that the gas of a proxied call is split between the proxy and the logic contract
+@pytest.mark.usefixtures("isolation")
+def test_profile_transparent_proxy(transparent, traces):
+    account = get_account()
+    transparent.logic.store(1, {"from": account})
+    tx = transparent.logic.store(2, {"from": account})
+
+    stacks = profile_transaction(tx)
+    assert sum(stacks.values()) == tx.gas_used
+    delegated = [stack for stack in stacks if "<DELEGATECALL>;" in stack]
+    assert delegated
+    assert all(
+        stack.split("<DELEGATECALL>;")[1].startswith("LogicContractV1.")
+        for stack in delegated
+    )
+    functions = {fn for fn, _, _ in summarize(stacks)}
+    assert "LogicContractV1.store" in functions
+    assert any(fn.startswith("TransparentUpgradeableProxy.") for fn in functions)
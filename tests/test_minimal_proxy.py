@@ -0,0 +1,116 @@
+import pytest
+from brownie import LogicContractUUPSV2, Contract, accounts, reverts, web3
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.exceptions import ContractLogicError, Web3RPCError
+from scripts.evm_backend import DirectProvider, EVMBackend
+from scripts.helpful_scripts import get_account
+from scripts.proxy_slots import IMPLEMENTATION_SLOT
+from scripts.minimal_proxy import (
+    RUNTIME_CODE,
+    UPGRADED_TOPIC,
+    get_init_code,
+    deploy_minimal_proxy,
+)
+from scripts.deploy_uups import deploy_minimal_proxy_V1
+
+
+# test that the init code ends with the runtime code and the initializer call
+def test_get_init_code():
+    implementation = "0x" + "12" * 20
+    assert get_init_code(implementation).endswith(RUNTIME_CODE)
+    assert get_init_code(implementation, "0x1234").endswith(
+        RUNTIME_CODE + bytes.fromhex("1234")
+    )
+    assert bytes.fromhex("12" * 20) in get_init_code(implementation)
+
+
+# an implementation without solc: a call without data returns slot 0, a word is
+# stored in it, and a zero word reverts with 0xdead
+STORE_CODE = b"".join(
+    [
+        # if iszero(calldatasize()) jump to 0x11
+        bytes.fromhex("3615601157"),
+        # if iszero(calldataload(0)) jump to 0x1d
+        bytes.fromhex("6000358015601d57"),
+        # sstore(0, calldataload(0)) stop()
+        bytes.fromhex("60005500"),
+        # mstore(0, sload(0)) return(0, 32)
+        bytes.fromhex("5b60005460005260206000f3"),
+        # mstore(0, 0xdead) revert(0, 32)
+        bytes.fromhex("5b61dead60005260206000fd"),
+    ]
+)
+# return(0, codecopy(0, 11, len(STORE_CODE)))
+DEPLOY_CODE = bytes.fromhex(f"60{len(STORE_CODE):02x}80600b6000396000f3")
+
+
+# test that the bytecode of the minimal proxy runs on py-evm, without a node
+def test_minimal_proxy_runs_on_py_evm():
+    pytest.importorskip("eth_tester")
+    w3 = Web3(DirectProvider(EVMBackend()))
+    account = w3.eth.accounts[0]
+
+    def deploy(data):
+        tx = w3.eth.send_transaction({"from": account, "data": data, "gas": 1_000_000})
+        return w3.eth.get_transaction_receipt(tx)
+
+    implementation = deploy(DEPLOY_CODE + STORE_CODE)["contractAddress"]
+    receipt = deploy(get_init_code(implementation, (7).to_bytes(32, "big")))
+    proxy = receipt["contractAddress"]
+    assert w3.eth.get_code(proxy) == RUNTIME_CODE
+    slot = w3.eth.get_storage_at(proxy, int(IMPLEMENTATION_SLOT, 16))
+    assert slot[-20:] == HexBytes(implementation)
+    (log,) = receipt["logs"]
+    assert log["topics"] == [HexBytes(UPGRADED_TOPIC), slot]
+
+    # the initializer and the calls run with the storage of the proxy
+    assert w3.eth.call({"to": proxy}) == (7).to_bytes(32, "big")
+    w3.eth.send_transaction(
+        {"from": account, "to": proxy, "data": (9).to_bytes(32, "big")}
+    )
+    assert w3.eth.call({"to": proxy}) == (9).to_bytes(32, "big")
+    assert w3.eth.call({"to": implementation}) == bytes(32)
+
+    # the errors of the implementation are returned as they are
+    with pytest.raises(ContractLogicError) as exc:
+        w3.eth.call({"to": proxy, "data": bytes(32)})
+    assert HexBytes(exc.value.data) == (0xDEAD).to_bytes(32, "big")
+    # and so are the errors of the initializer
+    with pytest.raises(Web3RPCError, match="dead"):
+        deploy(get_init_code(implementation, bytes(32)))
+
+
+# test that the minimal proxy is initialized and passes the UUPS upgrade flow
+@pytest.mark.usefixtures("isolation")
+def test_minimal_proxy_upgrades():
+    account = get_account()
+    logic_contract, proxy = deploy_minimal_proxy_V1()
+    assert len(web3.eth.get_code(proxy.address)) == len(RUNTIME_CODE)
+    assert proxy.tx.events["Upgraded"]["implementation"] == logic_contract
+    slot = web3.eth.get_storage_at(proxy.address, IMPLEMENTATION_SLOT)
+    assert slot[-20:] == bytes.fromhex(logic_contract.address[2:])
+    assert proxy.owner() == account
+    assert proxy.retrieve() == 3
+
+    # initialized by the deployment
+    with reverts("Initializable: contract is already initialized"):
+        proxy.initialize(4, {"from": account})
+
+    logic_contract_v2 = LogicContractUUPSV2.deploy({"from": account})
+    with reverts("Ownable: caller is not the owner"):
+        proxy.upgradeTo(logic_contract_v2, {"from": accounts[1]})
+    proxy.upgradeTo(logic_contract_v2, {"from": account})
+    proxy_logic_contract = Contract.from_abi(
+        "LogicContractUUPSV2", proxy.address, LogicContractUUPSV2.abi
+    )
+    # storage remains
+    assert proxy_logic_contract.retrieve() == 3
+    assert proxy_logic_contract.square(5) == 25
+
+
+# test that a reverting initializer reverts the deployment
+@pytest.mark.usefixtures("isolation")
+def test_minimal_proxy_initializer_reverts(uups):
+    with reverts():
+        deploy_minimal_proxy(uups.v1, "0x12345678")
@@ -0,0 +1,68 @@
+import pytest
+from eth_abi import encode
+from brownie import LogicContractV1, TransparentUpgradeableProxy, Contract, accounts
+from scripts.helpful_scripts import get_account
+from scripts.deploy_transparent_upgradeable_proxy import deploy_proxies_V1
+from scripts.multicall import ERROR_SELECTOR, _revert_reason, multicall, get_multicall
+
+
+# test that the calls through several proxies are read in a single batch
+@pytest.mark.usefixtures("isolation")
+def test_multicall_reads_proxies():
+    account = get_account()
+    _, _, proxies = deploy_proxies_V1(3)
+    proxies = [
+        Contract.from_abi("LogicContractV1", proxy.address, LogicContractV1.abi)
+        for proxy in proxies
+    ]
+    for value, proxy in enumerate(proxies):
+        proxy.store(value + 1, {"from": account})
+
+    retrieve_abi = next(i for i in LogicContractV1.abi if i.get("name") == "retrieve")
+    calls = [(proxy, retrieve_abi) for proxy in proxies]
+    # LogicContractV1.square returns its input
+    calls += [(proxy, proxy.square, [value]) for value, proxy in enumerate(proxies)]
+    results = multicall(calls, batch_size=2)
+
+    assert results == [
+        (True, 1),
+        (True, 2),
+        (True, 3),
+        (True, 0),
+        (True, 1),
+        (True, 2),
+    ]
+
+
+# test that a failing call does not abort the batch
+@pytest.mark.usefixtures("isolation")
+def test_multicall_partial_failure():
+    _, v1, proxies = deploy_proxies_V1(1)
+    implementation_abi = next(
+        i for i in TransparentUpgradeableProxy.abi if i.get("name") == "implementation"
+    )
+    results = multicall(
+        [
+            # the Multicall is not the admin, the call reaches the logic contract
+            (proxies[0], implementation_abi),
+            # no code, nothing to decode
+            (accounts[1], v1.retrieve),
+            (v1, v1.retrieve),
+        ],
+        multicall_contract=get_multicall(),
+    )
+
+    assert results[0][0] is False
+    assert results[1] == (False, b"")
+    assert results[2] == (True, 99)
+
+
+# test that the revert data is returned as is when it is not an Error(string)
+def test_revert_reason():
+    error = bytes.fromhex(ERROR_SELECTOR[2:])
+    assert _revert_reason(error + encode(["string"], ["reason"])) == "reason"
+    assert _revert_reason(error + bytes(31)) == error + bytes(31)
+    assert _revert_reason(error + encode(["uint256"], [2**255])) == (
+        error + encode(["uint256"], [2**255])
+    )
+    assert _revert_reason(b"") == b""
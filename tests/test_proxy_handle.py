@@ -0,0 +1,106 @@
+import pytest
+from brownie import (
+    LogicContractV2,
+    LogicContractBeaconV2,
+    FacetSquareV2,
+    LogicContractUUPSV1,
+    LogicContractUUPSV2,
+    accounts,
+)
+from scripts.helpful_scripts import get_account
+from scripts.selector_registry import get_selector
+from scripts.deploy_diamond import deploy_facet, diamondCut
+from scripts.proxy_handle import ProxyHandle, find_container
+
+pytestmark = pytest.mark.usefixtures("isolation")
+
+
+# test that the implementation of a proxy is found among the project contracts
+def test_find_container(uups):
+    assert find_container(uups.v1) == LogicContractUUPSV1
+    # no code
+    assert find_container(accounts[1]) is None
+
+
+# test that the handle follows an upgrade of a transparent proxy
+def test_transparent_handle(transparent):
+    account = get_account()
+    proxy = ProxyHandle(transparent.proxy)
+    assert proxy.pattern == "transparent"
+    assert proxy.implementation == transparent.v1
+    assert proxy.square(2) != 4
+    assert not hasattr(proxy, "admin")
+
+    logic_contract_v2 = LogicContractV2.deploy({"from": account})
+    transparent.admin.upgrade(proxy, logic_contract_v2, {"from": account})
+    # only resolved again by a sync
+    assert not hasattr(proxy, "admin")
+    assert proxy.sync()
+    # fixed in LogicContractV2
+    assert proxy.square(2) == 4
+    assert hasattr(proxy, "admin")
+    assert proxy.implementation == logic_contract_v2
+    # nothing happened since
+    assert not proxy.sync()
+
+
+# test that the pattern of a UUPS proxy is detected
+def test_uups_handle(uups):
+    proxy = ProxyHandle(uups.proxy)
+    assert proxy.pattern == "uups"
+    assert proxy.retrieve() == 3
+
+
+# test that the handle follows an upgrade of the beacon
+def test_beacon_handle(beacon):
+    account = get_account()
+    proxy = ProxyHandle(beacon.proxy)
+    assert proxy.pattern == "beacon"
+    assert proxy.contract._name == "LogicContractBeaconV1"
+
+    logic_contract_v2 = LogicContractBeaconV2.deploy({"from": account})
+    beacon.beacon.upgradeTo(logic_contract_v2, {"from": account})
+    assert proxy.sync()
+    assert proxy.implementation == logic_contract_v2
+    assert proxy.contract._name == "LogicContractBeaconV2"
+
+
+# test that the handle has the functions of every facet and follows a cut
+def test_diamond_handle(diamond):
+    proxy = ProxyHandle(diamond.diamond)
+    assert proxy.pattern == "diamond"
+    assert hasattr(proxy, "facets") and hasattr(proxy, "diamondCut")
+    assert not hasattr(proxy, "lastUpdate")
+
+    square_facet_2 = deploy_facet(FacetSquareV2)
+    diamondCut(
+        diamond.diamond,
+        [[square_facet_2.address, 0, [get_selector("lastUpdate()")]]],
+    )
+    assert proxy.sync()
+    assert proxy.lastUpdate() == (0, 0)
+    assert square_facet_2 in proxy.implementation
+
+
+# test that the handle syncs by itself once its interval has passed
+def test_sync_interval(uups):
+    account = get_account()
+    proxy = ProxyHandle(uups.proxy, sync_interval=0)
+    logic_contract_v2 = LogicContractUUPSV2.deploy({"from": account})
+    proxy.upgradeTo(logic_contract_v2, {"from": account})
+    # synced when looking up retrieve
+    assert proxy.retrieve() == 3
+    assert proxy.implementation == logic_contract_v2
+    assert proxy.contract._name == "LogicContractUUPSV2"
+
+    proxy = ProxyHandle(uups.proxy, sync_interval=3600)
+    proxy.upgradeTo(uups.v1, {"from": account})
+    assert proxy.retrieve() == 3
+    # not synced yet
+    assert proxy.implementation == logic_contract_v2
+
+
+# test that a contract that is not a proxy is refused
+def test_not_a_proxy(transparent):
+    with pytest.raises(ValueError):
+        ProxyHandle(transparent.admin)
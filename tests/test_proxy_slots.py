@@ -0,0 +1,34 @@
+import pytest
+from brownie import ZERO_ADDRESS
+from scripts.proxy_slots import read_proxy_slots
+
+pytestmark = pytest.mark.usefixtures("isolation")
+
+
+# test that the slots of every kind of ERC1967 proxy are read in batches
+def test_read_proxy_slots(transparent, uups, beacon):
+    proxies = [transparent.proxy, uups.proxy, beacon.proxy]
+
+    slots = read_proxy_slots(proxies, batch_size=2)
+    assert slots[transparent.proxy.address] == {
+        "implementation": transparent.v1.address,
+        "admin": transparent.admin.address,
+        "beacon": ZERO_ADDRESS,
+    }
+    assert transparent.admin.getProxyImplementation(transparent.proxy) == (
+        transparent.v1
+    )
+    assert slots[uups.proxy.address] == {
+        "implementation": uups.v1.address,
+        "admin": ZERO_ADDRESS,
+        "beacon": ZERO_ADDRESS,
+    }
+    assert slots[beacon.proxy.address] == {
+        "implementation": beacon.v1.address,
+        "admin": ZERO_ADDRESS,
+        "beacon": beacon.beacon.address,
+    }
+
+    # the beacon is not called
+    slots = read_proxy_slots(proxies, resolve_beacons=False)
+    assert slots[beacon.proxy.address]["implementation"] == ZERO_ADDRESS
@@ -0,0 +1,101 @@
+import json
+import os
+from scripts.selector_registry import SelectorRegistry, abi_signature
+
+DIAMOND_CUT_ABI = {
+    "type": "function",
+    "name": "diamondCut",
+    "inputs": [
+        {
+            "name": "_diamondCut",
+            "type": "tuple[]",
+            "components": [
+                {"name": "facetAddress", "type": "address"},
+                {"name": "action", "type": "uint8"},
+                {"name": "functionSelectors", "type": "bytes4[]"},
+            ],
+        },
+        {"name": "_init", "type": "address"},
+        {"name": "_calldata", "type": "bytes"},
+    ],
+}
+STORE_ABI = {
+    "type": "function",
+    "name": "store",
+    "inputs": [{"name": "_newValue", "type": "uint256"}],
+}
+RETRIEVE_ABI = {"type": "function", "name": "retrieve", "inputs": []}
+
+
+def write_artifact(path, name, abi, bytecode_sha1):
+    artifact = {"contractName": name, "abi": abi, "bytecodeSha1": bytecode_sha1}
+    path.joinpath("contracts").mkdir(exist_ok=True)
+    path.joinpath("contracts", f"{name}.json").write_text(json.dumps(artifact))
+
+
+def test_abi_signature_expands_tuples():
+    assert (
+        abi_signature(DIAMOND_CUT_ABI)
+        == "diamondCut((address,uint8,bytes4[])[],address,bytes)"
+    )
+
+
+def test_registry_indexes_artifacts(tmp_path):
+    write_artifact(tmp_path, "FacetSquareV1", [RETRIEVE_ABI, STORE_ABI], "aa")
+    write_artifact(tmp_path, "DiamondCutFacet", [DIAMOND_CUT_ABI], "bb")
+    registry = SelectorRegistry(
+        tmp_path.joinpath("contracts"), tmp_path.joinpath("selectors.json")
+    )
+
+    assert registry.selector("retrieve()") == "0x2e64cec1"
+    assert registry.selector("store(uint256)") == "0x6057361d"
+    assert (
+        registry.selector("diamondCut((address,uint8,bytes4[])[],address,bytes)")
+        == "0x1f931c1c"
+    )
+    assert registry.signature("0x2e64cec1") == "retrieve()"
+    assert registry.selectors("FacetSquareV1") == ["0x2e64cec1", "0x6057361d"]
+    assert registry.selectors("FacetSquareV1", exclude=["store(uint256)"]) == [
+        "0x2e64cec1"
+    ]
+    assert registry.contracts("0x1f931c1c") == ["DiamondCutFacet"]
+
+
+def test_registry_rebuilds_only_on_bytecode_change(tmp_path):
+    build_path = tmp_path.joinpath("contracts")
+    cache_path = tmp_path.joinpath("selectors.json")
+    write_artifact(tmp_path, "FacetSquareV1", [RETRIEVE_ABI], "aa")
+    SelectorRegistry(build_path, cache_path)
+
+    # same bytecode: the cached selectors are kept
+    write_artifact(tmp_path, "FacetSquareV1", [RETRIEVE_ABI, STORE_ABI], "aa")
+    registry = SelectorRegistry(build_path, cache_path)
+    assert registry.selectors("FacetSquareV1") == ["0x2e64cec1"]
+
+    # new bytecode: the contract is indexed again
+    write_artifact(tmp_path, "FacetSquareV1", [RETRIEVE_ABI, STORE_ABI], "cc")
+    assert registry.refresh()
+    assert registry.selectors("FacetSquareV1") == ["0x2e64cec1", "0x6057361d"]
+    assert not registry.refresh()
+
+
+# test that only a change of the selectors or a deleted artifact is reported
+def test_registry_refresh_reports_changes(tmp_path):
+    build_path = tmp_path.joinpath("contracts")
+    write_artifact(tmp_path, "FacetSquareV1", [RETRIEVE_ABI, STORE_ABI], "aa")
+    write_artifact(tmp_path, "DiamondCutFacet", [DIAMOND_CUT_ABI], "bb")
+    registry = SelectorRegistry(build_path, tmp_path.joinpath("selectors.json"))
+    artifact = build_path.joinpath("FacetSquareV1.json")
+
+    # only the modification time changed
+    os.utime(artifact, ns=(0, artifact.stat().st_mtime_ns + 1))
+    assert not registry.refresh()
+    # new bytecode, same functions
+    write_artifact(tmp_path, "FacetSquareV1", [RETRIEVE_ABI, STORE_ABI], "cc")
+    assert not registry.refresh()
+
+    build_path.joinpath("DiamondCutFacet.json").unlink()
+    assert registry.refresh()
+    assert registry.contracts("0x1f931c1c") == []
+    assert registry.signature("0x1f931c1c") is None
+    assert registry.signature("0x2e64cec1") == "retrieve()"
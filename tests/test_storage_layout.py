@@ -0,0 +1,100 @@
+import pytest
+import solcx
+from scripts.storage_layout import (
+    compile_storage_layouts,
+    find_layout_breaks,
+    slot_usage,
+)
+
+TYPES = {
+    "t_uint64": {"encoding": "inplace", "label": "uint64", "numberOfBytes": "8"},
+    "t_uint128": {"encoding": "inplace", "label": "uint128", "numberOfBytes": "16"},
+    "t_uint256": {"encoding": "inplace", "label": "uint256", "numberOfBytes": "32"},
+    "t_address": {"encoding": "inplace", "label": "address", "numberOfBytes": "20"},
+}
+
+
+def variable(label, type_, slot, offset=0):
+    return {"label": label, "type": type_, "slot": str(slot), "offset": offset}
+
+
+# the AppStorage of a facet, a struct at slot 0 with the given members
+def app_storage(*members):
+    size = (max(int(m["slot"]) for m in members) + 1) * 32
+    struct = {
+        "encoding": "inplace",
+        "label": "struct AppStorage",
+        "members": list(members),
+        "numberOfBytes": str(size),
+    }
+    return {
+        "storage": [variable("s", f"t_struct(AppStorage){len(members)}_storage", 0)],
+        "types": {**TYPES, f"t_struct(AppStorage){len(members)}_storage": struct},
+    }
+
+
+V1_MEMBERS = [
+    variable("value", "t_uint128", 0),
+    variable("updatedAt", "t_uint64", 0, 16),
+    variable("updateCount", "t_uint64", 0, 24),
+]
+V1 = app_storage(*V1_MEMBERS)
+
+
+def test_slot_usage():
+    assert slot_usage(V1) == [("storage", 1, 32, 0), ("struct AppStorage", 1, 32, 0)]
+
+    # the address does not fit after the uint128, half of slot 0 is lost
+    layout = app_storage(
+        variable("value", "t_uint128", 0),
+        variable("owner", "t_address", 1),
+        variable("total", "t_uint256", 2),
+    )
+    assert slot_usage(layout)[1] == ("struct AppStorage", 3, 68, 28)
+    # and in the contract storage, where the struct is counted through its members
+    assert slot_usage(layout)[0] == ("storage", 3, 68, 28)
+
+
+def test_find_layout_breaks():
+    assert find_layout_breaks(V1, V1) == []
+
+    # appended member
+    v2 = app_storage(*V1_MEMBERS, variable("owner", "t_address", 1))
+    assert find_layout_breaks(V1, v2) == []
+
+    # member inserted before the others
+    v2 = app_storage(
+        variable("owner", "t_address", 0),
+        variable("value", "t_uint128", 1),
+        variable("updatedAt", "t_uint64", 1, 16),
+        variable("updateCount", "t_uint64", 1, 24),
+    )
+    assert find_layout_breaks(V1, v2) == [
+        "s.value moved from slot 0 offset 0 to slot 1 offset 0",
+        "s.updatedAt moved from slot 0 offset 16 to slot 1 offset 16",
+        "s.updateCount moved from slot 0 offset 24 to slot 1 offset 24",
+        "s.owner was added in slot 0, used by the previous version",
+    ]
+
+    # member retyped and member removed
+    v2 = app_storage(
+        variable("value", "t_uint256", 0), variable("updatedAt", "t_uint64", 1)
+    )
+    assert find_layout_breaks(V1, v2) == [
+        "s.value changed from uint128 to uint256",
+        "s.updatedAt moved from slot 0 offset 16 to slot 1 offset 0",
+        "s.updateCount was removed",
+    ]
+
+
+# test that the facets, compiled by solc, share one packed slot of AppStorage
+def test_facet_layouts():
+    if not solcx.get_installed_solc_versions():
+        pytest.skip("solc is not installed")
+    layouts = compile_storage_layouts()
+    for name in ("FacetSquareV1", "FacetSquareV2"):
+        assert slot_usage(layouts[name]) == [
+            ("storage", 1, 32, 0),
+            ("struct AppStorage", 1, 32, 0),
+        ]
+    assert find_layout_breaks(layouts["FacetSquareV1"], layouts["FacetSquareV2"]) == []
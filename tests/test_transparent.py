@@ -6,11 +6,17 @@ from brownie import (
     ProxyAdmin,
     Contract,
     reverts,
+    accounts,
+    web3,
     ZERO_ADDRESS,
 )
+from eth_utils import to_checksum_address
 from scripts.helpful_scripts import get_account, encode_function_data
 from scripts.deploy_transparent_upgradeable_proxy import *
 
+pytestmark = pytest.mark.usefixtures("isolation")
+
+
 # test that the proxy delegate the call to the implementation
 def test_proxy_delegates_calls():
     # Deploy
@@ -118,31 +124,125 @@ def test_proxy_selector_clashing():
 
 
 # test that the values given in the constructor are not set in the proxy storage
-def test_constructor():
-
-    _, v1, proxy = deploy_proxy_V1()
-    proxy_logic_contract = Contract.from_abi(
-        "LogicContractV1", proxy.address, LogicContractV1.abi
-    )
+def test_constructor(transparent):
 
-    assert v1.retrieve() == 99
-    assert proxy_logic_contract.retrieve() != 99
+    assert transparent.v1.retrieve() == 99
+    assert transparent.logic.retrieve() != 99
 
 
 # test the initialize function
-def test_initialize():
+def test_initialize(transparent):
     user = get_account(2)
 
-    admin, v1, proxy = deploy_proxy_V1()
     proxy_logic_contract = Contract.from_abi(
-        "LogicContractV2", proxy.address, LogicContractV2.abi
+        "LogicContractV2", transparent.proxy.address, LogicContractV2.abi
     )
 
     v2 = deploy_logic_contractV2()
     initialize_data = encode_function_data(v2.initialize, 33)
-    upgrade_and_call(proxy, v2, admin, initialize_data)
+    upgrade_and_call(transparent.proxy, v2, transparent.admin, initialize_data)
 
     assert proxy_logic_contract.retrieve() == 33
 
     with reverts("Initializable: contract is already initialized"):
         proxy_logic_contract.initialize(1, {"from": user})
+
+
+ADMIN_SLOT = "0xb53127684a568b3173ae13b9f8a6016e243e63b6e8ee1178d6a717850b5d6103"
+
+
+# test that the proxy admin can manage a proxy with an immutable admin
+def test_immutable_admin_proxy():
+    account = get_account()
+    user = accounts[1]
+    proxy_admin = deploy_proxy_admin()
+    v1 = deploy_logic_contractV1()
+    proxy = deploy_immutable_admin_proxy(v1, proxy_admin)
+    proxy_logic_contract = Contract.from_abi(
+        "LogicContractV2", proxy.address, LogicContractV2.abi
+    )
+
+    # the admin is still exposed through the EIP1967 slot
+    assert proxy.tx.events["AdminChanged"]["newAdmin"] == proxy_admin.address
+    slot = web3.eth.get_storage_at(proxy.address, ADMIN_SLOT)
+    assert to_checksum_address(slot[-20:]) == proxy_admin.address
+    assert proxy_admin.getProxyAdmin(proxy) == proxy_admin
+    assert proxy_admin.getProxyImplementation(proxy) == v1
+
+    proxy_logic_contract.store(1, {"from": user})
+    v2 = deploy_logic_contractV2()
+    upgrade_and_call(proxy, v2, proxy_admin, encode_function_data(v2.initialize, 33))
+    assert proxy_admin.getProxyImplementation(proxy) == v2
+    assert proxy_logic_contract.retrieve({"from": user}) == 33
+    assert proxy_logic_contract.square(2, {"from": user}) == 4
+
+    # the admin functions stay transparent
+    assert proxy_logic_contract.admin({"from": user}) == ZERO_ADDRESS
+    with reverts("TransparentUpgradeableProxy: admin cannot fallback to proxy target"):
+        proxy_logic_contract.retrieve({"from": proxy_admin})
+
+    # the admin can not be changed
+    with reverts("ImmutableAdminTransparentProxy: admin is immutable"):
+        proxy_admin.changeProxyAdmin(proxy, user, {"from": account})
+
+
+# test that a forwarded call is cheaper than through a TransparentUpgradeableProxy
+def test_immutable_admin_proxy_is_cheaper():
+    account = get_account()
+    proxy_admin = deploy_proxy_admin()
+    v1 = deploy_logic_contractV1()
+
+    gas_used = []
+    for proxy in [
+        deploy_proxy(v1, proxy_admin),
+        deploy_immutable_admin_proxy(v1, proxy_admin),
+    ]:
+        proxy_logic_contract = Contract.from_abi(
+            "LogicContractV1", proxy.address, LogicContractV1.abi
+        )
+        tx = proxy_logic_contract.retrieve.transact({"from": account})
+        gas_used.append(tx.gas_used)
+
+    assert gas_used[1] < gas_used[0]
+
+
+# test that a fleet is upgraded in batches and initialized
+def test_upgrade_fleet():
+    admin, _, proxies = deploy_proxies_V1(5)
+    v2 = deploy_logic_contractV2()
+
+    txs = upgrade_fleet(
+        proxies, v2, admin, encode_function_data(v2.initialize, 33), max_batch_size=2
+    )
+
+    assert len(txs) == 3
+    for proxy in proxies:
+        assert admin.getProxyImplementation(proxy) == v2
+        proxy_logic_contract = Contract.from_abi(
+            "LogicContractV2", proxy.address, LogicContractV2.abi
+        )
+        assert proxy_logic_contract.retrieve() == 33
+    # nothing left to upgrade
+    assert upgrade_fleet(proxies, v2, admin) == []
+
+
+# test that the fleet upgrade resumes after a failed batch
+def test_upgrade_fleet_resumes():
+    account = get_account()
+    admin, v1, proxies = deploy_proxies_V1(3)
+    # managed by another ProxyAdmin, its batch reverts
+    foreign_proxy = deploy_proxy(v1, deploy_proxy_admin())
+    fleet = proxies[:2] + [foreign_proxy] + proxies[2:]
+    v2 = deploy_logic_contractV2()
+
+    with reverts():
+        upgrade_fleet(fleet, v2, admin, max_batch_size=2)
+    assert [admin.getProxyImplementation(p) for p in proxies] == [v2, v2, v1]
+
+    # only the proxy of the failed batch is left
+    assert pending_upgrades(proxies, v2, admin) == [proxies[2]]
+    assert len(upgrade_fleet(proxies, v2, admin, max_batch_size=2)) == 1
+    assert admin.getProxyImplementation(proxies[2]) == v2
+
+    with reverts("ProxyAdmin: length mismatch"):
+        admin.upgradeBatch(proxies, [v2], {"from": account})
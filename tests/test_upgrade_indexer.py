@@ -0,0 +1,117 @@
+import pytest
+from hexbytes import HexBytes
+from brownie import LogicContractBeaconV2, FacetSquareV2, web3, ZERO_ADDRESS
+from scripts.helpful_scripts import get_account
+from scripts.selector_registry import get_selector
+from scripts.deploy_transparent_upgradeable_proxy import (
+    deploy_proxies_V1,
+    deploy_logic_contractV2,
+    upgrade,
+)
+from scripts.deploy_beacon import deploy_beacon_proxy_V1
+from scripts.deploy_diamond import deploy_diamond_V1, deploy_facet, diamondCut
+from scripts.diamond_cut_planner import REPLACE, REMOVE
+from scripts.upgrade_indexer import EVENT_KINDS, UpgradeIndexer
+
+pytestmark = pytest.mark.usefixtures("isolation")
+
+
+def test_index_proxies(tmp_path):
+    account = get_account()
+    start_block = web3.eth.block_number + 1
+    admin, v1, proxies = deploy_proxies_V1(2)
+    logic_contract, beacon, beacon_proxy = deploy_beacon_proxy_V1()
+    v1_block = web3.eth.block_number
+
+    indexer = UpgradeIndexer(tmp_path.joinpath("history.sqlite"), start_block)
+    assert indexer.sync() > 0
+    assert indexer.implementations(proxies) == {proxy.address: v1 for proxy in proxies}
+    assert indexer.admin(proxies[0]) == admin
+    # read from the beacon, which does not log its first implementation
+    assert indexer.beacon(beacon_proxy) == beacon
+    assert indexer.implementation(beacon_proxy) == logic_contract
+
+    v2 = deploy_logic_contractV2()
+    upgrade(proxies[0], v2, admin)
+    beacon_v2 = LogicContractBeaconV2.deploy({"from": account})
+    beacon.upgradeTo(beacon_v2, {"from": account})
+    indexer.close()
+
+    # a new indexer resumes from the last synced block
+    indexer = UpgradeIndexer(tmp_path.joinpath("history.sqlite"), start_block)
+    assert indexer.sync() == 2
+    assert indexer.implementations(proxies) == {
+        proxies[0].address: v2,
+        proxies[1].address: v1,
+    }
+    assert indexer.implementation(beacon_proxy) == beacon_v2
+    assert indexer.implementation(proxies[0], block=v1_block) == v1
+    assert indexer.implementation(beacon_proxy, block=v1_block) == logic_contract
+    assert indexer.implementation(proxies[0], block=start_block - 1) == ZERO_ADDRESS
+
+
+def test_index_diamond(tmp_path):
+    square_facet, _, _, diamond = deploy_diamond_V1()
+    square_facet_2 = deploy_facet(FacetSquareV2)
+    selector = get_selector("square(uint256)")
+    diamondCut(diamond, [[square_facet_2.address, REPLACE, [selector]]])
+    cut_block = web3.eth.block_number
+
+    indexer = UpgradeIndexer(
+        tmp_path.joinpath("history.sqlite"), diamond.tx.block_number
+    )
+    indexer.sync()
+    assert indexer.facet_address(diamond, selector) == square_facet_2
+    assert indexer.facet_address(diamond, selector, cut_block - 1) == square_facet
+    assert indexer.facet_address(diamond, get_selector("store(uint256)")) == (
+        square_facet
+    )
+    assert indexer.facet_address(diamond, "0x00000000") == ZERO_ADDRESS
+
+    diamondCut(diamond, [[square_facet.address, REMOVE, []]])
+    indexer.sync()
+    assert indexer.facet_address(diamond, get_selector("store(uint256)")) == (
+        ZERO_ADDRESS
+    )
+    assert indexer.facet_address(diamond, selector) == square_facet_2
+
+
+# test that the beacons of the indexed beacon proxies are indexed too
+def test_index_beacon_of_proxies(tmp_path):
+    account = get_account()
+    start_block = web3.eth.block_number + 1
+    logic_contract, beacon, beacon_proxy = deploy_beacon_proxy_V1()
+    beacon_v2 = LogicContractBeaconV2.deploy({"from": account})
+    beacon.upgradeTo(beacon_v2, {"from": account})
+
+    indexer = UpgradeIndexer(
+        tmp_path.joinpath("history.sqlite"), start_block, addresses=[beacon_proxy]
+    )
+    # the beacon is found and upgraded in the same chunk
+    indexer.sync()
+    assert indexer.implementation(beacon_proxy) == beacon_v2
+
+    beacon.upgradeTo(logic_contract, {"from": account})
+    assert indexer.sync() == 1
+    assert indexer.implementation(beacon_proxy) == logic_contract
+
+
+# test that the events not indexed as by OpenZeppelin are skipped
+def test_skip_unexpected_logs(tmp_path):
+    indexer = UpgradeIndexer(tmp_path.joinpath("history.sqlite"))
+    upgraded, admin_changed, _ = [HexBytes(topic) for topic in EVENT_KINDS]
+    proxy = "0x" + "11" * 20
+    address = HexBytes("0x" + "00" * 12 + "22" * 20)
+    log = {"address": proxy, "blockNumber": 1, "logIndex": 0}
+
+    # Upgraded(address) with the address not indexed
+    assert not indexer._index({**log, "topics": [upgraded], "data": address})
+    # AdminChanged(address indexed, address indexed)
+    assert not indexer._index(
+        {**log, "topics": [admin_changed, address, address], "data": HexBytes("")}
+    )
+    assert indexer.implementation(proxy, block=1) == ZERO_ADDRESS
+    assert indexer.admin(proxy, block=1) == ZERO_ADDRESS
+
+    assert indexer._index({**log, "topics": [upgraded, address], "data": HexBytes("")})
+    assert indexer.implementation(proxy, block=1) == "0x" + "22" * 20
@@ -0,0 +1,52 @@
+import pytest
+from brownie import LogicContractV2
+from scripts.helpful_scripts import get_account
+from scripts.proxy_slots import IMPLEMENTATION_SLOT
+from scripts.upgrade_simulator import simulate, simulate_fleet_upgrade
+
+pytestmark = pytest.mark.usefixtures("isolation")
+
+
+# test that a plan is reported step by step and leaves the chain as it was
+def test_simulate(transparent, traces):
+    account = get_account()
+    v2 = LogicContractV2.deploy({"from": account})
+    initialize = v2.initialize.encode_input
+    value = transparent.logic.retrieve()
+
+    results = simulate(
+        [
+            (transparent.admin.upgradeAndCall, [transparent.proxy, v2, initialize(5)]),
+            # already initialized by the first step
+            (transparent.admin.upgradeAndCall, [transparent.proxy, v2, initialize(6)]),
+        ]
+    )
+    upgraded, reverted = results
+    assert upgraded["status"] == 1
+    assert upgraded["gas_limit"] > upgraded["gas_used"]
+    _, after = upgraded["state_diff"][transparent.proxy.address][IMPLEMENTATION_SLOT]
+    assert after[-40:] == v2.address[2:].lower()
+    assert reverted["status"] == 0
+    assert reverted["revert_msg"] == "Initializable: contract is already initialized"
+    assert reverted["gas_limit"] is None
+
+    # nothing was upgraded
+    assert transparent.admin.getProxyImplementation(transparent.proxy) == (
+        transparent.v1
+    )
+    assert transparent.logic.retrieve() == value
+
+
+# test that the proxies whose upgrade would revert are found
+def test_simulate_fleet_upgrade(transparent):
+    account = get_account()
+    v2 = LogicContractV2.deploy({"from": account})
+
+    results = simulate_fleet_upgrade(
+        [transparent.proxy, account], v2, transparent.admin
+    )
+    assert results[transparent.proxy.address]["status"] == 1
+    assert results[account.address]["status"] == 0
+    assert transparent.admin.getProxyImplementation(transparent.proxy) == (
+        transparent.v1
+    )
@@ -0,0 +1,35 @@
+import pytest
+from brownie import LogicContractUUPSV2, Contract, accounts, reverts
+from scripts.helpful_scripts import get_account
+
+pytestmark = pytest.mark.usefixtures("isolation")
+
+
+# test that the proxy is initialized and delegates the calls to the implementation
+def test_proxy_delegates_calls(uups):
+    account = get_account()
+    assert uups.logic.owner() == account
+    assert uups.logic.retrieve() == 3
+    # the implementation storage is not used
+    assert uups.v1.retrieve() == 0
+
+    uups.logic.store(5, {"from": accounts[1]})
+    assert uups.logic.retrieve() == 5
+    assert uups.logic.square(5) == 5
+
+
+# test that only the owner can upgrade the proxy, through the implementation
+def test_proxy_upgrades(uups):
+    account = get_account()
+    logic_contract_v2 = LogicContractUUPSV2.deploy({"from": account})
+
+    with reverts("Ownable: caller is not the owner"):
+        uups.logic.upgradeTo(logic_contract_v2, {"from": accounts[1]})
+
+    uups.logic.upgradeTo(logic_contract_v2, {"from": account})
+    proxy_logic_contract = Contract.from_abi(
+        "LogicContractUUPSV2", uups.proxy.address, LogicContractUUPSV2.abi
+    )
+    # storage remains
+    assert proxy_logic_contract.retrieve() == 3
+    assert proxy_logic_contract.square(5) == 25